@@ -0,0 +1,252 @@
+"""
+database.py fonksiyonları ve bot komutları için performans ölçümü.
+
+Her boyut (varsayılan 1k/100k/1M görev) için geçici bir veritabanı doldurulur,
+ardından işlemlerin saniyedeki çağrı sayısı ile p50/p99 gecikmeleri ölçülür.
+Sonuçlar JSON olarak yazılır ve kaydedilmiş bir temel ölçümle karşılaştırılabilir:
+
+    python -m bench.run --output sonuc.json
+    python -m bench.run --sizes 1000 --compare sonuc.json
+
+`--store memory`, `--store eventlog` ya da `--store sharded` komutları tek
+SQLite dosyası yerine o depoyla ölçer; bu modlarda yalnızca komut ölçümleri yapılır.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from unittest.mock import AsyncMock, Mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import database
+from storage import SqliteTaskStore, create_store
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+DEFAULT_ITERATIONS = 200
+DEFAULT_THRESHOLD = 0.10
+SEED_CHUNK_SIZE = 10_000
+BENCH_GUILD_ID = 1
+
+def percentile(samples, fraction):
+    """Sıralı örneklerden en yakın sıra yöntemiyle yüzdelik değeri döner."""
+    index = max(0, min(len(samples) - 1, round(fraction * len(samples)) - 1))
+    return samples[index]
+
+def summarize(name, size, samples, elapsed):
+    samples = sorted(samples)
+    return {
+        "name": name,
+        "size": size,
+        "iterations": len(samples),
+        "throughput_per_s": len(samples) / elapsed if elapsed else None,
+        "mean_ms": sum(samples) / len(samples) * 1000,
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+    }
+
+def measure(name, size, calls):
+    """`calls` içindeki her argümansız çağrıyı ayrı ayrı zamanlar."""
+    samples = []
+    started = time.perf_counter()
+    for call in calls:
+        start = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - start)
+    return summarize(name, size, samples, time.perf_counter() - started)
+
+async def measure_async(name, size, calls):
+    samples = []
+    started = time.perf_counter()
+    for call in calls:
+        start = time.perf_counter()
+        await call()
+        samples.append(time.perf_counter() - start)
+    return summarize(name, size, samples, time.perf_counter() - started)
+
+def seed(db_name, size):
+    """Veritabanını göçlerle hazırlar ve `size` görevle doldurur (her 3 görevden biri tamamlanmış)."""
+    database.init_db(db_name=db_name)
+    conn = sqlite3.connect(db_name)
+    try:
+        for start in range(0, size, SEED_CHUNK_SIZE):
+            rows = [
+                (f"Görev {i} için açıklama metni", i % 3 == 0, BENCH_GUILD_ID)
+                for i in range(start, min(size, start + SEED_CHUNK_SIZE))
+            ]
+            conn.executemany("INSERT INTO tasks (description, completed, guild_id) VALUES (?, ?, ?)", rows)
+            conn.commit()
+    finally:
+        conn.close()
+
+async def seed_store(store, size):
+    """Bir görev deposunu `seed` ile aynı dağılımda doldurur."""
+    for start in range(0, size, SEED_CHUNK_SIZE):
+        ids = await store.add_tasks(
+            [f"Görev {i} için açıklama metni" for i in range(start, min(size, start + SEED_CHUNK_SIZE))],
+            guild_id=BENCH_GUILD_ID,
+        )
+        await store.complete_tasks(ids[::3], guild_id=BENCH_GUILD_ID)
+
+def bench_database(db_name, size, iterations, rng):
+    scope = {"db_name": db_name, "guild_id": BENCH_GUILD_ID}
+    # Tüm tabloyu okuyan sorgu büyük boyutlarda daha az tekrarlanır.
+    full_reads = max(5, min(iterations, iterations * 1_000 // size))
+    open_ids = [task_id for task_id in range(1, size + 1) if task_id % 3 != 1]
+    rng.shuffle(open_ids)
+    to_complete = open_ids[:iterations]
+    to_delete = open_ids[iterations:2 * iterations]
+    return [
+        measure("get_tasks_db", size, [lambda: database.get_tasks_db(**scope)] * full_reads),
+        measure("add_task_db", size, [lambda: database.add_task_db("Yeni ölçüm görevi", **scope)] * iterations),
+        measure("complete_task_db", size,
+                [lambda task_id=task_id: database.complete_task_db(task_id, **scope) for task_id in to_complete]),
+        measure("delete_task_db", size,
+                [lambda task_id=task_id: database.delete_task_db(task_id, **scope) for task_id in to_delete]),
+    ]
+
+def make_ctx(store):
+    from bot import BotConfig
+
+    ctx = Mock()
+    ctx.bot.store = store
+    ctx.bot.config = BotConfig()
+    ctx.send = AsyncMock()
+    ctx.message.attachments = []
+    ctx.guild.id = BENCH_GUILD_ID
+    ctx.channel.id = 1
+    return ctx
+
+async def bench_commands(store, size, iterations, rng):
+    import bot
+
+    ctx = make_ctx(store)
+    ids = list(range(1, size + 1))
+    rng.shuffle(ids)
+    try:
+        return [
+            await measure_async("cmd:add_task", size,
+                                [lambda: bot.add_task(ctx, description="Komut ölçüm görevi")] * iterations),
+            await measure_async("cmd:show_tasks", size, [lambda: bot.show_tasks(ctx)] * iterations),
+            await measure_async("cmd:show_tasks open", size, [lambda: bot.show_tasks(ctx, "open")] * iterations),
+            await measure_async("cmd:complete_task", size,
+                                [lambda task_id=task_id: bot.complete_task(ctx, task_ids=str(task_id))
+                                 for task_id in ids[:iterations]]),
+            await measure_async("cmd:delete_task", size,
+                                [lambda task_id=task_id: bot.delete_task(ctx, task_ids=str(task_id))
+                                 for task_id in ids[iterations:2 * iterations]]),
+        ]
+    finally:
+        store.close()
+
+def run_sqlite(sizes, iterations, seed_value):
+    results = []
+    with tempfile.TemporaryDirectory(prefix="task-bench-") as workdir:
+        for size in sizes:
+            for suite in ("db", "cmd"):
+                db_name = os.path.join(workdir, f"{suite}_{size}.db")
+                print(f"{size} görev ile {suite} ölçülüyor...", file=sys.stderr)
+                seed(db_name, size)
+                rng = random.Random(seed_value)
+                try:
+                    if suite == "db":
+                        results.extend(bench_database(db_name, size, iterations, rng))
+                    else:
+                        results.extend(asyncio.run(
+                            bench_commands(SqliteTaskStore(db_name=db_name), size, iterations, rng)))
+                finally:
+                    database.close_pool(db_name)
+    return results
+
+def run_store(kind, sizes, iterations, seed_value):
+    async def measure_size(store, size, rng):
+        await seed_store(store, size)
+        return await bench_commands(store, size, iterations, rng)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="task-bench-") as workdir:
+        for size in sizes:
+            print(f"{size} görev ile {kind} deposunda cmd ölçülüyor...", file=sys.stderr)
+            options = {"directory": os.path.join(workdir, f"{kind}_{size}")} if kind != "memory" else {}
+            store = create_store(kind, **options)
+            results.extend(asyncio.run(measure_size(store, size, random.Random(seed_value))))
+    return results
+
+def run(sizes, iterations, seed_value=0, store="sqlite"):
+    if store == "sqlite":
+        results = run_sqlite(sizes, iterations, seed_value)
+    else:
+        results = run_store(store, sizes, iterations, seed_value)
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "iterations": iterations,
+            "store": store,
+        },
+        "results": results,
+    }
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    İki ölçümü ad ve boyuta göre eşleştirir ve `(satırlar, gerileme_var_mı)`
+    döner. p50 ya da p99 gecikmesi eşikten fazla artan ölçümler gerileme sayılır.
+    """
+    previous = {(r["name"], r["size"]): r for r in baseline["results"]}
+    lines = [f"{'ölçüm':<24}{'boyut':>10}{'p50 ms':>12}{'p99 ms':>12}{'p50 Δ':>9}{'p99 Δ':>9}"]
+    regressed = False
+    for result in current["results"]:
+        old = previous.get((result["name"], result["size"]))
+        if old is None:
+            continue
+        changes = [result[key] / old[key] - 1 if old[key] else 0.0 for key in ("p50_ms", "p99_ms")]
+        marker = ""
+        if any(change > threshold for change in changes):
+            regressed = True
+            marker = "  ⚠️ gerileme"
+        lines.append(
+            f"{result['name']:<24}{result['size']:>10}{result['p50_ms']:>12.3f}{result['p99_ms']:>12.3f}"
+            f"{changes[0]:>+9.1%}{changes[1]:>+9.1%}{marker}"
+        )
+    return lines, regressed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Görev botu performans ölçümü")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Virgülle ayrılmış veritabanı boyutları (görev sayısı).")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS, help="İşlem başına tekrar sayısı.")
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası (varsayılan: standart çıktı).")
+    parser.add_argument("--compare", metavar="BASELINE", help="Karşılaştırılacak önceki JSON sonucu.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Gerileme sayılacak oransal gecikme artışı (0.10 = %%10).")
+    parser.add_argument("--store", choices=("sqlite", "memory", "eventlog", "sharded"), default="sqlite",
+                        help="Komutların ölçüleceği görev deposu.")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    result = run(sizes, args.iterations, store=args.store)
+    text = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        lines, regressed = compare(result, baseline, args.threshold)
+        print("\n".join(lines), file=sys.stderr)
+        return 1 if regressed else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+import asyncio
+
+# Bir değişiklikten sonra pano düzenlenmeden önce beklenen süre. Bu sürede
+# gelen diğer değişiklikler aynı düzenlemeye katılır; aynı panonun iki
+# düzenlemesi arasında da en az bu kadar süre geçer.
+DEFAULT_DEBOUNCE_DELAY = 1.5
+
+class Debouncer:
+    """
+    Anahtar başına gelen değişiklik bildirimlerini toplar ve `flush(anahtar)`
+    coroutine'ini seyrek çağırır. İlk bildirim bir bekleme başlatır; bekleme
+    bitince tek bir flush yapılır. Flush sürerken yeni bildirim gelirse bir
+    bekleme daha yapılıp yeniden flush edilir, böylece son değişiklik kaçmaz.
+    """
+
+    def __init__(self, flush, delay=DEFAULT_DEBOUNCE_DELAY):
+        self._flush = flush
+        self.delay = delay
+        self._dirty = set()
+        self._pending = {}
+
+    def schedule(self, key):
+        """Anahtarı değişmiş olarak işaretler; çalışan bir olay döngüsü içinden çağrılmalıdır."""
+        self._dirty.add(key)
+        if key not in self._pending:
+            self._pending[key] = asyncio.ensure_future(self._run(key))
+
+    async def _run(self, key):
+        try:
+            while key in self._dirty:
+                await asyncio.sleep(self.delay)
+                self._dirty.discard(key)
+                try:
+                    await self._flush(key)
+                except Exception as e:
+                    print(f"Pano güncellenemedi: {e}")
+        finally:
+            self._pending.pop(key, None)
+            self._dirty.discard(key)
+
+    async def wait(self):
+        """Bekleyen tüm flush işlemlerinin bitmesini bekler."""
+        while self._pending:
+            await asyncio.gather(*self._pending.values(), return_exceptions=True)
@@ -1,109 +1,519 @@
-import discord
-from discord.ext import commands
+"""
+Görev botunun komutları ve `create_bot` fabrikası. Modülü içe aktarmanın
+yan etkisi yoktur: discord.py, .env dosyası ve token ancak `create_bot` ya
+da `main` çağrıldığında yüklenir; veritabanı göçleri bot bağlanırken
+(setup_hook) çalışır. Komutlar görev deposuna ve pano güncelleyicisine
+`ctx.bot` üzerinden ulaşır.
+"""
+import asyncio
+import functools
 import os
-from dotenv import load_dotenv
+import re
+import sys
+import tempfile
+import time
+from collections import namedtuple
 
-from database import init_db, add_task_db, get_tasks_db, delete_task_db, complete_task_db, get_task_by_id_db
+from database import TASK_STATUSES, TaskOutcome
+from board import Debouncer
+from metrics import REGISTRY, format_report
+from rendering import SEARCH_RESULTS_TITLE, Page, render_board, render_page
+from storage import StoreBusyError, create_store, options_of, prepare_store, store_options
+import transfer
 
-load_dotenv()
-DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
+PAGE_SIZE = 20
+EMPTY_TASK_LIST = "📋 Gösterilecek görev bulunmuyor."
+NO_SEARCH_RESULTS = "🔎 Aramayla eşleşen görev bulunamadı."
+MAX_BULK_TASKS = 500
+MAX_BULK_ATTACHMENT_BYTES = 1_000_000
+MAX_BATCH_IDS = 10_000
+MAX_ID_SUMMARY_LENGTH = 500
+BOARD_PAGE_SIZE = 30
+# Discord'un sunucu dışındaki (DM) ek boyutu sınırı; sunucularda guild.filesize_limit kullanılır.
+DEFAULT_FILE_SIZE_LIMIT = 10 * 1024 * 1024
+MAX_IMPORT_BYTES = 100 * 1024 * 1024
+IMPORT_PROGRESS_INTERVAL = 2.0
+_ID_TOKEN = re.compile(r"(-?\d+)(?:-(\d+))?")
 
-if not DISCORD_TOKEN:
-    print("Hata: DISCORD_TOKEN ortam değişkeni bulunamadı.")
-    print("Lütfen .env dosyası oluşturup içine DISCORD_TOKEN=YOUR_BOT_TOKEN yazın veya sistem ortam değişkeni olarak ayarlayın.")
-    exit()
+# `scope`: "guild" ise görevler sunucu genelinde paylaşılır, "channel" ise her
+# kanalın kendi listesi vardır. `store`: görev deposu türü (bkz. storage.create_store),
+# `store_options` deponun kurucu seçenekleridir. `shard_count` verilirse bot
+# yalnızca `shard_ids` gateway parçalarını açar (bkz. launcher.py).
+BotConfig = namedtuple(
+    "BotConfig", "token scope store store_options shard_count shard_ids",
+    defaults=(None, "guild", "sqlite", None, None, None),
+)
 
-intents = discord.Intents.default()
-intents.message_content = True
+def load_config(environ=None):
+    """Bot ayarlarını DISCORD_TOKEN, TASK_SCOPE, TASK_STORE (ve deponun TASK_* ayarları), SHARD_COUNT ve SHARD_IDS'den okur."""
+    environ = os.environ if environ is None else environ
+    kind = environ.get("TASK_STORE", "sqlite")
+    shard_count = environ.get("SHARD_COUNT")
+    shard_ids = environ.get("SHARD_IDS")
+    return BotConfig(
+        token=environ.get("DISCORD_TOKEN"),
+        scope=environ.get("TASK_SCOPE", "guild"),
+        store=kind,
+        store_options=store_options(kind, environ),
+        shard_count=int(shard_count) if shard_count else None,
+        shard_ids=[int(shard_id) for shard_id in shard_ids.split(",")] if shard_count and shard_ids else None,
+    )
 
-bot = commands.Bot(command_prefix="!", intents=intents)
+# create_bot'un kaydedeceği komutlar: (callback, seçenekler).
+COMMANDS = []
 
-@bot.event
-async def on_ready():
-    """Bot hazır olduğunda çalışır."""
-    print(f'{bot.user.name} Discord\'a bağlandı!')
-    print(f'Bot ID: {bot.user.id}')
-    init_db()
-    print("Veritabanı hazır.")
+def command(name, help, administrator_only=False):
+    """Fonksiyonu create_bot'un kaydedeceği komutlara ekler ve değiştirmeden döner."""
+    def register(callback):
+        COMMANDS.append((callback, {"name": name, "help": help, "administrator_only": administrator_only}))
+        return callback
+    return register
 
-@bot.command(name="add_task", help="Yeni bir görev ekler. Kullanım: !add_task <açıklama>")
+def task_scope(ctx):
+    """
+    Komutun görev kapsamını döner. Görevler sunucuya göre ayrılır; botun
+    `scope` ayarı "channel" ise ya da komut DM'den geldiyse ayrıca kanala göre ayrılır.
+    """
+    guild_id = ctx.guild.id if ctx.guild is not None else None
+    channel_id = ctx.channel.id if ctx.bot.config.scope == "channel" or guild_id is None else None
+    return {"guild_id": guild_id, "channel_id": channel_id}
+
+async def render_board_text(store, scope):
+    """Kapsamın pano metnini açık görevlerin ilk sayfası ve sayaçlardan yazar."""
+    tasks = await store.get_tasks_page(0, BOARD_PAGE_SIZE, status="open", **scope)
+    counts = await store.get_task_counts(**scope)
+    return render_board(tasks, counts)
+
+async def refresh_boards(bot, key):
+    """Kapsamı gösteren tüm panoları tek bir metinle yerinde düzenler."""
+    import discord
+
+    store = bot.store
+    scope = {"guild_id": key[0], "channel_id": key[1]}
+    boards = await store.get_boards(**scope)
+    if not boards:
+        return
+    text = await render_board_text(store, scope)
+    for channel_id, message_id in boards:
+        channel = bot.get_channel(channel_id)
+        if channel is None:
+            continue
+        try:
+            await channel.get_partial_message(message_id).edit(content=text)
+        except discord.NotFound:
+            await store.delete_board(channel_id, guild_id=key[0])
+
+def board_changed(ctx):
+    """Kapsamdaki görevler değişti; panolar kısa bir beklemeden sonra topluca güncellenir."""
+    scope = task_scope(ctx)
+    ctx.bot.board_updates.schedule((scope["guild_id"], scope["channel_id"]))
+
+async def start_command_timer(ctx):
+    """Komut süresini ölçmek için başlangıç zamanını kaydeder."""
+    ctx.started_at = time.perf_counter()
+
+async def record_command_latency(ctx):
+    """Komut bittiğinde (hatayla bitse de) süresini komut adına göre histograma ekler."""
+    started_at = getattr(ctx, "started_at", None)
+    if started_at is not None:
+        REGISTRY.observe("bot_command_duration_seconds", time.perf_counter() - started_at,
+                         command=ctx.command.qualified_name)
+
+@command(name="add_task", help="Yeni bir görev ekler. Kullanım: !add_task <açıklama>")
 async def add_task(ctx, *, description: str):
     """Yeni bir görev ekler."""
     if not description:
         await ctx.send("Lütfen bir görev açıklaması girin. Kullanım: `!add_task <açıklama>`")
         return
     
-    task_id = add_task_db(description)
+    task_id = await ctx.bot.store.add_task(description, **task_scope(ctx))
+    board_changed(ctx)
     await ctx.send(f"✅ Görev eklendi! ID: `{task_id}`. Görev: `{description}`")
 
-@bot.command(name="show_tasks", help="Tüm görevleri listeler.")
-async def show_tasks(ctx):
-    """Tüm görevleri listeler."""
-    tasks = get_tasks_db()
-    if not tasks:
-        await ctx.send("📋 Gösterilecek görev bulunmuyor.")
+def parse_task_lines(text: str):
+    """Metindeki her dolu satırı ayrı bir görev açıklaması olarak döner."""
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+def is_text_attachment(attachment):
+    """Ek bir metin dosyası mı: içerik türü `text/*` ya da uzantısı `.txt`."""
+    content_type = (attachment.content_type or "").split(";")[0].strip().lower()
+    return content_type.startswith("text/") or attachment.filename.lower().endswith(".txt")
+
+@command(name="add_tasks", help="Her satırı ayrı bir görev olarak ekler; .txt dosyası da eklenebilir. Kullanım: !add_tasks <satır satır açıklamalar>")
+async def add_tasks(ctx, *, descriptions: str = ""):
+    """Mesajdaki veya ekli metin dosyasındaki her satırı tek işlemde görev olarak ekler."""
+    lines = parse_task_lines(descriptions)
+    for attachment in ctx.message.attachments:
+        if not is_text_attachment(attachment):
+            await ctx.send(f"⚠️ `{attachment.filename}` bir metin dosyası değil; yalnızca `.txt` dosyası eklenebilir.")
+            return
+        if attachment.size > MAX_BULK_ATTACHMENT_BYTES:
+            await ctx.send(f"⚠️ `{attachment.filename}` dosyası çok büyük.")
+            return
+        data = await attachment.read()
+        try:
+            text = data.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            await ctx.send(f"⚠️ `{attachment.filename}` UTF-8 metin olarak okunamadı.")
+            return
+        lines.extend(parse_task_lines(text))
+
+    if not lines:
+        await ctx.send("Lütfen her satıra bir görev yazın veya bir metin dosyası ekleyin. Kullanım: `!add_tasks <açıklamalar>`")
+        return
+    if len(lines) > MAX_BULK_TASKS:
+        await ctx.send(f"⚠️ Tek seferde en fazla {MAX_BULK_TASKS} görev eklenebilir.")
         return
 
-    response = "📋 **Görev Listesi:**\n"
-    for task in tasks:
-        task_id, description, completed = task
-        status_emoji = "✅" if completed else "❌"
-        response += f"{task_id}: {description} {status_emoji}\n"
-    
-    await ctx.send(response)
+    task_ids = await ctx.bot.store.add_tasks(lines, **task_scope(ctx))
+    board_changed(ctx)
+    await ctx.send(f"✅ {len(task_ids)} görev eklendi! ID'ler: `{task_ids[0]}`-`{task_ids[-1]}`")
+
+@command(name="export_tasks", help="Görevleri CSV ya da JSONL dosyası olarak gönderir. Kullanım: !export_tasks [csv|jsonl] [open|done|all]")
+async def export_tasks(ctx, fmt: str = "csv", status: str = "all"):
+    """Görevleri sayfa sayfa okuyup geçici bir dosyaya yazar ve dosyayı ek olarak gönderir."""
+    import discord
+
+    fmt, status = fmt.lower(), status.lower()
+    if fmt not in transfer.EXPORT_FORMATS or status not in TASK_STATUSES:
+        await ctx.send("Lütfen geçerli bir biçim ve durum girin. Örneğin: `!export_tasks csv open` veya `!export_tasks jsonl`")
+        return
+    with tempfile.TemporaryFile() as f:
+        count = await transfer.export_tasks(ctx.bot.store, f, fmt, status, **task_scope(ctx))
+        if not count:
+            await ctx.send(EMPTY_TASK_LIST)
+            return
+        limit = ctx.guild.filesize_limit if ctx.guild is not None else DEFAULT_FILE_SIZE_LIMIT
+        if f.tell() > limit:
+            await ctx.send(f"⚠️ Dosya Discord'un ek sınırını ({limit // (1024 * 1024)} MB) aşıyor. "
+                           "`!export_tasks csv open` gibi bir durumla daraltmayı deneyin.")
+            return
+        f.seek(0)
+        await ctx.send(f"📤 {count} görev dışa aktarıldı.", file=discord.File(f, filename=f"tasks.{fmt}"))
+
+async def iter_attachment_lines(attachment):
+    """Ek dosyasını tamamı belleğe alınmadan, indirildikçe satır satır üretir."""
+    import aiohttp
 
-@bot.command(name="delete_task", help="Belirli bir ID'ye sahip görevi siler. Kullanım: !delete_task <task_id>")
-async def delete_task(ctx, task_id: int):
-    """Belirli bir ID'ye sahip görevi siler."""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(attachment.url) as response:
+            response.raise_for_status()
+            async for line in response.content:
+                yield line
+
+@command(name="import_tasks", help="Ekli CSV ya da JSONL dosyasındaki görevleri ekler (!export_tasks çıktısı da olur). Kullanım: !import_tasks + dosya")
+async def import_tasks(ctx):
+    """Ekli dosyayı indirildikçe ayrıştırır, görevleri partiler halinde ekler ve ilerlemeyi bildirir."""
+    if not ctx.message.attachments:
+        await ctx.send("Lütfen bir `.csv` ya da `.jsonl` dosyası ekleyin. Kullanım: `!import_tasks` + dosya")
+        return
+    attachment = ctx.message.attachments[0]
     try:
-        task_id = int(task_id) 
-        if delete_task_db(task_id):
-            await ctx.send(f"🗑️ Görev `{task_id}` başarıyla silindi.")
+        fmt = transfer.format_for(attachment.filename)
+    except transfer.ImportFormatError:
+        await ctx.send(f"⚠️ `{attachment.filename}` desteklenmiyor; `.csv` ya da `.jsonl` dosyası ekleyin.")
+        return
+    if attachment.size > MAX_IMPORT_BYTES:
+        await ctx.send(f"⚠️ `{attachment.filename}` dosyası çok büyük.")
+        return
+
+    status_message = await ctx.send(f"⏳ `{attachment.filename}` içe aktarılıyor…")
+    added = 0
+    reported_at = time.monotonic()
+
+    async def report(count):
+        nonlocal added, reported_at
+        added = count
+        if time.monotonic() - reported_at >= IMPORT_PROGRESS_INTERVAL:
+            reported_at = time.monotonic()
+            await status_message.edit(content=f"⏳ {count} görev içe aktarıldı…")
+
+    try:
+        result = await transfer.import_tasks(ctx.bot.store, iter_attachment_lines(attachment), fmt,
+                                             progress=report, **task_scope(ctx))
+    except Exception as e:
+        if added:
+            board_changed(ctx)
+        await status_message.edit(content=f"⚠️ İçe aktarma yarıda kaldı ({added} görev eklendi): {e}")
+        return
+    if result.added:
+        board_changed(ctx)
+    lines = [f"✅ {result.added} görev içe aktarıldı."]
+    if result.completed:
+        lines.append(f"✔️ {result.completed} görev tamamlanmış olarak işaretlendi.")
+    if result.skipped:
+        lines.append(f"⚠️ {result.skipped} kayıt okunamadı ve atlandı (ilki {result.first_error_line}. satırda).")
+    await status_message.edit(content="\n".join(lines))
+
+async def load_task_page(store, scope, after_id: int = 0, status: str = "all"):
+    """Kapsamda `after_id`'den sonraki görev sayfasını mesaj sınırına sığacak şekilde getirir."""
+    page = await store.render_tasks_page(after_id, PAGE_SIZE, status=status, **scope)
+    if not page.count:
+        return Page(EMPTY_TASK_LIST, after_id, None)
+    return Page(page.text, after_id, page.last_id if page.has_more else None)
+
+@command(name="show_tasks", help="Görevleri sayfa sayfa listeler. Kullanım: !show_tasks [open|done|all]")
+async def show_tasks(ctx, status: str = "all"):
+    """Görevleri sayfa sayfa listeler; yalnızca açık ya da tamamlanmış görevler de istenebilir."""
+    status = status.lower()
+    if status not in TASK_STATUSES:
+        await ctx.send("Lütfen geçerli bir durum girin: `open`, `done` veya `all`. Örneğin: `!show_tasks open`")
+        return
+    load_page = functools.partial(load_task_page, ctx.bot.store, task_scope(ctx), status=status)
+    page = await load_page()
+    if page.next_cursor is None:
+        await ctx.send(page.text)
+    else:
+        from views import PaginatedView
+        await ctx.send(page.text, view=PaginatedView(load_page, page))
+
+async def load_search_page(store, scope, query, offset: int = 0):
+    """Arama sonuçlarının `offset`'ten başlayan sayfasını getirir; imleç sonuç sırasıdır."""
+    tasks = await store.search_tasks(query, offset, PAGE_SIZE + 1, **scope)
+    page = render_page(tasks, PAGE_SIZE, title=SEARCH_RESULTS_TITLE)
+    if not page.count:
+        return Page(NO_SEARCH_RESULTS, offset, None)
+    return Page(page.text, offset, offset + page.count if page.has_more else None)
+
+@command(name="search_tasks", help='Görev açıklamalarında arama yapar. Kullanım: !search_tasks <kelime>, kelime* veya "tam ifade"')
+async def search_tasks(ctx, *, query: str):
+    """Görev açıklamalarında tam metin araması yapar ve sonuçları alaka sırasıyla listeler."""
+    try:
+        load_page = functools.partial(load_search_page, ctx.bot.store, task_scope(ctx), query)
+        page = await load_page()
+    except ValueError:
+        await ctx.send('Lütfen aranacak bir kelime girin. Örneğin: `!search_tasks rapor*` veya `!search_tasks "haftalık toplantı"`')
+        return
+    if page.next_cursor is None:
+        await ctx.send(page.text)
+    else:
+        from views import PaginatedView
+        await ctx.send(page.text, view=PaginatedView(load_page, page))
+
+@command(name="task_stats", help="Toplam, açık ve tamamlanmış görev sayılarını gösterir.")
+async def task_stats(ctx):
+    """Kapsamdaki görev sayılarını gösterir."""
+    counts = await ctx.bot.store.get_task_counts(**task_scope(ctx))
+    await ctx.send(
+        "📊 **Görev İstatistikleri:**\n"
+        f"Toplam: {counts.total}\n"
+        f"❌ Açık: {counts.open}\n"
+        f"✅ Tamamlanan: {counts.done}"
+    )
+
+def parse_id_spec(spec):
+    """
+    "3,7,10-250" gibi ID listesi ve aralıklarını sıralı, tekrarsız bir ID
+    listesine çevirir. Geçersiz girişte veya MAX_BATCH_IDS aşılırsa ValueError fırlatır.
+    """
+    task_ids = set()
+    for token in re.split(r"[,\s]+", str(spec).strip()):
+        if not token:
+            continue
+        match = _ID_TOKEN.fullmatch(token)
+        if not match:
+            raise ValueError(f"Geçersiz ID: {token}")
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else start
+        if end < start or len(task_ids) + (end - start + 1) > MAX_BATCH_IDS:
+            raise ValueError(f"Geçersiz aralık: {token}")
+        task_ids.update(range(start, end + 1))
+    if not task_ids:
+        raise ValueError("ID girilmedi.")
+    return sorted(task_ids)
+
+def format_id_ranges(task_ids, limit=MAX_ID_SUMMARY_LENGTH):
+    """Sıralı ID listesini "3, 7, 10-250" biçiminde kısaltarak yazar."""
+    ranges = []
+    for task_id in task_ids:
+        if ranges and task_id == ranges[-1][1] + 1:
+            ranges[-1][1] = task_id
         else:
-            await ctx.send(f"⚠️ `{task_id}` ID'li görev bulunamadı.")
+            ranges.append([task_id, task_id])
+    text = ", ".join(str(start) if start == end else f"{start}-{end}" for start, end in ranges)
+    return text if len(text) <= limit else text[:limit].rsplit(",", 1)[0] + ", …"
+
+@command(name="delete_task", help="Belirli ID'lere sahip görevleri siler. Kullanım: !delete_task <task_id> veya !delete_task 3,7,10-20")
+async def delete_task(ctx, *, task_ids: str):
+    """Belirli ID'lere sahip görevleri siler."""
+    try:
+        ids = parse_id_spec(task_ids)
+        if len(ids) == 1:
+            task_id = ids[0]
+            if await ctx.bot.store.delete_task(task_id, **task_scope(ctx)):
+                board_changed(ctx)
+                await ctx.send(f"🗑️ Görev `{task_id}` başarıyla silindi.")
+            else:
+                await ctx.send(f"⚠️ `{task_id}` ID'li görev bulunamadı.")
+            return
+
+        result = await ctx.bot.store.delete_tasks(ids, **task_scope(ctx))
+        lines = ["🗑️ **Toplu silme sonucu:**"]
+        if result.succeeded:
+            board_changed(ctx)
+            lines.append(f"Silinen ({len(result.succeeded)}): `{format_id_ranges(result.succeeded)}`")
+        if result.missing:
+            lines.append(f"⚠️ Bulunamayan ({len(result.missing)}): `{format_id_ranges(result.missing)}`")
+        await ctx.send("\n".join(lines))
     except ValueError:
         await ctx.send("Lütfen geçerli bir görev ID'si girin. Örneğin: `!delete_task 1`")
     except Exception as e:
         await ctx.send(f"Bir hata oluştu: {e}")
 
 
-@bot.command(name="complete_task", help="Belirli bir ID'ye sahip görevi tamamlandı olarak işaretler. Kullanım: !complete_task <task_id>")
-async def complete_task(ctx, task_id: int):
-    """Belirli bir ID'ye sahip görevi tamamlandı olarak işaretler."""
+@command(name="complete_task", help="Belirli ID'lere sahip görevleri tamamlandı olarak işaretler. Kullanım: !complete_task <task_id> veya !complete_task 3,7,10-20")
+async def complete_task(ctx, *, task_ids: str):
+    """Belirli ID'lere sahip görevleri tamamlandı olarak işaretler."""
     try:
-        task_id = int(task_id)
-        task = get_task_by_id_db(task_id)
-
-        if not task:
-            await ctx.send(f"⚠️ `{task_id}` ID'li görev bulunamadı.")
-            return
-        
-        if task[2] == 1:
-            await ctx.send(f"ℹ️ `{task_id}` ID'li görev zaten tamamlanmış durumda.")
+        ids = parse_id_spec(task_ids)
+        if len(ids) > 1:
+            result = await ctx.bot.store.complete_tasks(ids, **task_scope(ctx))
+            lines = ["✔️ **Toplu tamamlama sonucu:**"]
+            if result.succeeded:
+                board_changed(ctx)
+                lines.append(f"Tamamlanan ({len(result.succeeded)}): `{format_id_ranges(result.succeeded)}`")
+            if result.already_completed:
+                lines.append(f"ℹ️ Zaten tamamlanmış ({len(result.already_completed)}): `{format_id_ranges(result.already_completed)}`")
+            if result.missing:
+                lines.append(f"⚠️ Bulunamayan ({len(result.missing)}): `{format_id_ranges(result.missing)}`")
+            await ctx.send("\n".join(lines))
             return
 
-        if complete_task_db(task_id):
+        task_id = ids[0]
+        outcome = await ctx.bot.store.complete_task(task_id, **task_scope(ctx))
+
+        if outcome is TaskOutcome.COMPLETED:
+            board_changed(ctx)
             await ctx.send(f"✔️ Görev `{task_id}` tamamlandı olarak işaretlendi.")
+        elif outcome is TaskOutcome.ALREADY_COMPLETED:
+            await ctx.send(f"ℹ️ `{task_id}` ID'li görev zaten tamamlanmış durumda.")
         else:
-            await ctx.send(f"⚠️ `{task_id}` ID'li görev tamamlanamadı veya bulunamadı.")
+            await ctx.send(f"⚠️ `{task_id}` ID'li görev bulunamadı.")
     except ValueError:
         await ctx.send("Lütfen geçerli bir görev ID'si girin. Örneğin: `!complete_task 1`")
     except Exception as e:
         await ctx.send(f"Bir hata oluştu: {e}")
 
-@bot.event
+@command(name="pin_board", help="Kanala, görevler değiştikçe kendiliğinden güncellenen sabitlenmiş bir pano koyar. Kaldırmak için: !pin_board off")
+async def pin_board(ctx, action: str = "on"):
+    """Kanalın görev panosunu oluşturur, yeniler ya da kaldırır."""
+    import discord
+
+    if action.lower() == "off":
+        if await ctx.bot.store.delete_board(ctx.channel.id, guild_id=task_scope(ctx)["guild_id"]):
+            await ctx.send("📌 Görev panosu kaldırıldı; artık güncellenmeyecek.")
+        else:
+            await ctx.send("⚠️ Bu kanalda görev panosu yok.")
+        return
+
+    scope = task_scope(ctx)
+    message = await ctx.send(await render_board_text(ctx.bot.store, scope))
+    previous = await ctx.bot.store.set_board(ctx.channel.id, message.id, **scope)
+    try:
+        await message.pin()
+    except discord.HTTPException:
+        await ctx.send("ℹ️ Pano oluşturuldu ancak sabitlenemedi; botun mesaj sabitleme yetkisi olmayabilir.")
+    if previous is not None and previous != message.id:
+        try:
+            await ctx.channel.get_partial_message(previous).unpin()
+        except discord.HTTPException:
+            pass
+
+@command(name="perf", help="Komut gecikmelerini, SQL sürelerini, hataları ve önbellek durumunu gösterir (yalnızca yöneticiler).",
+         administrator_only=True)
+async def perf(ctx):
+    """Performans ölçümlerinin özetini gösterir."""
+    await ctx.send(format_report())
+
 async def on_command_error(ctx, error):
     """Komut hatalarını yakalar."""
+    from discord.ext import commands
+
+    REGISTRY.increment(
+        "bot_command_errors_total",
+        command=ctx.command.qualified_name if ctx.command is not None else "",
+        error=type(getattr(error, "original", error)).__name__,
+    )
     if isinstance(error, commands.CommandNotFound):
         await ctx.send("❓ Bilinmeyen komut. Yardım için `!help` yazabilirsiniz.")
     elif isinstance(error, commands.MissingRequiredArgument):
         await ctx.send(f"⚠️ Eksik argüman. Komutun doğru kullanımı için `!help {ctx.command.name}` yazın.")
+    elif isinstance(getattr(error, "original", None), StoreBusyError):
+        await ctx.send("⏳ Bot şu anda çok yoğun. Lütfen birkaç saniye sonra tekrar deneyin.")
+    elif isinstance(error, (commands.MissingPermissions, commands.NoPrivateMessage)):
+        await ctx.send("⛔ Bu komutu yalnızca sunucu yöneticileri kullanabilir.")
     elif isinstance(error, commands.BadArgument):
         await ctx.send(f"⚠️ Geçersiz argüman tipi. Komutun doğru kullanımı için `!help {ctx.command.name}` yazın.")
     else:
         print(f"Bir hata oluştu: {error}")
         await ctx.send("Beklenmedik bir hata oluştu. Lütfen daha sonra tekrar deneyin.")
 
+def create_bot(config=None, store=None):
+    """
+    Komutları kayıtlı yeni bir bot döner. `config` verilmezse ortamdan okunur
+    (load_config); `store` verilmezse ayardaki depo oluşturulur. Botun
+    kullandığı deponun kalıcı kaynakları (SQLite göçleri, checkpoint) ilk
+    bağlantıdan önce setup_hook'ta hazırlanır; yalnızca botu kuran araçlar
+    bu bedeli ödemez.
+    """
+    import discord
+    from discord.ext import commands
+
+    config = load_config() if config is None else config
+    intents = discord.Intents.default()
+    intents.message_content = True
+    if config.shard_count:
+        bot = commands.AutoShardedBot(command_prefix="!", intents=intents,
+                                      shard_count=config.shard_count, shard_ids=config.shard_ids)
+    else:
+        bot = commands.Bot(command_prefix="!", intents=intents)
+    bot.config = config
+    bot.store = create_store(config.store, **(config.store_options or {})) if store is None else store
+    bot.board_updates = Debouncer(functools.partial(refresh_boards, bot))
+
+    for callback, options in COMMANDS:
+        checks = [commands.has_permissions(administrator=True).predicate] if options["administrator_only"] else []
+        bot.add_command(commands.Command(callback, name=options["name"], help=options["help"], checks=checks))
+    bot.before_invoke(start_command_timer)
+    bot.after_invoke(record_command_latency)
+    bot.event(on_command_error)
+
+    @bot.event
+    async def on_ready():
+        """Bot hazır olduğunda çalışır."""
+        print(f'{bot.user.name} Discord\'a bağlandı!')
+        print(f'Bot ID: {bot.user.id}')
+
+    async def setup_hook():
+        # on_ready her yeniden bağlanmada tekrar çalışır; depo yalnızca ilk girişte hazırlanır.
+        # Ortamdaki değil, botun kullandığı deponun dosyası hazırlanır.
+        prepare = functools.partial(prepare_store, config.store,
+                                    options=options_of(bot.store, config.store_options))
+        print(await asyncio.get_running_loop().run_in_executor(None, prepare))
+
+    bot.setup_hook = setup_hook
+    return bot
+
+def main():
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    config = load_config()
+    if not config.token:
+        print("Hata: DISCORD_TOKEN ortam değişkeni bulunamadı.")
+        print("Lütfen .env dosyası oluşturup içine DISCORD_TOKEN=YOUR_BOT_TOKEN yazın veya sistem ortam değişkeni olarak ayarlayın.")
+        return 1
+    bot = create_bot(config)
+    if os.getenv("METRICS_PORT"):
+        from metrics import start_http_server
+
+        start_http_server(int(os.getenv("METRICS_PORT")))
+        print(f"Ölçümler http://127.0.0.1:{os.getenv('METRICS_PORT')}/metrics adresinde.")
+    try:
+        bot.run(config.token)
+    finally:
+        bot.store.close()
+    return 0
 
 if __name__ == "__main__":
-    bot.run(DISCORD_TOKEN)
\ No newline at end of file
+    sys.exit(main())
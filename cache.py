@@ -0,0 +1,247 @@
+import bisect
+import threading
+from collections import OrderedDict
+
+from rendering import TASK_LIST_TITLE, RenderedTaskList
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_MAX_TENANT_ROWS = 5000
+# Satır başına tuple, int ve sözlük girdisi için kabaca ek yük.
+ROW_OVERHEAD_BYTES = 120
+_ANY_CHANNEL = object()
+
+class _TenantEntry:
+    __slots__ = ("ids", "rows", "size", "view")
+
+    def __init__(self, rows):
+        self.ids = [row[0] for row in rows]
+        self.rows = {row[0]: row for row in rows}
+        self.size = sum(_row_size(row) for row in rows)
+        self.view = None
+
+    def changed(self, task_id):
+        """Görevin hazır metnini atar ve girdinin boyutundaki değişimi döner."""
+        if self.view is None:
+            return 0
+        before = self.view.size
+        self.view.task_changed(task_id)
+        delta = self.view.size - before
+        self.size += delta
+        return delta
+
+def _row_size(row):
+    return len(row[1]) + ROW_OVERHEAD_BYTES
+
+class TaskCache:
+    """
+    Kiracı (veritabanı, sunucu, kanal) başına görev listesini bellekte tutan
+    okuma önbelleği. Okumalar `loader` ile veritabanından doldurulur; yazmalar
+    commit edildikten sonra ilgili girdileri yerinde günceller. Toplam boyut
+    `max_bytes`'ı aşınca en uzun süredir kullanılmayan kiracılar atılır;
+    `max_tenant_rows`'dan büyük listeler önbelleğe alınmaz. Böyle bir kiracı
+    en az kaç satırı olduğuyla hatırlanır ve silmeler onu sınırın altına
+    indirebilecek kadar azaltana dek yeniden yüklenmeye çalışılmaz.
+
+    Her yazma, (veritabanı, sunucu) için bir nesil sayacını artırır. Bir
+    yükleme sürerken yazma olduysa yüklenen (eski olabilecek) liste saklanmaz.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, max_tenant_rows=DEFAULT_MAX_TENANT_ROWS):
+        self.max_bytes = max_bytes
+        self.max_tenant_rows = max_tenant_rows
+        self._entries = OrderedDict()
+        # Sığmayan kiracılar: anahtar -> en az satır sayısı.
+        self._oversized = {}
+        self._generations = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        """İsabet/ıska sayaçlarını ve bellek kullanımını döner."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "tenants": len(self._entries),
+                "bytes": self._size,
+            }
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                if key in self._oversized:
+                    return None, None
+                return None, self._token(key)
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry, None
+
+    def _load(self, key, generation, loader):
+        rows = loader(self.max_tenant_rows + 1)
+        if len(rows) > self.max_tenant_rows:
+            with self._lock:
+                if self._token(key) == generation:
+                    self._oversized[key] = len(rows)
+            return None
+        entry = _TenantEntry(rows)
+        with self._lock:
+            if self._token(key) != generation or key in self._entries:
+                return entry
+            self._entries[key] = entry
+            self._size += entry.size
+            self._evict()
+        return entry
+
+    def _evict(self):
+        while self._size > self.max_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._size -= entry.size
+            self.evictions += 1
+
+    def _entry(self, key, loader):
+        entry, generation = self._lookup(key)
+        if entry is None and generation is not None:
+            entry = self._load(key, generation, loader)
+        return entry
+
+    @staticmethod
+    def _rows_after(entry, after_id, limit, completed):
+        start = bisect.bisect_right(entry.ids, after_id)
+        if completed is None:
+            return [entry.rows[task_id] for task_id in entry.ids[start:start + limit]]
+        rows = []
+        for task_id in entry.ids[start:]:
+            row = entry.rows[task_id]
+            if row[2] == completed:
+                rows.append(row)
+                if len(rows) == limit:
+                    break
+        return rows
+
+    def get_tasks(self, key, loader, completed=None):
+        """
+        Kiracının tüm görevlerini (`completed` verilirse yalnızca o durumdakileri)
+        döner. `loader(limit)` en fazla `limit` satırı ID sırasıyla getirir;
+        sınırı aşan listeler önbelleğe alınmaz. Liste önbelleğe sığmıyorsa None döner.
+        """
+        entry = self._entry(key, loader)
+        if entry is None:
+            return None
+        with self._lock:
+            return self._rows_after(entry, 0, len(entry.ids), completed)
+
+    def get_page(self, key, after_id, limit, loader, completed=None):
+        """ID'si `after_id`'den büyük en fazla `limit` görevi döner; önbelleğe sığmıyorsa None."""
+        entry = self._entry(key, loader)
+        if entry is None:
+            return None
+        with self._lock:
+            return self._rows_after(entry, after_id, limit, completed)
+
+    def render_page(self, key, after_id, page_size, loader, completed=None, title=TASK_LIST_TITLE):
+        """
+        Kiracının `after_id`'den sonraki sayfasını hazır metin olarak döner
+        (rendering.RenderedPage); liste önbelleğe sığmıyorsa None döner.
+        """
+        entry = self._entry(key, loader)
+        if entry is None:
+            return None
+        with self._lock:
+            if entry.view is None:
+                entry.view = RenderedTaskList()
+            before = entry.view.size
+            page = entry.view.page(
+                after_id, page_size, lambda limit: self._rows_after(entry, after_id, limit, completed), title
+            )
+            # Hazır metin de kiracının boyutuna sayılır ve max_bytes'a tabidir.
+            grown = entry.view.size - before
+            entry.size += grown
+            if self._entries.get(key) is entry:
+                self._size += grown
+                self._evict()
+            return page
+
+    def get_task(self, key, task_id):
+        """
+        Kiracının listesi önbellekteyse `(True, satır veya None)`, değilse
+        `(False, None)` döner; tek satır için liste yüklenmez.
+        """
+        entry, _ = self._lookup(key)
+        if entry is None:
+            return False, None
+        with self._lock:
+            return True, entry.rows.get(task_id)
+
+    def _token(self, key):
+        return self._epoch, self._generations.get(key[:2], 0)
+
+    def _entries_for(self, db_name, guild_id, channel_id=_ANY_CHANNEL):
+        """
+        Yazmadan etkilenen girdileri döner ve nesil sayacını artırır. Sunucu
+        genelindeki liste her zaman etkilenir; kanal listeleri yalnızca kanal
+        eşleşiyorsa (veya yazma ID ile yapıldıysa tümü) etkilenir.
+        """
+        tenant = (db_name, guild_id)
+        self._generations[tenant] = self._generations.get(tenant, 0) + 1
+        return [
+            entry for key, entry in self._entries.items()
+            if key[:2] == tenant and (
+                key[2] is None or channel_id is _ANY_CHANNEL
+                or (channel_id is not None and key[2] == channel_id)
+            )
+        ]
+
+    def add(self, db_name, guild_id, channel_id, rows):
+        """Commit edilen yeni görevleri kiracı listelerine ekler."""
+        with self._lock:
+            for entry in self._entries_for(db_name, guild_id, channel_id):
+                for row in rows:
+                    if row[0] not in entry.rows:
+                        bisect.insort(entry.ids, row[0])
+                        entry.rows[row[0]] = row
+                        entry.size += _row_size(row)
+                        self._size += _row_size(row) + entry.changed(row[0])
+            self._evict()
+
+    def mark_completed(self, db_name, guild_id, task_ids):
+        """Commit edilen tamamlamaları yerinde uygular."""
+        with self._lock:
+            for entry in self._entries_for(db_name, guild_id):
+                for task_id in task_ids:
+                    row = entry.rows.get(task_id)
+                    if row is not None:
+                        entry.rows[task_id] = (row[0], row[1], 1)
+                        self._size += entry.changed(task_id)
+
+    def remove(self, db_name, guild_id, task_ids):
+        """Commit edilen silmeleri yerinde uygular."""
+        with self._lock:
+            for key in [key for key in self._oversized if key[:2] == (db_name, guild_id)]:
+                # Silinenler başka bir kanalda olabilir; alt sınır yine de geçerlidir.
+                self._oversized[key] -= len(task_ids)
+                if self._oversized[key] <= self.max_tenant_rows:
+                    del self._oversized[key]
+            for entry in self._entries_for(db_name, guild_id):
+                for task_id in task_ids:
+                    row = entry.rows.pop(task_id, None)
+                    if row is not None:
+                        del entry.ids[bisect.bisect_left(entry.ids, task_id)]
+                        entry.size -= _row_size(row)
+                        self._size += entry.changed(task_id) - _row_size(row)
+
+    def invalidate(self, db_name=None):
+        """Bir veritabanının (verilmezse tümünün) girdilerini atar."""
+        with self._lock:
+            for key in [key for key in self._entries if db_name is None or key[0] == db_name]:
+                self._size -= self._entries.pop(key).size
+            for key in [key for key in self._oversized if db_name is None or key[0] == db_name]:
+                del self._oversized[key]
+            # Sürmekte olan yüklemelerin sonuçlarını da geçersiz kılar.
+            self._epoch += 1
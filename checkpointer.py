@@ -0,0 +1,104 @@
+import os
+import threading
+import time
+
+from metrics import REGISTRY
+
+DEFAULT_POLL_INTERVAL = 1.0
+WAL_HEADER_SIZE = 32
+WAL_FRAME_HEADER_SIZE = 24
+
+class WalCheckpointer:
+    """
+    WAL dosyasını arka planda ana veritabanına aktaran thread. WAL değiştiyse
+    ve son checkpoint'ten bu yana `interval` saniye geçtiyse ya da o zamandan
+    beri `max_pages` sayfadan fazla yazıldıysa PASSIVE checkpoint yapar. PASSIVE checkpoint
+    okuyucuları ve yazıcıları beklemez. wal_autocheckpoint `max_pages`'ten
+    büyük tutulduğunda (varsayılan profilde dört katıdır) commit eden
+    thread'lerin checkpoint işini üstlenmesi de büyük ölçüde önlenir.
+    """
+
+    def __init__(self, connect, wal_path, interval, max_pages,
+                 poll_interval=DEFAULT_POLL_INTERVAL, name="wal-checkpointer"):
+        self._connect = connect
+        self.wal_path = wal_path
+        self.interval = interval
+        self.max_pages = max_pages
+        self.poll_interval = min(poll_interval, interval)
+        self.checkpoints = 0
+        # Başlangıç durumu thread açılmadan alınır; aradaki yazmalar kaçırılmasın.
+        self._initial_state = self._wal_state()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def close(self, timeout=None):
+        """Thread'i durdurur."""
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def _wal_state(self):
+        """
+        WAL'ın `(tuz, çerçeve sayısı)` durumunu döner; WAL yoksa None. Dosya
+        boyutu kullanılamaz: PASSIVE checkpoint dosyayı küçültmez ve sıfırlanan
+        WAL baştan üzerine yazılır. Sıfırlamada başlıktaki tuz değişir; geçerli
+        çerçeveler tuzu başlıktakiyle aynı olan baştaki çerçevelerdir ve
+        sayıları ikili aramayla birkaç küçük okumada bulunur.
+        """
+        try:
+            fd = os.open(self.wal_path, os.O_RDONLY)
+        except FileNotFoundError:
+            return None
+        try:
+            header = os.pread(fd, WAL_HEADER_SIZE, 0)
+            if len(header) < WAL_HEADER_SIZE:
+                return b"", 0
+            page_size = int.from_bytes(header[8:12], "big")
+            frame_size = WAL_FRAME_HEADER_SIZE + (65536 if page_size == 1 else page_size)
+            salt = header[16:24]
+            low, high = 0, (os.fstat(fd).st_size - WAL_HEADER_SIZE) // frame_size
+            while low < high:
+                middle = (low + high + 1) // 2
+                if os.pread(fd, 8, WAL_HEADER_SIZE + (middle - 1) * frame_size + 8) == salt:
+                    low = middle
+                else:
+                    high = middle - 1
+            return salt, low
+        finally:
+            os.close(fd)
+
+    def _frames_since(self, state, last_state):
+        if last_state is None or state[0] != last_state[0]:
+            return state[1]
+        return state[1] - last_state[1]
+
+    def _run(self):
+        conn = self._connect()
+        try:
+            last_state = self._initial_state
+            last_checkpoint = time.monotonic()
+            while not self._stop.wait(self.poll_interval):
+                state = self._wal_state()
+                if state is None or state == last_state:
+                    continue
+                too_big = self._frames_since(state, last_state) >= self.max_pages
+                if too_big or time.monotonic() - last_checkpoint >= self.interval:
+                    self.checkpoint(conn)
+                    last_state = self._wal_state()
+                    last_checkpoint = time.monotonic()
+        finally:
+            conn.close()
+
+    def checkpoint(self, conn):
+        """Tek bir PASSIVE checkpoint yapar ve `(meşgul, WAL çerçeveleri, aktarılan)` döner."""
+        start = time.perf_counter()
+        try:
+            result = conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+        except Exception as e:
+            REGISTRY.increment("sqlite_checkpoint_errors_total")
+            print(f"WAL checkpoint başarısız: {e}")
+            return None
+        REGISTRY.observe("sqlite_checkpoint_duration_seconds", time.perf_counter() - start)
+        REGISTRY.increment("sqlite_checkpoint_frames_total", max(0, result[2]))
+        self.checkpoints += 1
+        return result
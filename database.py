@@ -1,97 +1,788 @@
+import atexit
+import enum
+import functools
+import queue
+import re
 import sqlite3
+import threading
+from collections import namedtuple
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+import metrics
+from cache import TaskCache
+from checkpointer import WalCheckpointer
+from dbconfig import DEFAULT_PROFILE, apply_profile
+from migrations import migrate, rebuild_task_counts
+from rendering import STATUS_TITLES, RenderedPage, render_page
+from writer import WriteCoordinator, DEFAULT_MAX_BATCH_SIZE, DEFAULT_MAX_LATENCY
 
 DEFAULT_DB_NAME = "tasks.db" 
+_storage_profile = DEFAULT_PROFILE
+DEFAULT_POOL_SIZE = 4
+DEFAULT_POOL_TIMEOUT = 10.0
+STATEMENT_CACHE_SIZE = 128
+DEFAULT_PAGE_SIZE = 20
+# Listeleme durumları ve karşılık gelen `completed` değeri (None: hepsi).
+TASK_STATUSES = {"all": None, "open": 0, "done": 1}
+# SQLite'ın eski sürümlerindeki 999 parametre sınırının altında kalır.
+MAX_SQL_PARAMS = 900
+# Arama girdisindeki "tırnaklı ifade"* ve kelime* parçaları.
+_SEARCH_TOKEN = re.compile(r'"([^"]*)"(\*?)|(\S+)')
+
+# UPDATE/DELETE ... RETURNING SQLite 3.35.0 ile geldi; eski sürümlerde SELECT ile yedeklenir.
+SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+class TaskOutcome(enum.Enum):
+    """Tek bir göreve uygulanan değişikliğin sonucu."""
+    COMPLETED = "completed"
+    ALREADY_COMPLETED = "already_completed"
+    NOT_FOUND = "not_found"
+
+TaskCounts = namedtuple("TaskCounts", "total open done")
+
+BatchResult = namedtuple("BatchResult", "succeeded already_completed missing")
+
+# Süreç genelindeki okuma önbelleği; yazmalar commit sonrasında yerinde uygular.
+task_cache = TaskCache()
+
+def _cache_metrics():
+    stats = task_cache.stats()
+    for name in ("hits", "misses", "evictions"):
+        yield f"task_cache_{name}_total", "counter", {}, stats[name]
+    yield "task_cache_bytes", "gauge", {}, stats["bytes"]
+    yield "task_cache_tenants", "gauge", {}, stats["tenants"]
+
+metrics.REGISTRY.add_collector(_cache_metrics)
 
 def get_db_connection(db_name=None):
     """Belirtilen veritabanına veya varsayılana bir bağlantı kurar."""
     name_to_use = db_name if db_name is not None else DEFAULT_DB_NAME
-    conn = sqlite3.connect(name_to_use)
-    return conn
+    conn = sqlite3.connect(
+        name_to_use,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        factory=metrics.TimedConnection,
+    )
+    apply_profile(conn, _storage_profile)
+    return metrics.instrument_connection(conn)
+
+def configure_storage(profile):
+    """
+    Bundan sonra açılacak bağlantıların depolama profilini (dbconfig.StorageProfile)
+    ayarlar. Havuzlar bağlantıları tembel açtığı için süreç başında çağrılmalıdır.
+    """
+    global _storage_profile
+    _storage_profile = profile
+
+def get_storage_profile():
+    """Geçerli depolama profilini döner."""
+    return _storage_profile
+
+class PoolClosedError(RuntimeError):
+    """Kapatılmış bir havuzdan bağlantı istendiğinde fırlatılır."""
+
+class ConnectionPool:
+    """
+    Tek bir veritabanı için uzun ömürlü bağlantıları tutan, thread-safe havuz.
+    Bağlantılar kapatılmadan yeniden kullanılır; böylece sqlite3'ün hazırlanmış
+    ifade önbelleği (cached_statements) ve sayfa önbelleği çağrılar arasında korunur.
+    """
+
+    def __init__(self, db_name, max_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_POOL_TIMEOUT):
+        self.db_name = db_name
+        # Her ":memory:" bağlantısı ayrı bir veritabanıdır; tek bağlantı paylaşılmalı.
+        self.max_size = 1 if db_name == ":memory:" else max_size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+
+    def acquire(self):
+        """Havuzdan boşta bir bağlantı alır, gerekirse yenisini açar."""
+        if self._closed:
+            raise PoolClosedError(f"'{self.db_name}' havuzu kapatılmış.")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.max_size:
+                self._created += 1
+                try:
+                    return get_db_connection(self.db_name)
+                except Exception:
+                    self._created -= 1
+                    raise
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(f"'{self.db_name}' havuzundan bağlantı alınamadı.") from None
+
+    def release(self, conn):
+        """Bağlantıyı havuza geri bırakır; yarım kalan işlemi geri alır."""
+        if conn.in_transaction:
+            conn.rollback()
+        if self._closed:
+            self._discard(conn)
+            return
+        self._idle.put(conn)
+
+    def _discard(self, conn):
+        with self._lock:
+            self._created -= 1
+        conn.close()
+
+    @contextmanager
+    def connection(self):
+        """`with pool.connection() as conn:` biçiminde bağlantı ödünç verir."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Boştaki bağlantıları kapatır; ödünçtekiler iade edilince kapanır."""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(db_name=None):
+    """Veritabanı adına göre paylaşılan bağlantı havuzunu döner (yoksa oluşturur)."""
+    name_to_use = db_name if db_name is not None else DEFAULT_DB_NAME
+    pool = _pools.get(name_to_use)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(name_to_use)
+            if pool is None:
+                pool = _pools[name_to_use] = ConnectionPool(name_to_use)
+    return pool
+
+def close_pool(db_name=None):
+    """Belirtilen veritabanının havuzunu kapatır ve kayıttan çıkarır."""
+    name_to_use = db_name if db_name is not None else DEFAULT_DB_NAME
+    with _pools_lock:
+        pool = _pools.pop(name_to_use, None)
+    if pool is not None:
+        pool.close()
+    task_cache.invalidate(name_to_use)
+
+def close_all_pools():
+    """Tüm havuzlardaki bağlantıları kapatır. Süreç kapanırken otomatik çağrılır."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+atexit.register(close_all_pools)
+
+@contextmanager
+def _borrow(db_name=None):
+    with get_pool(db_name).connection() as conn:
+        yield conn
 
 def init_db(db_name=None):
-    """Veritabanını ve görevler tablosunu oluşturur (eğer yoksa)."""
-    conn = get_db_connection(db_name)
-    cursor = conn.cursor()
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS tasks (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            description TEXT NOT NULL,
-            completed INTEGER DEFAULT 0 -- 0: incomplete, 1: completed
-        )
-    ''')
-    conn.commit()
-    conn.close()
-
-def add_task_db(description: str, db_name=None):
+    """
+    Veritabanı şemasını bekleyen göçleri uygulayarak günceller ve uygulanan
+    sürümleri döner. Bot bunu süreç başında bir kez çağırır.
+    """
+    with _borrow(db_name) as conn:
+        applied = migrate(conn)
+    if applied:
+        task_cache.invalidate(db_name if db_name is not None else DEFAULT_DB_NAME)
+    return applied
+
+def _scope(guild_id=None, channel_id=None):
+    """
+    Kiracı koşulunu `(sql, parametreler)` olarak döner. Görevler her zaman
+    sunucuya göre ayrılır (`guild_id IS ?` NULL ile de eşleşir ve indeks
+    kullanır); `channel_id` verilirse ayrıca kanala göre süzülür.
+    """
+    if channel_id is None:
+        return "guild_id IS ?", (guild_id,)
+    return "guild_id IS ? AND channel_id = ?", (guild_id, channel_id)
+
+def _add_task(conn, description, guild_id=None, channel_id=None):
+    return conn.execute(
+        "INSERT INTO tasks (description, guild_id, channel_id) VALUES (?, ?, ?)",
+        (description, guild_id, channel_id),
+    ).lastrowid
+
+def _add_tasks(conn, descriptions, guild_id=None, channel_id=None, completed=None):
+    completed = completed or [False] * len(descriptions)
+    rows = [(description, int(bool(done)), guild_id, channel_id) for description, done in zip(descriptions, completed)]
+    if not rows:
+        return []
+    conn.executemany("INSERT INTO tasks (description, completed, guild_id, channel_id) VALUES (?, ?, ?, ?)", rows)
+    # İşlem yazma kilidini tuttuğu için AUTOINCREMENT ID'leri ardışıktır.
+    last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+    return list(range(last_id - len(rows) + 1, last_id + 1))
+
+def _delete_task(conn, task_id, guild_id=None, channel_id=None):
+    scope, scope_params = _scope(guild_id, channel_id)
+    return conn.execute(f"DELETE FROM tasks WHERE id = ? AND {scope}", (task_id, *scope_params)).rowcount > 0
+
+def _complete_task(conn, task_id, guild_id=None, channel_id=None):
+    scope, scope_params = _scope(guild_id, channel_id)
+    updated = conn.execute(
+        f"UPDATE tasks SET completed = 1 WHERE id = ? AND {scope} AND completed = 0", (task_id, *scope_params)
+    ).rowcount
+    if updated:
+        return TaskOutcome.COMPLETED
+    # Yalnızca güncelleme olmadığında ayrım için ikinci bir sorgu gerekir.
+    if conn.execute(f"SELECT 1 FROM tasks WHERE id = ? AND {scope}", (task_id, *scope_params)).fetchone():
+        return TaskOutcome.ALREADY_COMPLETED
+    return TaskOutcome.NOT_FOUND
+
+def _id_conditions(task_ids):
+    """
+    Sıralı ID listesini ardışık aralıklara böler ve her biri parametre sınırı
+    içinde kalan `(sql_koşulu, parametreler)` çiftleri üretir. Aralıklar
+    `id BETWEEN ? AND ?`, tekil ID'ler `id IN (...)` olarak yazılır.
+    """
+    ranges = []
+    for task_id in task_ids:
+        if ranges and task_id == ranges[-1][1] + 1:
+            ranges[-1][1] = task_id
+        else:
+            ranges.append([task_id, task_id])
+
+    parts, params, singles = [], [], []
+    for start, end in ranges:
+        if len(params) + len(singles) + 2 > MAX_SQL_PARAMS:
+            yield _join_id_condition(parts, params, singles)
+            parts, params, singles = [], [], []
+        if end - start >= 2:
+            parts.append("id BETWEEN ? AND ?")
+            params.extend((start, end))
+        else:
+            singles.extend(range(start, end + 1))
+    if parts or singles:
+        yield _join_id_condition(parts, params, singles)
+
+def _join_id_condition(parts, params, singles):
+    if singles:
+        parts = parts + [f"id IN ({','.join('?' * len(singles))})"]
+        params = params + singles
+    return f"({' OR '.join(parts)})", params
+
+def _begin_write(conn):
+    """
+    RETURNING yokken ID'ler değişiklikten önce SELECT ile okunur. sqlite3 örtük
+    BEGIN'i yalnızca DML'den önce açtığından, SELECT ile UPDATE/DELETE arasında
+    başka bir yazıcı araya girmesin diye yazma işlemi önceden başlatılır.
+    """
+    if not SUPPORTS_RETURNING and not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+
+def _complete_tasks(conn, task_ids, guild_id=None, channel_id=None):
+    requested = sorted(set(task_ids))
+    scope, scope_params = _scope(guild_id, channel_id)
+    completed = set()
+    _begin_write(conn)
+    for condition, params in _id_conditions(requested):
+        where = f"{condition} AND {scope} AND completed = 0"
+        params = [*params, *scope_params]
+        if SUPPORTS_RETURNING:
+            cursor = conn.execute(f"UPDATE tasks SET completed = 1 WHERE {where} RETURNING id", params)
+            completed.update(row[0] for row in cursor.fetchall())
+        else:
+            completed.update(row[0] for row in conn.execute(f"SELECT id FROM tasks WHERE {where}", params))
+            conn.execute(f"UPDATE tasks SET completed = 1 WHERE {where}", params)
+
+    rest = [task_id for task_id in requested if task_id not in completed]
+    existing = set()
+    for condition, params in _id_conditions(rest):
+        existing.update(row[0] for row in conn.execute(
+            f"SELECT id FROM tasks WHERE {condition} AND {scope}", [*params, *scope_params]
+        ))
+    return BatchResult(
+        succeeded=[task_id for task_id in requested if task_id in completed],
+        already_completed=[task_id for task_id in rest if task_id in existing],
+        missing=[task_id for task_id in rest if task_id not in existing],
+    )
+
+def _delete_tasks(conn, task_ids, guild_id=None, channel_id=None):
+    requested = sorted(set(task_ids))
+    scope, scope_params = _scope(guild_id, channel_id)
+    deleted = set()
+    _begin_write(conn)
+    for condition, params in _id_conditions(requested):
+        where = f"{condition} AND {scope}"
+        params = [*params, *scope_params]
+        if SUPPORTS_RETURNING:
+            cursor = conn.execute(f"DELETE FROM tasks WHERE {where} RETURNING id", params)
+            deleted.update(row[0] for row in cursor.fetchall())
+        else:
+            deleted.update(row[0] for row in conn.execute(f"SELECT id FROM tasks WHERE {where}", params))
+            conn.execute(f"DELETE FROM tasks WHERE {where}", params)
+    return BatchResult(
+        succeeded=[task_id for task_id in requested if task_id in deleted],
+        already_completed=[],
+        missing=[task_id for task_id in requested if task_id not in deleted],
+    )
+
+def _adopt_legacy_tasks(conn, guild_id, channel_id=None):
+    # Kiracı sütunlarından önceki görevlerin iki sütunu da NULL'dur; DM
+    # görevlerinde channel_id dolu olduğundan onlar etkilenmez.
+    return conn.execute(
+        "UPDATE tasks SET guild_id = ?, channel_id = ? WHERE guild_id IS NULL AND channel_id IS NULL",
+        (guild_id, channel_id),
+    ).rowcount
+
+def _set_board(conn, board_channel_id, message_id, guild_id=None, channel_id=None):
+    previous = conn.execute(
+        "SELECT message_id FROM task_boards WHERE channel_id = ?", (board_channel_id,)
+    ).fetchone()
+    conn.execute(
+        """
+        INSERT INTO task_boards (channel_id, message_id, guild_id, scope_channel_id) VALUES (?, ?, ?, ?)
+        ON CONFLICT (channel_id) DO UPDATE SET
+            message_id = excluded.message_id, guild_id = excluded.guild_id,
+            scope_channel_id = excluded.scope_channel_id
+        """,
+        (board_channel_id, message_id, guild_id, channel_id),
+    )
+    return previous[0] if previous else None
+
+def _delete_board(conn, board_channel_id):
+    return conn.execute("DELETE FROM task_boards WHERE channel_id = ?", (board_channel_id,)).rowcount > 0
+
+WRITE_OPERATIONS = {
+    "add_task": _add_task,
+    "add_tasks": _add_tasks,
+    "delete_task": _delete_task,
+    "complete_task": _complete_task,
+    "delete_tasks": _delete_tasks,
+    "complete_tasks": _complete_tasks,
+    "set_board": _set_board,
+    "delete_board": _delete_board,
+    "adopt_legacy_tasks": _adopt_legacy_tasks,
+}
+
+_coordinators = {}
+_coordinators_lock = threading.Lock()
+
+def enable_write_coordinator(db_name=None, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                             max_latency=DEFAULT_MAX_LATENCY):
+    """
+    Veritabanı için tek yazıcılı grup commit modunu açar. Bu moddayken tüm
+    değişiklikler tek bir thread'de toplanıp toplu işlemlerle yazılır.
+    """
+    name_to_use = db_name if db_name is not None else DEFAULT_DB_NAME
+    with _coordinators_lock:
+        coordinator = _coordinators.get(name_to_use)
+        if coordinator is None:
+            coordinator = _coordinators[name_to_use] = WriteCoordinator(
+                lambda: get_db_connection(name_to_use),
+                max_batch_size=max_batch_size,
+                max_latency=max_latency,
+            )
+    return coordinator
+
+def get_write_coordinator(db_name=None):
+    """Veritabanı için etkin yazıcı koordinatörünü döner, yoksa None."""
+    return _coordinators.get(db_name if db_name is not None else DEFAULT_DB_NAME)
+
+def disable_write_coordinator(db_name=None):
+    """Grup commit modunu kapatır; kuyruktaki işler yazıldıktan sonra döner."""
+    name_to_use = db_name if db_name is not None else DEFAULT_DB_NAME
+    with _coordinators_lock:
+        coordinator = _coordinators.pop(name_to_use, None)
+    if coordinator is not None:
+        coordinator.close()
+
+def disable_all_write_coordinators():
+    """Tüm yazıcı koordinatörlerini durdurur. Süreç kapanırken otomatik çağrılır."""
+    with _coordinators_lock:
+        coordinators = list(_coordinators.values())
+        _coordinators.clear()
+    for coordinator in coordinators:
+        coordinator.close()
+
+# atexit ters sırada çalışır: önce yazıcılar boşaltılır, sonra havuzlar kapanır.
+atexit.register(disable_all_write_coordinators)
+
+_checkpointers = {}
+_checkpointers_lock = threading.Lock()
+
+def enable_checkpointer(db_name=None, poll_interval=None):
+    """
+    Veritabanının WAL dosyası için arka plan checkpoint thread'ini başlatır.
+    Eşikler depolama profilindeki checkpoint_interval ve checkpoint_pages'tir.
+    """
+    name_to_use = db_name if db_name is not None else DEFAULT_DB_NAME
+    profile = _storage_profile
+    with _checkpointers_lock:
+        checkpointer = _checkpointers.get(name_to_use)
+        if checkpointer is None:
+            options = {} if poll_interval is None else {"poll_interval": poll_interval}
+            checkpointer = _checkpointers[name_to_use] = WalCheckpointer(
+                lambda: get_db_connection(name_to_use),
+                name_to_use + "-wal",
+                interval=profile.checkpoint_interval,
+                max_pages=profile.checkpoint_pages,
+                **options,
+            )
+    return checkpointer
+
+def disable_checkpointer(db_name=None):
+    """Arka plan checkpoint thread'ini durdurur."""
+    name_to_use = db_name if db_name is not None else DEFAULT_DB_NAME
+    with _checkpointers_lock:
+        checkpointer = _checkpointers.pop(name_to_use, None)
+    if checkpointer is not None:
+        checkpointer.close()
+
+def disable_all_checkpointers():
+    """Tüm checkpoint thread'lerini durdurur. Süreç kapanırken otomatik çağrılır."""
+    with _checkpointers_lock:
+        checkpointers = list(_checkpointers.values())
+        _checkpointers.clear()
+    for checkpointer in checkpointers:
+        checkpointer.close()
+
+atexit.register(disable_all_checkpointers)
+
+def submit_write(operation: str, *args, db_name=None) -> Future:
+    """
+    WRITE_OPERATIONS içindeki bir değişikliği çalıştırır ve sonucunu bir Future
+    olarak döner. Grup commit modunda iş yazıcı thread'ine gönderilir; aksi
+    halde havuzdan alınan bağlantıda hemen çalıştırılıp commit edilir.
+    """
+    op = WRITE_OPERATIONS[operation]
+    on_commit = functools.partial(_update_cache, _cache_db(db_name), operation, args)
+    coordinator = get_write_coordinator(db_name)
+    if coordinator is not None:
+        return coordinator.submit(op, *args, on_commit=on_commit)
+    future = Future()
+    future.set_running_or_notify_cancel()
+    try:
+        with _borrow(db_name) as conn:
+            result = op(conn, *args)
+            conn.commit()
+        on_commit(result)
+    except Exception as e:
+        future.set_exception(e)
+    else:
+        future.set_result(result)
+    return future
+
+def _cache_db(db_name):
+    return db_name if db_name is not None else DEFAULT_DB_NAME
+
+def _update_cache(db_name, operation, args, result):
+    """Commit edilen bir değişikliği okuma önbelleğine uygular."""
+    if operation == "add_task":
+        description, guild_id, channel_id = args
+        task_cache.add(db_name, guild_id, channel_id, [(result, description, 0)])
+    elif operation == "add_tasks":
+        descriptions, guild_id, channel_id, completed = args
+        completed = completed or [False] * len(descriptions)
+        task_cache.add(db_name, guild_id, channel_id, [
+            (task_id, description, int(bool(done)))
+            for task_id, description, done in zip(result, descriptions, completed)
+        ])
+    elif operation == "complete_task":
+        if result is TaskOutcome.COMPLETED:
+            task_cache.mark_completed(db_name, args[1], [args[0]])
+    elif operation == "complete_tasks":
+        task_cache.mark_completed(db_name, args[1], result.succeeded)
+    elif operation == "delete_task":
+        if result:
+            task_cache.remove(db_name, args[1], [args[0]])
+    elif operation == "delete_tasks":
+        task_cache.remove(db_name, args[1], result.succeeded)
+    elif operation in ("set_board", "delete_board"):
+        pass  # Panolar önbellekteki görevleri etkilemez.
+    else:
+        task_cache.invalidate(db_name)
+
+def run_write(operation: str, *args, db_name=None):
+    """submit_write ile aynı, ancak sonucu bekleyip doğrudan döner."""
+    return submit_write(operation, *args, db_name=db_name).result()
+
+def add_task_db(description: str, db_name=None, guild_id=None, channel_id=None):
     """Veritabanına yeni bir görev ekler."""
-    conn = get_db_connection(db_name)
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO tasks (description) VALUES (?)", (description,))
-    conn.commit()
-    task_id = cursor.lastrowid
-    conn.close()
-    return task_id
-
-def get_tasks_db(db_name=None):
-    """Tüm görevleri veritabanından alır."""
-    conn = get_db_connection(db_name)
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, description, completed FROM tasks ORDER BY id ASC")
-    tasks = cursor.fetchall()
-    conn.close()
-    return tasks
-
-def delete_task_db(task_id: int, db_name=None) -> bool:
+    return run_write("add_task", description, guild_id, channel_id, db_name=db_name)
+
+def add_tasks_db(descriptions, db_name=None, guild_id=None, channel_id=None, completed=None):
+    """
+    Birden fazla görevi tek bir işlemde ekler ve yeni ID'leri sırayla döner.
+    `completed` verilirse açıklamalarla aynı sıradaki bayraklardır; doğru
+    olanlar aynı işlemde tamamlanmış olarak eklenir.
+    """
+    return run_write("add_tasks", list(descriptions), guild_id, channel_id,
+                     list(completed) if completed is not None else None, db_name=db_name)
+
+def _tenant_loader(db_name, guild_id, channel_id):
+    scope, scope_params = _scope(guild_id, channel_id)
+    def load(limit):
+        with _borrow(db_name) as conn:
+            return conn.execute(
+                f"SELECT id, description, completed FROM tasks WHERE {scope} ORDER BY id ASC LIMIT ?",
+                (*scope_params, limit),
+            ).fetchall()
+    return load
+
+def _status_condition(status):
+    """
+    Durum adını `(completed değeri, SQL koşulu)` olarak döner. Koşul sabit
+    değerle yazılır (`completed = 0`); SQLite kısmi indeksi ancak sorgudaki
+    koşul indeksinkiyle aynıysa kullanabilir, parametreyle eşleştiremez.
+    Önbellekteki kiracılar durumu Python'da süzer; koşul ve kısmi indeks
+    yalnızca `max_tenant_rows`'dan büyük kiracıların SQL sorgularında işe yarar.
+    """
+    if status not in TASK_STATUSES:
+        raise ValueError(f"Geçersiz durum: {status}")
+    completed = TASK_STATUSES[status]
+    return completed, "" if completed is None else f" AND completed = {completed}"
+
+def get_tasks_db(db_name=None, guild_id=None, channel_id=None, status="all"):
+    """
+    Kapsamdaki görevleri alır; `status` "open" ya da "done" ise yalnızca o
+    durumdakiler döner. Sık okunan listeler önbellekten gelir.
+    """
+    completed, condition = _status_condition(status)
+    key = (_cache_db(db_name), guild_id, channel_id)
+    tasks = task_cache.get_tasks(key, _tenant_loader(db_name, guild_id, channel_id), completed)
+    if tasks is not None:
+        return tasks
+    scope, scope_params = _scope(guild_id, channel_id)
+    with _borrow(db_name) as conn:
+        return conn.execute(
+            f"SELECT id, description, completed FROM tasks WHERE {scope}{condition} ORDER BY id ASC", scope_params
+        ).fetchall()
+
+def get_tasks_page_db(after_id: int = 0, limit: int = DEFAULT_PAGE_SIZE, db_name=None,
+                      guild_id=None, channel_id=None, status="all"):
+    """
+    ID'si `after_id`'den büyük en fazla `limit` görevi ID sırasıyla döner.
+    Anahtar tabanlı (keyset) sayfalama: sonraki sayfa için son satırın ID'si verilir.
+    """
+    completed, _ = _status_condition(status)
+    key = (_cache_db(db_name), guild_id, channel_id)
+    page = task_cache.get_page(key, after_id, limit, _tenant_loader(db_name, guild_id, channel_id), completed)
+    if page is not None:
+        return page
+    return _select_tasks_page(after_id, limit, db_name, guild_id, channel_id, status)
+
+def _select_tasks_page(after_id, limit, db_name, guild_id, channel_id, status):
+    _, condition = _status_condition(status)
+    scope, scope_params = _scope(guild_id, channel_id)
+    with _borrow(db_name) as conn:
+        return conn.execute(
+            f"SELECT id, description, completed FROM tasks WHERE {scope}{condition} AND id > ? ORDER BY id ASC LIMIT ?",
+            (*scope_params, after_id, limit),
+        ).fetchall()
+
+def render_tasks_page_db(after_id: int = 0, page_size: int = DEFAULT_PAGE_SIZE, db_name=None,
+                         guild_id=None, channel_id=None, status="all") -> RenderedPage:
+    """
+    `after_id`'den sonraki görev sayfasını mesaj olarak yazılmış halde döner.
+    Önbellekteki kiracılar için sayfa metni saklanır ve yalnızca değişen
+    görevin sayfası yeniden üretilir; diğerleri için sayfa SQL'den okunup yazılır.
+    """
+    completed, _ = _status_condition(status)
+    key = (_cache_db(db_name), guild_id, channel_id)
+    title = STATUS_TITLES[status]
+    page = task_cache.render_page(key, after_id, page_size, _tenant_loader(db_name, guild_id, channel_id),
+                                  completed, title)
+    if page is not None:
+        return page
+    # Önbellek bu kiracıyı tutmuyor; aynı önbelleğe ikinci kez sormadan SQL'den okunur.
+    tasks = _select_tasks_page(after_id, page_size + 1, db_name, guild_id, channel_id, status)
+    return render_page(tasks, page_size, title=title)
+
+def delete_task_db(task_id: int, db_name=None, guild_id=None, channel_id=None) -> bool:
     """Belirli bir ID'ye sahip görevi siler. Başarılıysa True döner."""
-    conn = get_db_connection(db_name)
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
-    conn.commit()
-    deleted_rows = cursor.rowcount
-    conn.close()
-    return deleted_rows > 0
+    return run_write("delete_task", task_id, guild_id, channel_id, db_name=db_name)
 
-def complete_task_db(task_id: int, db_name=None) -> bool:
+def complete_task_db(task_id: int, db_name=None, guild_id=None, channel_id=None) -> bool:
     """
     Belirli bir ID'ye sahip görevi tamamlandı olarak işaretler.
     Görev bulunamazsa veya zaten tamamlanmışsa False döner.
     Başarıyla tamamlandı olarak işaretlenirse True döner.
     """
-    conn = get_db_connection(db_name)
-    cursor = conn.cursor()
+    outcome = complete_task_outcome_db(task_id, db_name=db_name, guild_id=guild_id, channel_id=channel_id)
+    return outcome is TaskOutcome.COMPLETED
 
-    cursor.execute("SELECT completed FROM tasks WHERE id = ?", (task_id,))
-    task_status = cursor.fetchone()
+def complete_task_outcome_db(task_id: int, db_name=None, guild_id=None, channel_id=None) -> TaskOutcome:
+    """
+    Görevi tek bir koşullu UPDATE ile tamamlar ve sonucu TaskOutcome olarak
+    döner (COMPLETED, ALREADY_COMPLETED veya NOT_FOUND).
+    """
+    return run_write("complete_task", task_id, guild_id, channel_id, db_name=db_name)
 
-    if not task_status:
-        conn.close()
-        return False
-    
-    if task_status[0] == 1:
-        conn.close()
-        return False
+def delete_tasks_db(task_ids, db_name=None, guild_id=None, channel_id=None) -> BatchResult:
+    """
+    Verilen ID'lere sahip görevleri tek bir işlemde siler.
+    Silinen ve bulunamayan ID'leri BatchResult olarak döner.
+    """
+    return run_write("delete_tasks", list(task_ids), guild_id, channel_id, db_name=db_name)
+
+def complete_tasks_db(task_ids, db_name=None, guild_id=None, channel_id=None) -> BatchResult:
+    """
+    Verilen ID'lere sahip görevleri tek bir işlemde tamamlandı olarak işaretler.
+    Tamamlanan, zaten tamamlanmış ve bulunamayan ID'leri BatchResult olarak döner.
+    """
+    return run_write("complete_tasks", list(task_ids), guild_id, channel_id, db_name=db_name)
+
+def parse_search_terms(text: str):
+    """
+    Arama girdisini `(metin, önek_mi)` terimlerine ayırır: `kelime*` önek,
+    `"iki kelime"` ifade araması olur; tırnak dışındaki operatörler metindir.
+    """
+    terms = []
+    for match in _SEARCH_TOKEN.finditer(text):
+        phrase, phrase_prefix, word = match.groups()
+        if word is not None:
+            phrase, phrase_prefix = word.rstrip("*").replace('"', ""), "*" if word.endswith("*") else ""
+        if phrase.strip():
+            terms.append((phrase, bool(phrase_prefix)))
+    return terms
+
+def build_search_query(text: str) -> str:
+    """
+    Kullanıcı girdisini güvenli bir FTS5 sorgusuna çevirir. Kelimeler ayrı
+    ayrı aranır (hepsi eşleşmeli), `kelime*` önek araması, `"iki kelime"`
+    ifade aramasıdır. FTS5 operatörleri metin olarak ele alınır. Aranacak
+    bir şey kalmazsa ValueError fırlatır.
+    """
+    terms = parse_search_terms(text)
+    if not terms:
+        raise ValueError("Arama sorgusu boş.")
+    return " ".join(f'"{phrase}"{"*" if prefix else ""}' for phrase, prefix in terms)
+
+def search_tasks_db(query: str, offset: int = 0, limit: int = DEFAULT_PAGE_SIZE, db_name=None,
+                    guild_id=None, channel_id=None):
+    """
+    Açıklaması sorguyla eşleşen görevleri FTS5 dizininden, en alakalıdan
+    başlayarak döner. Sonuçlar `offset`/`limit` ile sayfalanır.
+    """
+    scope, scope_params = _scope(guild_id, channel_id)
+    with _borrow(db_name) as conn:
+        return conn.execute(
+            f"""
+            SELECT tasks.id, tasks.description, tasks.completed
+            FROM tasks_fts JOIN tasks ON tasks.id = tasks_fts.rowid
+            WHERE tasks_fts MATCH ? AND {scope}
+            ORDER BY tasks_fts.rank, tasks.id
+            LIMIT ? OFFSET ?
+            """,
+            (build_search_query(query), *scope_params, limit, offset),
+        ).fetchall()
+
+def get_task_counts_db(db_name=None, guild_id=None, channel_id=None) -> TaskCounts:
+    """
+    Kapsamdaki toplam, açık ve tamamlanmış görev sayılarını döner. Sayılar
+    tetikleyicilerle güncel tutulan task_counts tablosundan okunur; görev
+    sayısından bağımsız olarak sunucunun kanal sayısı kadar satır okunur.
+    """
+    condition, params = "guild_key = ?", [-1 if guild_id is None else guild_id]
+    if channel_id is not None:
+        condition += " AND channel_key = ?"
+        params.append(channel_id)
+    with _borrow(db_name) as conn:
+        total, done = conn.execute(
+            f"SELECT COALESCE(SUM(total), 0), COALESCE(SUM(done), 0) FROM task_counts WHERE {condition}", params
+        ).fetchone()
+    return TaskCounts(total, total - done, done)
+
+def check_task_counts_db(db_name=None):
+    """
+    Sayaçları tasks tablosuyla karşılaştırır ve tutmayan kapsamları
+    `(guild_id, channel_id, sayaç, gerçek)` listesi olarak döner. Tüm tabloyu tarar.
+    """
+    with _borrow(db_name) as conn:
+        rows = conn.execute('''
+            WITH actual AS (
+                SELECT COALESCE(guild_id, -1) AS guild_key, COALESCE(channel_id, -1) AS channel_key,
+                       COUNT(*) AS total, SUM(completed = 1) AS done
+                FROM tasks GROUP BY 1, 2
+            ), keys AS (
+                SELECT guild_key, channel_key FROM actual
+                UNION SELECT guild_key, channel_key FROM task_counts
+            )
+            SELECT keys.guild_key, keys.channel_key,
+                   COALESCE(task_counts.total, 0), COALESCE(task_counts.done, 0),
+                   COALESCE(actual.total, 0), COALESCE(actual.done, 0)
+            FROM keys
+            LEFT JOIN task_counts USING (guild_key, channel_key)
+            LEFT JOIN actual USING (guild_key, channel_key)
+            WHERE COALESCE(task_counts.total, 0) != COALESCE(actual.total, 0)
+               OR COALESCE(task_counts.done, 0) != COALESCE(actual.done, 0)
+        ''').fetchall()
+    return [
+        (None if guild == -1 else guild, None if channel == -1 else channel,
+         TaskCounts(total, total - done, done), TaskCounts(real_total, real_total - real_done, real_done))
+        for guild, channel, total, done, real_total, real_done in rows
+    ]
+
+def rebuild_task_counts_db(db_name=None):
+    """Sayaçları tasks tablosundan tek bir işlemde yeniden hesaplar."""
+    with _borrow(db_name) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rebuild_task_counts(conn)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+def adopt_legacy_tasks_db(guild_id: int, channel_id=None, db_name=None) -> int:
+    """
+    Sunucu ve kanal sütunları eklenmeden önce oluşturulmuş (ikisi de NULL)
+    görevleri verilen kapsama taşır ve taşınan görev sayısını döner. Bu
+    görevlere başka hiçbir kapsamdan ulaşılamaz; yükseltmeden sonra bir kez
+    çalıştırılır, tekrar çalıştırmak zararsızdır.
+    """
+    return run_write("adopt_legacy_tasks", guild_id, channel_id, db_name=db_name)
+
+def set_board_db(board_channel_id: int, message_id: int, db_name=None, guild_id=None, channel_id=None):
+    """
+    Kanalın görev panosu mesajını kaydeder; pano `guild_id`/`channel_id`
+    kapsamındaki görevleri gösterir. Kanalın önceki pano mesajının ID'sini döner.
+    """
+    return run_write("set_board", board_channel_id, message_id, guild_id, channel_id, db_name=db_name)
+
+def delete_board_db(board_channel_id: int, db_name=None) -> bool:
+    """Kanalın görev panosu kaydını siler. Kayıt varsa True döner."""
+    return run_write("delete_board", board_channel_id, db_name=db_name)
 
-    cursor.execute("UPDATE tasks SET completed = 1 WHERE id = ?", (task_id,))
-    conn.commit()
-    updated_rows = cursor.rowcount
-    conn.close()
-    return updated_rows > 0
+def get_boards_db(db_name=None, guild_id=None, channel_id=None):
+    """Verilen görev kapsamını gösteren panoları `(kanal_id, mesaj_id)` listesi olarak döner."""
+    with _borrow(db_name) as conn:
+        return conn.execute(
+            "SELECT channel_id, message_id FROM task_boards WHERE guild_id IS ? AND scope_channel_id IS ?",
+            (guild_id, channel_id),
+        ).fetchall()
 
-def get_task_by_id_db(task_id: int, db_name=None):
+def get_task_by_id_db(task_id: int, db_name=None, guild_id=None, channel_id=None):
     """Belirli bir ID'ye sahip görevi alır."""
-    conn = get_db_connection(db_name)
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, description, completed FROM tasks WHERE id = ?", (task_id,))
-    task = cursor.fetchone()
-    conn.close()
-    return task
+    cached, task = task_cache.get_task((_cache_db(db_name), guild_id, channel_id), task_id)
+    if cached:
+        return task
+    scope, scope_params = _scope(guild_id, channel_id)
+    with _borrow(db_name) as conn:
+        return conn.execute(
+            f"SELECT id, description, completed FROM tasks WHERE id = ? AND {scope}", (task_id, *scope_params)
+        ).fetchone()
 
 def clear_tasks_table(db_name=None):
     """Belirtilen veritabanındaki tasks tablosunu temizler ve ID sayacını sıfırlar."""
-    target_db = db_name if db_name is not None else DEFAULT_DB_NAME
-    conn = get_db_connection(db_name)
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM tasks")
-    cursor.execute("DELETE FROM sqlite_sequence WHERE name='tasks'")
-    conn.commit()
-    conn.close()
\ No newline at end of file
+    with _borrow(db_name) as conn:
+        conn.execute("DELETE FROM tasks")
+        conn.execute("DELETE FROM sqlite_sequence WHERE name='tasks'")
+        conn.commit()
+    task_cache.invalidate(_cache_db(db_name))
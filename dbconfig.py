@@ -0,0 +1,73 @@
+import configparser
+import os
+from collections import namedtuple
+
+# journal_mode=WAL ile okuyucular yazıcıyı beklemez; WAL'da synchronous=NORMAL
+# her commit'te fsync yapmaz, yalnızca checkpoint'te yapar (çökmede son
+# commit'ler kaybolabilir, veritabanı bozulmaz). cache_size negatifse KiB'dir.
+# wal_autocheckpoint, arka plan checkpoint'inin eşiğinin (checkpoint_pages)
+# birkaç katıdır; commit eden thread yalnızca arka plan geride kalırsa checkpoint yapar.
+StorageProfile = namedtuple(
+    "StorageProfile",
+    "journal_mode synchronous cache_size mmap_size temp_store busy_timeout "
+    "wal_autocheckpoint checkpoint_interval checkpoint_pages",
+    defaults=("WAL", "NORMAL", -16_000, 64 * 1024 * 1024, "MEMORY", 5_000, 4_000, 30.0, 1_000),
+)
+DEFAULT_PROFILE = StorageProfile()
+
+CONFIG_SECTION = "storage"
+_CHOICES = {
+    "journal_mode": ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"),
+    "synchronous": ("OFF", "NORMAL", "FULL", "EXTRA"),
+    "temp_store": ("DEFAULT", "FILE", "MEMORY"),
+}
+
+_POSITIVE = ("checkpoint_interval", "checkpoint_pages")
+
+def _parse(field, value):
+    if field in _CHOICES:
+        value = str(value).strip().upper()
+        if value not in _CHOICES[field]:
+            raise ValueError(f"Geçersiz {field}: {value} (seçenekler: {', '.join(_CHOICES[field])})")
+        return value
+    value = float(value) if field == "checkpoint_interval" else int(value)
+    # Sıfır aralık checkpoint thread'ini boşa döndürür; sıfır sayfa her yoklamada checkpoint yaptırır.
+    if field in _POSITIVE and value <= 0:
+        raise ValueError(f"Geçersiz {field}: {value} (sıfırdan büyük olmalı)")
+    return value
+
+def load_profile(path=None, environ=None):
+    """
+    Depolama profilini yükler. Öncelik sırası: ortam değişkenleri
+    (`TASK_DB_<ALAN>`, ör. TASK_DB_SYNCHRONOUS), ardından `path` ya da
+    TASK_DB_CONFIG ile verilen INI dosyasının [storage] bölümü, en son
+    DEFAULT_PROFILE. Geçersiz değerlerde ValueError fırlatır.
+    """
+    environ = os.environ if environ is None else environ
+    values = {}
+    path = path or environ.get("TASK_DB_CONFIG")
+    if path:
+        parser = configparser.ConfigParser()
+        if not parser.read(path, encoding="utf-8"):
+            raise ValueError(f"Depolama ayar dosyası okunamadı: {path}")
+        if parser.has_section(CONFIG_SECTION):
+            for field, value in parser.items(CONFIG_SECTION):
+                if field not in StorageProfile._fields:
+                    raise ValueError(f"Bilinmeyen depolama ayarı: {field}")
+                values[field] = value
+    for field in StorageProfile._fields:
+        value = environ.get(f"TASK_DB_{field.upper()}")
+        if value is not None:
+            values[field] = value
+    return DEFAULT_PROFILE._replace(**{field: _parse(field, value) for field, value in values.items()})
+
+def apply_profile(conn, profile):
+    """Profildeki PRAGMA'ları bağlantıya uygular. Değerler doğrulanmış olmalıdır."""
+    conn.execute(f"PRAGMA busy_timeout = {int(profile.busy_timeout)}")
+    conn.execute(f"PRAGMA journal_mode = {profile.journal_mode}")
+    conn.execute(f"PRAGMA synchronous = {profile.synchronous}")
+    conn.execute(f"PRAGMA cache_size = {int(profile.cache_size)}")
+    conn.execute(f"PRAGMA mmap_size = {int(profile.mmap_size)}")
+    conn.execute(f"PRAGMA temp_store = {profile.temp_store}")
+    conn.execute(f"PRAGMA wal_autocheckpoint = {int(profile.wal_autocheckpoint)}")
+    return conn
@@ -0,0 +1,190 @@
+import json
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from concurrent.futures import Future
+
+from metrics import REGISTRY
+from writer import DEFAULT_MAX_BATCH_SIZE, WriterClosedError
+
+# Her kayıt: 4 bayt uzunluk + 4 bayt CRC32 (little-endian) + UTF-8 JSON dizi.
+RECORD_HEADER = struct.Struct("<II")
+MAX_RECORD_SIZE = 16 * 1024 * 1024
+# Varsayılan olarak beklenmez: bir fsync sürerken gelen eklemeler zaten bir
+# sonraki partide toplanır, tek başına gelen yazma fsync dışında gecikmez.
+DEFAULT_MAX_LATENCY = 0.0
+_STOP = object()
+
+class EventLogError(RuntimeError):
+    """Anlık görüntü okunamadığında ya da günlük yazılamadığında fırlatılır."""
+
+def encode_record(event):
+    """Olayı (JSON'a dönüşebilen bir liste) uzunluk ve CRC önekli kayda çevirir."""
+    payload = json.dumps(event, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+def iter_records(f):
+    """
+    Dosyadaki kayıtları `(olay, kaydın bittiği konum)` olarak üretir. Yarım
+    kalmış ya da CRC'si tutmayan ilk kayıtta durur; çökme anında yarım
+    yazılmış son kayıt böylece yok sayılır.
+    """
+    offset = f.tell()
+    while True:
+        header = f.read(RECORD_HEADER.size)
+        if len(header) < RECORD_HEADER.size:
+            return
+        length, crc = RECORD_HEADER.unpack(header)
+        if length > MAX_RECORD_SIZE:
+            return
+        payload = f.read(length)
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            return
+        offset += RECORD_HEADER.size + length
+        yield json.loads(payload), offset
+
+def _fsync_directory(path):
+    # Yeniden adlandırmanın kalıcı olması için dizin girdisi de diske yazılmalı.
+    if os.name != "posix":
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def write_snapshot(path, records):
+    """
+    `records` kayıtlarını geçici bir dosyaya yazar, fsync yapar ve dosyayı
+    atomik olarak `path` yerine koyar. Yarım kalan bir anlık görüntü eskisinin
+    yerini almaz.
+    """
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        for record in records:
+            f.write(encode_record(record))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+    _fsync_directory(path)
+
+def read_snapshot(path):
+    """Anlık görüntüdeki kayıtları döner; dosya yoksa boş liste döner."""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return []
+    with f:
+        size = os.fstat(f.fileno()).st_size
+        records = []
+        end = 0
+        for record, end in iter_records(f):
+            records.append(record)
+    if end != size:
+        raise EventLogError(f"Anlık görüntü bozuk: {path}")
+    return records
+
+class EventLog:
+    """
+    Yalnızca sona ekleme yapılan olay günlüğü. Tüm yazmalar tek bir thread'de
+    yapılır: kuyrukta biriken (ve `max_latency` saniye içinde gelen) en fazla
+    `max_batch_size` ekleme tek bir write + fsync ile diske iner ve her çağıranın Future'ı
+    kayıtlar kalıcı olduktan sonra tamamlanır.
+
+    `snapshot(path, records)` kuyruğa sırayla girer: kendisinden önceki
+    kayıtlar yazıldıktan sonra anlık görüntü atomik olarak yazılır ve günlük
+    boşaltılır; sonraki kayıtlar boş günlüğe eklenir.
+    """
+
+    def __init__(self, path, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                 max_latency=DEFAULT_MAX_LATENCY, name="event-log"):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size en az 1 olmalı.")
+        self.path = path
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self._file = open(path, "ab")
+        self._queue = queue.Queue()
+        self._closed = False
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _submit(self, job):
+        if self._closed:
+            raise WriterClosedError("Olay günlüğü kapatılmış.")
+        if self._error is not None:
+            raise EventLogError("Olay günlüğü önceki bir hatadan sonra yazılamıyor.") from self._error
+        future = Future()
+        self._queue.put((*job, future))
+        return future
+
+    def append(self, records) -> Future:
+        """Kayıtları kuyruğa ekler; Future kayıtlar fsync ile diske indiğinde tamamlanır."""
+        return self._submit(("append", b"".join(encode_record(record) for record in records)))
+
+    def snapshot(self, path, records) -> Future:
+        """Sıradaki kayıtlardan sonra anlık görüntüyü yazıp günlüğü boşaltır."""
+        return self._submit(("snapshot", (path, records)))
+
+    def close(self, timeout=None):
+        """Kuyruktaki işleri yazdıktan sonra thread'i durdurur ve dosyayı kapatır."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            stopping = False
+            while not stopping:
+                job = self._queue.get()
+                if job is _STOP:
+                    break
+                batch = [job]
+                deadline = time.monotonic() + self.max_latency
+                while batch[-1][0] == "append" and len(batch) < self.max_batch_size:
+                    try:
+                        job = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    if job is _STOP:
+                        stopping = True
+                        break
+                    batch.append(job)
+                self._process(batch)
+        finally:
+            self._file.close()
+
+    def _process(self, batch):
+        appends = [job for job in batch if job[0] == "append"]
+        try:
+            if appends:
+                self._write([data for _, data, _ in appends])
+            for kind, argument, future in batch:
+                if kind == "snapshot":
+                    path, records = argument
+                    write_snapshot(path, records)
+                    self._file.truncate(0)
+                    os.fsync(self._file.fileno())
+                    REGISTRY.increment("eventlog_snapshots_total")
+        except Exception as e:
+            self._error = e
+            for *_, future in batch:
+                future.set_exception(e)
+            return
+        for *_, future in batch:
+            future.set_result(None)
+
+    def _write(self, chunks):
+        start = time.perf_counter()
+        for chunk in chunks:
+            self._file.write(chunk)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        REGISTRY.observe("eventlog_fsync_duration_seconds", time.perf_counter() - start)
+        REGISTRY.increment("eventlog_batches_total")
@@ -0,0 +1,336 @@
+"""
+Olay günlüğü tabanlı görev deposu ve tasks.db dönüştürücüsü.
+
+Var olan bir SQLite veritabanını günlük biçimine çevirmek için:
+
+    python -m eventlog_store tasks.db eventlog/
+"""
+import argparse
+import asyncio
+import os
+import sqlite3
+import sys
+
+from database import BatchResult, TaskOutcome
+from eventlog import (
+    DEFAULT_MAX_LATENCY, EventLog, EventLogError, iter_records, read_snapshot, write_snapshot,
+)
+from memory_store import MemoryTaskStore
+from metrics import REGISTRY
+from writer import DEFAULT_MAX_BATCH_SIZE
+
+DEFAULT_EVENTLOG_DIR = "eventlog"
+DEFAULT_SNAPSHOT_EVERY = 10_000
+LOG_FILE = "tasks.log"
+SNAPSHOT_FILE = "tasks.snapshot"
+
+# Günlük olayları: [sıra, tür, ...alanlar]
+TASK_ADDED = "TaskAdded"            # görev_id, açıklama, guild_id, channel_id[, tamamlandı]
+TASK_COMPLETED = "TaskCompleted"    # görev_id
+TASK_DELETED = "TaskDeleted"        # görev_id
+BOARD_SET = "BoardSet"              # kanal_id, mesaj_id, guild_id, kapsam_kanal_id
+BOARD_DELETED = "BoardDeleted"      # kanal_id
+# Anlık görüntü kayıtları: başlık ardından görevler ve panolar.
+SNAPSHOT_HEADER = "Snapshot"        # son sıra, sonraki görev_id
+SNAPSHOT_TASK = "Task"              # görev_id, açıklama, tamamlandı, guild_id, channel_id
+
+def _snapshot_records(sequence, next_id, tasks, boards):
+    # Yazıcı thread'inde tüketilir; `tasks` olay döngüsünde alınmış sığ bir kopyadır.
+    yield [sequence, SNAPSHOT_HEADER, next_id]
+    for task_id, task in sorted(tasks.items(), key=lambda item: item[0]):
+        yield [sequence, SNAPSHOT_TASK, task_id, task.description, task.completed, task.guild_id, task.channel_id]
+    for board_channel_id, (message_id, scope) in boards.items():
+        yield [sequence, BOARD_SET, board_channel_id, message_id, *scope]
+
+class EventLogTaskStore(MemoryTaskStore):
+    """
+    Görevleri yalnızca sona eklenen bir olay günlüğünde (TaskAdded,
+    TaskCompleted, TaskDeleted) saklayan TaskStore. Güncel durum bellekte
+    MemoryTaskStore olarak tutulur; okumalar diske dokunmaz. Her değişiklik
+    önce günlüğe eklenir; kayıt toplu fsync ile diske indikten sonra bellekte
+    uygulanır ve çağırana dönülür. Yazma başarısız olursa bellek değişmez.
+    Diske inmeyi bekleyen tamamlama ve silmeler ayrıca izlenir, böylece aynı
+    göreve eşzamanlı gelen istekler doğru sonucu alır.
+
+    `snapshot_every` olayda bir durumun sıkıştırılmış anlık görüntüsü yazılır
+    ve günlük boşaltılır. Görüntü, bekleyen olay kalmadığı anda alınır (yeni
+    yazmalar o ana kadar kısa süre bekler); olay döngüsünde yalnızca görev
+    sözlüğü sığ kopyalanır, kayıtlar yazıcı thread'inde üretilir. Açılışta
+    anlık görüntü yüklenir, ardından günlükte ondan sonra gelen olaylar
+    yeniden oynatılır; yarım kalmış son kayıt kesilip atılır.
+    """
+
+    def __init__(self, directory=DEFAULT_EVENTLOG_DIR, snapshot_every=DEFAULT_SNAPSHOT_EVERY,
+                 max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_latency=DEFAULT_MAX_LATENCY):
+        super().__init__()
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.log_path = os.path.join(directory, LOG_FILE)
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self._sequence = 0
+        self._since_snapshot = 0
+        self._inflight = 0
+        self._snapshot_due = False
+        self._snapshot_waiters = []
+        self._pending_completed = set()
+        self._pending_deleted = set()
+        self._load()
+        self._log = EventLog(self.log_path, max_batch_size, max_latency)
+
+    def _load(self):
+        for record in read_snapshot(self.snapshot_path):
+            self._apply(record)
+        snapshot_sequence = self._sequence
+        try:
+            f = open(self.log_path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            end = 0
+            for record, end in iter_records(f):
+                # Anlık görüntü yazılıp günlük boşaltılamadan çökülmüşse eski olaylar atlanır.
+                if record[0] > snapshot_sequence:
+                    self._apply(record)
+                    self._since_snapshot += 1
+        if end != size:
+            print(f"Olay günlüğünün sonundaki {size - end} baytlık yarım kayıt atıldı.")
+            REGISTRY.increment("eventlog_truncated_tails_total")
+            with open(self.log_path, "r+b") as f:
+                f.truncate(end)
+                os.fsync(f.fileno())
+
+    def _apply(self, record):
+        # Pano olaylarında kanalın önceki kaydını döner (yoksa None).
+        kind = record[1]
+        result = None
+        if kind == TASK_ADDED:
+            # Tamamlanmış eklenen görevlerin kaydında ek bir bayrak bulunur.
+            _, _, task_id, description, guild_id, channel_id, *completed = record
+            self._insert(description, guild_id, channel_id, task_id)
+            if completed and completed[0]:
+                self._complete(task_id, guild_id, channel_id)
+        elif kind == TASK_COMPLETED:
+            # Tamamlama beklerken silinen görevin olayı silmeden önce gelir; görev artık yoksa atlanır.
+            task = self._tasks.get(record[2])
+            if task is not None:
+                self._complete(record[2], task.guild_id, task.channel_id)
+        elif kind == TASK_DELETED:
+            self._remove(record[2])
+        elif kind == BOARD_SET:
+            _, _, board_channel_id, message_id, guild_id, channel_id = record
+            result = self._boards.get(board_channel_id)
+            self._boards[board_channel_id] = (message_id, (guild_id, channel_id))
+        elif kind == BOARD_DELETED:
+            result = self._boards.pop(record[2], None)
+        elif kind == SNAPSHOT_HEADER:
+            self._next_id = record[2]
+        elif kind == SNAPSHOT_TASK:
+            _, _, task_id, description, completed, guild_id, channel_id = record
+            self._insert(description, guild_id, channel_id, task_id)
+            if completed:
+                self._complete(task_id, guild_id, channel_id)
+        else:
+            raise EventLogError(f"Bilinmeyen olay türü: {kind}")
+        self._sequence = max(self._sequence, record[0])
+        return result
+
+    def snapshot(self):
+        """
+        Güncel durumun anlık görüntüsünü kuyruğa ekler ve Future döner. Olay
+        döngüsünde yalnızca görev sözlüğü kopyalanır; kayıtların üretilmesi,
+        yazılması ve günlüğün boşaltılması yazıcı thread'inde, önceki
+        olaylardan sonra yapılır. Diske inmeyi bekleyen olay varken çağrılamaz:
+        bu olaylar henüz bellekte olmadığından görüntüde eksik kalırdı.
+        """
+        if self._inflight:
+            raise RuntimeError("Bekleyen olaylar varken anlık görüntü alınamaz.")
+        self._since_snapshot = 0
+        self._snapshot_due = False
+        future = self._log.snapshot(self.snapshot_path, _snapshot_records(
+            self._sequence, self._next_id, self._tasks.copy(), dict(self._boards)))
+        waiters, self._snapshot_waiters = self._snapshot_waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        return future
+
+    async def _append(self, events, completing=(), deleting=()):
+        """
+        Olayları günlüğe ekler, diske inmelerini bekler ve ardından bellekte
+        uygular; her olayın _apply sonucunu döner. `completing`/`deleting` bu
+        süre boyunca bekleyen sayılır.
+        """
+        if not events:
+            return []
+        # İlk await'ten önce işaretlenir; aynı göreve gelen sonraki istek bunu görür.
+        self._pending_completed.update(completing)
+        self._pending_deleted.update(deleting)
+        try:
+            while self._snapshot_due:
+                waiter = asyncio.get_running_loop().create_future()
+                self._snapshot_waiters.append(waiter)
+                await waiter
+            records = []
+            for event in events:
+                self._sequence += 1
+                records.append([self._sequence, *event])
+            self._inflight += 1
+            try:
+                await asyncio.wrap_future(self._log.append(records))
+            finally:
+                self._inflight -= 1
+            results = [self._apply(record) for record in records]
+            self._since_snapshot += len(records)
+            if self._since_snapshot >= self.snapshot_every:
+                self._snapshot_due = True
+            return results
+        finally:
+            self._pending_completed.difference_update(completing)
+            self._pending_deleted.difference_update(deleting)
+            if self._snapshot_due and not self._inflight:
+                self.snapshot()
+
+    def _reserve_ids(self, count):
+        # Diske inmeden önce verilir; yazma başarısız olursa ID atlanır (AUTOINCREMENT gibi).
+        first = self._next_id
+        self._next_id += count
+        return list(range(first, first + count))
+
+    def _completion_outcome(self, task_id, guild_id, channel_id):
+        task = self._tasks.get(task_id)
+        if task is None or task_id in self._pending_deleted or not self._in_scope(task, guild_id, channel_id):
+            return TaskOutcome.NOT_FOUND
+        if task.completed or task_id in self._pending_completed:
+            return TaskOutcome.ALREADY_COMPLETED
+        return TaskOutcome.COMPLETED
+
+    def _can_delete(self, task_id, guild_id, channel_id):
+        task = self._tasks.get(task_id)
+        return task is not None and task_id not in self._pending_deleted and self._in_scope(task, guild_id, channel_id)
+
+    async def add_task(self, description: str, guild_id=None, channel_id=None):
+        """Yeni bir görev ekler ve ID'sini döner."""
+        (task_id,) = await self.add_tasks([description], guild_id, channel_id)
+        return task_id
+
+    async def add_tasks(self, descriptions, guild_id=None, channel_id=None, completed=None):
+        """
+        Birden fazla görevi tek fsync ile ekler ve ID'lerini döner. `completed`
+        bayrağı doğru olan görevlerin tamamlanması aynı kayda yazılır.
+        """
+        descriptions = list(descriptions)
+        task_ids = self._reserve_ids(len(descriptions))
+        await self._append([
+            (TASK_ADDED, task_id, description, guild_id, channel_id, *((True,) if done else ()))
+            for task_id, description, done in zip(task_ids, descriptions, completed or [False] * len(descriptions))
+        ])
+        return task_ids
+
+    async def delete_task(self, task_id: int, guild_id=None, channel_id=None) -> bool:
+        """Görevi siler. Başarılıysa True döner."""
+        result = await self.delete_tasks([task_id], guild_id, channel_id)
+        return bool(result.succeeded)
+
+    async def complete_task(self, task_id: int, guild_id=None, channel_id=None):
+        """Görevi tamamlar ve TaskOutcome döner."""
+        outcome = self._completion_outcome(task_id, guild_id, channel_id)
+        if outcome is TaskOutcome.COMPLETED:
+            await self._append([(TASK_COMPLETED, task_id)], completing=[task_id])
+        return outcome
+
+    async def delete_tasks(self, task_ids, guild_id=None, channel_id=None):
+        """Görevleri tek fsync ile siler ve BatchResult döner."""
+        succeeded, missing = [], []
+        for task_id in sorted(set(task_ids)):
+            (succeeded if self._can_delete(task_id, guild_id, channel_id) else missing).append(task_id)
+        await self._append([(TASK_DELETED, task_id) for task_id in succeeded], deleting=succeeded)
+        return BatchResult(succeeded=succeeded, already_completed=[], missing=missing)
+
+    async def complete_tasks(self, task_ids, guild_id=None, channel_id=None):
+        """Görevleri tek fsync ile tamamlar ve BatchResult döner."""
+        result = BatchResult(succeeded=[], already_completed=[], missing=[])
+        fields = {
+            TaskOutcome.COMPLETED: result.succeeded,
+            TaskOutcome.ALREADY_COMPLETED: result.already_completed,
+            TaskOutcome.NOT_FOUND: result.missing,
+        }
+        for task_id in sorted(set(task_ids)):
+            fields[self._completion_outcome(task_id, guild_id, channel_id)].append(task_id)
+        await self._append([(TASK_COMPLETED, task_id) for task_id in result.succeeded], completing=result.succeeded)
+        return result
+
+    async def set_board(self, board_channel_id: int, message_id: int, guild_id=None, channel_id=None):
+        """Kanalın pano mesajını kaydeder ve önceki mesajın ID'sini döner."""
+        (previous,) = await self._append([(BOARD_SET, board_channel_id, message_id, guild_id, channel_id)])
+        return previous[0] if previous else None
+
+    async def delete_board(self, board_channel_id: int, guild_id=None) -> bool:
+        """Kanalın pano kaydını siler."""
+        if board_channel_id not in self._boards:
+            return False
+        (deleted,) = await self._append([(BOARD_DELETED, board_channel_id)])
+        return deleted is not None
+
+    def close(self):
+        """Yeni olay varsa anlık görüntü alır ve günlük thread'ini durdurur."""
+        if self._since_snapshot and not self._inflight:
+            self.snapshot()
+        self._log.close()
+
+def convert_sqlite(db_name, directory):
+    """
+    SQLite görev veritabanını `directory` altında olay günlüğü biçimine
+    çevirir: görevler ve panolar satır satır okunup tek bir anlık görüntüye
+    yazılır. Hedefte günlük ya da anlık görüntü varsa FileExistsError fırlatır.
+    Yazılan görev sayısını döner.
+    """
+    os.makedirs(directory, exist_ok=True)
+    snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+    log_path = os.path.join(directory, LOG_FILE)
+    for path in (snapshot_path, log_path):
+        if os.path.exists(path):
+            raise FileExistsError(f"Hedef zaten var: {path}")
+    # Dosya yoksa sqlite3.connect boş bir veritabanı oluştururdu.
+    conn = sqlite3.connect(f"file:{db_name}?mode=ro", uri=True)
+    try:
+        (last_id,) = conn.execute("SELECT COALESCE(MAX(id), 0) FROM tasks").fetchone()
+        row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'tasks'").fetchone()
+        next_id = max(last_id, row[0] if row else 0) + 1
+        written = 0
+
+        def records():
+            nonlocal written
+            yield [0, SNAPSHOT_HEADER, next_id]
+            for task_id, description, completed, guild_id, channel_id in conn.execute(
+                "SELECT id, description, completed, guild_id, channel_id FROM tasks ORDER BY id"
+            ):
+                written += 1
+                yield [0, SNAPSHOT_TASK, task_id, description, completed, guild_id, channel_id]
+            for board_channel_id, message_id, guild_id, channel_id in conn.execute(
+                "SELECT channel_id, message_id, guild_id, scope_channel_id FROM task_boards"
+            ):
+                yield [0, BOARD_SET, board_channel_id, message_id, guild_id, channel_id]
+
+        write_snapshot(snapshot_path, records())
+    finally:
+        conn.close()
+    open(log_path, "ab").close()
+    return written
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="tasks.db dosyasını olay günlüğü biçimine çevirir")
+    parser.add_argument("db_name", help="Kaynak SQLite veritabanı (ör. tasks.db).")
+    parser.add_argument("directory", help="Olay günlüğünün yazılacağı dizin.")
+    args = parser.parse_args(argv)
+    try:
+        count = convert_sqlite(args.db_name, args.directory)
+    except (FileExistsError, sqlite3.Error) as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    print(f"{count} görev {args.directory} dizinine aktarıldı.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Discord'a bağlanmadan bot komutlarını çalıştıran yerel sahte gateway.
+launcher.py `--fake-gateway` ile çalıştırıldığında her işçi bot.py yerine
+bunu çalıştırır: işçinin SHARD_IDS parçalarına düşen sahte sunucularda
+komutlar doğrudan çağrılır, sonuçlar depodan okunup doğrulanır ve JSON
+özet yazılır.
+
+    SHARD_COUNT=4 SHARD_IDS=0,2 TASK_STORE=remote python fake_gateway.py
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from unittest.mock import AsyncMock, Mock
+
+DEFAULT_GUILDS = 8
+DEFAULT_TASKS_PER_GUILD = 20
+
+def guild_shard(guild_id, shard_count):
+    """Sunucunun düştüğü gateway parçası (Discord'un formülüyle)."""
+    return (guild_id >> 22) % shard_count
+
+def fake_guilds(count):
+    """Parçalara sırayla dağılan `count` sahte sunucu ID'si döner."""
+    return [(index + 1) << 22 for index in range(count)]
+
+def make_ctx(bot, guild_id, channel_id):
+    ctx = Mock()
+    ctx.bot = bot
+    ctx.send = AsyncMock()
+    ctx.message.attachments = []
+    ctx.guild.id = guild_id
+    ctx.channel.id = channel_id
+    return ctx
+
+async def drive_guild(bot, guild_id, tasks_per_guild):
+    """
+    Sunucuda görev ekler, ilkini tamamlar, listeler ve sayaçları kontrol eder.
+    Depo önceki çalıştırmalardan görev içerebilir; sayaçların değişimine
+    bakılır. Beklenmeyen her sonuç için bir hata mesajı döner.
+    """
+    import bot as handlers
+
+    ctx = make_ctx(bot, guild_id, guild_id + 1)
+    scope = handlers.task_scope(ctx)
+    before = await bot.store.get_task_counts(**scope)
+    await handlers.add_task(ctx, description=f"{guild_id} ilk görev")
+    await handlers.add_tasks(ctx, descriptions="\n".join(
+        f"{guild_id} görev {number}" for number in range(2, tasks_per_guild + 1)))
+    # Sunucuyu yalnızca bu işçi sürer; eklenen ilk görev eski görevlerden hemen sonra gelir.
+    after_id = 0
+    if before.total:
+        after_id = (await bot.store.get_tasks_page(0, before.total, **scope))[-1][0]
+    ((first_id, *_),) = await bot.store.get_tasks_page(after_id, 1, **scope)
+    await handlers.complete_task(ctx, task_ids=str(first_id))
+    await handlers.show_tasks(ctx)
+    await handlers.task_stats(ctx)
+    counts = await bot.store.get_task_counts(**scope)
+    added, done = counts.total - before.total, counts.done - before.done
+    if (added, done) != (tasks_per_guild, 1):
+        return [f"Sunucu {guild_id}: beklenen artış {tasks_per_guild}/1, bulunan {added}/{done}"]
+    return []
+
+async def run(config, guilds=DEFAULT_GUILDS, tasks_per_guild=DEFAULT_TASKS_PER_GUILD):
+    """İşçinin parçalarındaki sahte sunucuları eşzamanlı olarak sürer ve özet döner."""
+    from bot import create_bot
+
+    bot = create_bot(config)
+    shard_count = config.shard_count or 1
+    shard_ids = config.shard_ids or list(range(shard_count))
+    mine = [guild_id for guild_id in fake_guilds(guilds) if guild_shard(guild_id, shard_count) in shard_ids]
+    start = time.perf_counter()
+    results = await asyncio.gather(*(drive_guild(bot, guild_id, tasks_per_guild) for guild_id in mine))
+    await bot.board_updates.wait()
+    bot.store.close()
+    return {
+        "worker": os.getenv("WORKER_ID"),
+        "shards": sorted(shard_ids),
+        "guilds": len(mine),
+        "tasks": len(mine) * tasks_per_guild,
+        "seconds": round(time.perf_counter() - start, 3),
+        "errors": [error for errors in results for error in errors],
+    }
+
+def main(argv=None):
+    from bot import load_config
+
+    parser = argparse.ArgumentParser(description="Bot komutlarını sahte bir gateway üzerinden çalıştırır")
+    parser.add_argument("--guilds", type=int, default=DEFAULT_GUILDS, help="Toplam sahte sunucu sayısı.")
+    parser.add_argument("--tasks", type=int, default=DEFAULT_TASKS_PER_GUILD, help="Sunucu başına görev sayısı.")
+    args = parser.parse_args(argv)
+
+    summary = asyncio.run(run(load_config(), args.guilds, args.tasks))
+    # Tek yazmada: aynı çıktıyı paylaşan işçilerin satırları birbirine karışmasın.
+    sys.stdout.write(json.dumps(summary, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+    return 1 if summary["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
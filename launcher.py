@@ -0,0 +1,153 @@
+"""
+Botu birden fazla süreçte çalıştırır: gateway parçaları işçilere sırayla
+dağıtılır ve tüm işçiler tek bir depolama servisine (storage_service.py)
+Unix soketi üzerinden bağlanır. Böylece her işçi ayrı bir CPU çekirdeği
+kullanır ve SQLite'ın tek bir yazıcısı olur.
+
+    python launcher.py --workers 2 --shards 4
+    python launcher.py --workers 2 --shards 4 --fake-gateway
+
+`--fake-gateway` işçileri Discord'a bağlanmadan fake_gateway.py ile
+çalıştırır; işçiler işini bitirince servis de kapatılır.
+"""
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+from storage import DEFAULT_SOCKET_PATH, STORE_KINDS
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SERVICE_TIMEOUT = 10.0
+DEFAULT_SHUTDOWN_TIMEOUT = 10.0
+POLL_INTERVAL = 0.05
+
+class LaunchError(RuntimeError):
+    """Depolama servisi ya da işçiler başlatılamadığında fırlatılır."""
+
+def assign_shards(shard_count, workers):
+    """Parçaları işçilere sırayla dağıtır: `shard_count=5, workers=2` → `[[0, 2, 4], [1, 3]]`."""
+    if workers < 1:
+        raise ValueError("İşçi sayısı en az 1 olmalı.")
+    if shard_count < workers:
+        raise ValueError(f"Parça sayısı ({shard_count}) işçi sayısından ({workers}) az olamaz.")
+    return [list(range(worker, shard_count, workers)) for worker in range(workers)]
+
+def worker_env(environ, socket_path, shard_count, shard_ids, worker_id):
+    """İşçinin ortamını döner: depo servisine bağlanır ve yalnızca kendi parçalarını açar."""
+    env = dict(environ)
+    env.update({
+        "TASK_STORE": "remote",
+        "TASK_STORAGE_SOCKET": socket_path,
+        "SHARD_COUNT": str(shard_count),
+        "SHARD_IDS": ",".join(map(str, shard_ids)),
+        "WORKER_ID": str(worker_id),
+    })
+    return env
+
+def wait_for_socket(path, process, timeout=DEFAULT_SERVICE_TIMEOUT):
+    """Servis soketi bağlantı kabul edene kadar bekler; servis erken biterse LaunchError fırlatır."""
+    deadline = time.monotonic() + timeout
+    while True:
+        if process.poll() is not None:
+            raise LaunchError(f"Depolama servisi başlatılamadı (çıkış kodu {process.returncode}).")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(path)
+                return
+            except OSError:
+                pass
+        if time.monotonic() > deadline:
+            raise LaunchError(f"Depolama servisi {timeout} saniyede hazır olmadı: {path}")
+        time.sleep(POLL_INTERVAL)
+
+def stop_processes(processes, timeout=DEFAULT_SHUTDOWN_TIMEOUT):
+    """Süreçlere SIGTERM gönderir; süre dolunca kalanları öldürür."""
+    for process in processes:
+        if process.poll() is None:
+            process.terminate()
+    deadline = time.monotonic() + timeout
+    for process in processes:
+        try:
+            process.wait(max(0.0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+def launch(workers, shard_count, socket_path=DEFAULT_SOCKET_PATH, service_store="sqlite",
+           fake_gateway=False, worker_args=(), environ=os.environ):
+    """
+    Servisi ve işçileri başlatır, işçiler bitene kadar bekler ve çıkış kodu
+    döner. Bir işçi hatayla biterse ya da servis düşerse diğer tüm süreçler
+    durdurulur. SIGINT/SIGTERM gelince her şey düzenli kapatılır.
+    """
+    assignments = assign_shards(shard_count, workers)
+    service_env = dict(environ)
+    # İşçilerden gelen yazmalar tek bir yazıcıda toplanıp toplu commit edilir.
+    service_env.setdefault("TASK_GROUP_COMMIT", "1")
+    service = subprocess.Popen(
+        [sys.executable, os.path.join(HERE, "storage_service.py"), "--socket", socket_path, "--store", service_store],
+        env=service_env,
+    )
+    processes = []
+    stopping = False
+
+    def request_stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    previous_handlers = {signum: signal.signal(signum, request_stop) for signum in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        wait_for_socket(socket_path, service)
+        script = os.path.join(HERE, "fake_gateway.py" if fake_gateway else "bot.py")
+        for worker_id, shard_ids in enumerate(assignments):
+            env = worker_env(environ, socket_path, shard_count, shard_ids, worker_id)
+            print(f"İşçi {worker_id}: parçalar {env['SHARD_IDS']}", flush=True)
+            processes.append(subprocess.Popen([sys.executable, script, *worker_args], env=env))
+
+        while not stopping:
+            codes = [process.poll() for process in processes]
+            if any(code not in (None, 0) for code in codes):
+                print("Bir işçi hatayla sonlandı; diğer süreçler durduruluyor.", file=sys.stderr)
+                return 1
+            if all(code == 0 for code in codes):
+                return 0
+            if service.poll() is not None:
+                print("Depolama servisi beklenmedik şekilde sonlandı.", file=sys.stderr)
+                return 1
+            time.sleep(POLL_INTERVAL)
+        return 0
+    except LaunchError as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    finally:
+        # Servis en son durdurulur; işçilerin bekleyen yazmaları önce yanıtlanır.
+        stop_processes(processes)
+        stop_processes([service])
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Botu çok süreçli ve parçalı olarak çalıştırır")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="İşçi süreç sayısı.")
+    parser.add_argument("--shards", type=int, help="Toplam gateway parçası sayısı (varsayılan: işçi sayısı).")
+    parser.add_argument("--socket", default=os.getenv("TASK_STORAGE_SOCKET", DEFAULT_SOCKET_PATH),
+                        help="Depolama servisinin Unix soketi.")
+    parser.add_argument("--store", default=os.getenv("TASK_SERVICE_STORE", "sqlite"),
+                        choices=[kind for kind in STORE_KINDS if kind != "remote"],
+                        help="Depolama servisinin kullanacağı görev deposu.")
+    parser.add_argument("--fake-gateway", action="store_true",
+                        help="İşçileri Discord yerine yerel sahte gateway ile çalıştırır.")
+    args, worker_args = parser.parse_known_args(argv)
+    try:
+        return launch(args.workers, args.shards or args.workers, args.socket, args.store,
+                      args.fake_gateway, worker_args)
+    except ValueError as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+import bisect
+import re
+import unicodedata
+from array import array
+
+from database import (
+    DEFAULT_PAGE_SIZE, TASK_STATUSES, BatchResult, TaskCounts, TaskOutcome, parse_search_terms,
+)
+from rendering import STATUS_TITLES, render_page
+
+_WORD = re.compile(r"\w+")
+
+def _fold(text):
+    """FTS5 unicode61 (remove_diacritics 2) gibi: küçük harf ve aksansız."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+def _tokens(text):
+    return _WORD.findall(_fold(text))
+
+class _Task:
+    __slots__ = ("description", "completed", "guild_id", "channel_id")
+
+    def __init__(self, description, guild_id, channel_id):
+        self.description = description
+        self.completed = 0
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+
+class MemoryTaskStore:
+    """
+    Görevleri yalnızca bellekte tutan TaskStore. Görevler ID'ye göre bir
+    sözlükte, kapsamlar ise sıralı ID dizilerinde (sunucu ve sunucu+kanal
+    başına) indekslenir; sayaçlar yazmalarla birlikte güncellenir. Disk G/Ç'si
+    ve thread kullanmaz; testler ve geçici kurulumlar içindir. Süreç
+    kapanınca veriler kaybolur.
+    """
+
+    def __init__(self):
+        self._tasks = {}
+        # SQLite'taki AUTOINCREMENT gibi: silinen ID'ler yeniden verilmez.
+        self._next_id = 1
+        # (guild_id, None) sunucunun tüm görevlerini, (guild_id, channel_id) kanalınkileri tutar.
+        self._index = {}
+        self._counts = {}
+        self._boards = {}
+
+    def _scope_ids(self, guild_id, channel_id):
+        return self._index.get((guild_id, channel_id), ())
+
+    def _scope_keys(self, task):
+        keys = [(task.guild_id, None)]
+        if task.channel_id is not None:
+            keys.append((task.guild_id, task.channel_id))
+        return keys
+
+    def _in_scope(self, task, guild_id, channel_id):
+        return task.guild_id == guild_id and (channel_id is None or task.channel_id == channel_id)
+
+    def _count(self, task, total, done):
+        for key in self._scope_keys(task):
+            counts = self._counts.setdefault(key, [0, 0])
+            counts[0] += total
+            counts[1] += done
+
+    def _insert(self, description, guild_id, channel_id, task_id=None):
+        if task_id is None:
+            task_id = self._next_id
+        self._next_id = max(self._next_id, task_id + 1)
+        task = self._tasks[task_id] = _Task(description, guild_id, channel_id)
+        # ID'ler çoğunlukla artarak eklenir; diziler sonuna ekleyerek sıralı kalır.
+        for key in self._scope_keys(task):
+            ids = self._index.setdefault(key, array("q"))
+            if ids and ids[-1] > task_id:
+                bisect.insort(ids, task_id)
+            else:
+                ids.append(task_id)
+        self._count(task, 1, 0)
+        return task_id
+
+    def _remove(self, task_id):
+        task = self._tasks.pop(task_id)
+        for key in self._scope_keys(task):
+            ids = self._index[key]
+            del ids[bisect.bisect_left(ids, task_id)]
+        self._count(task, -1, -task.completed)
+
+    def _delete(self, task_id, guild_id, channel_id):
+        task = self._tasks.get(task_id)
+        if task is None or not self._in_scope(task, guild_id, channel_id):
+            return False
+        self._remove(task_id)
+        return True
+
+    def _complete(self, task_id, guild_id, channel_id):
+        task = self._tasks.get(task_id)
+        if task is None or not self._in_scope(task, guild_id, channel_id):
+            return TaskOutcome.NOT_FOUND
+        if task.completed:
+            return TaskOutcome.ALREADY_COMPLETED
+        task.completed = 1
+        self._count(task, 0, 1)
+        return TaskOutcome.COMPLETED
+
+    def _row(self, task_id):
+        task = self._tasks[task_id]
+        return (task_id, task.description, task.completed)
+
+    def _rows_after(self, after_id, limit, guild_id, channel_id, status):
+        if status not in TASK_STATUSES:
+            raise ValueError(f"Geçersiz durum: {status}")
+        completed = TASK_STATUSES[status]
+        ids = self._scope_ids(guild_id, channel_id)
+        rows = []
+        for index in range(bisect.bisect_right(ids, after_id), len(ids)):
+            if len(rows) == limit:
+                break
+            task = self._tasks[ids[index]]
+            if completed is None or task.completed == completed:
+                rows.append((ids[index], task.description, task.completed))
+        return rows
+
+    async def init(self):
+        """Bellek deposu hazırlık gerektirmez."""
+        return []
+
+    async def add_task(self, description: str, guild_id=None, channel_id=None):
+        """Yeni bir görev ekler ve ID'sini döner."""
+        return self._insert(description, guild_id, channel_id)
+
+    async def add_tasks(self, descriptions, guild_id=None, channel_id=None, completed=None):
+        """Birden fazla görevi ekler ve ID'lerini döner; `completed` bayrakları doğru olanlar tamamlanmış eklenir."""
+        task_ids = []
+        for description, done in zip(descriptions, completed or [False] * len(descriptions)):
+            task_id = self._insert(description, guild_id, channel_id)
+            if done:
+                self._complete(task_id, guild_id, channel_id)
+            task_ids.append(task_id)
+        return task_ids
+
+    async def get_tasks(self, guild_id=None, channel_id=None, status="all"):
+        """Kapsamdaki görevleri (`status`: "all", "open" veya "done") döner."""
+        return self._rows_after(0, len(self._tasks), guild_id, channel_id, status)
+
+    async def get_tasks_page(self, after_id: int = 0, limit: int = DEFAULT_PAGE_SIZE,
+                             guild_id=None, channel_id=None, status="all"):
+        """ID'si `after_id`'den büyük en fazla `limit` görevi döner."""
+        return self._rows_after(after_id, limit, guild_id, channel_id, status)
+
+    async def render_tasks_page(self, after_id: int = 0, page_size: int = DEFAULT_PAGE_SIZE,
+                                guild_id=None, channel_id=None, status="all"):
+        """`after_id`'den sonraki görev sayfasını yazılmış halde (RenderedPage) döner."""
+        rows = self._rows_after(after_id, page_size + 1, guild_id, channel_id, status)
+        return render_page(rows, page_size, title=STATUS_TITLES[status])
+
+    async def search_tasks(self, query: str, offset: int = 0, limit: int = DEFAULT_PAGE_SIZE,
+                           guild_id=None, channel_id=None):
+        """
+        Sorgudaki tüm terimleri içeren görevleri, açıklamadaki eşleşme
+        yoğunluğu yüksekten düşüğe (eşitlikte ID sırasıyla) döner. Terim
+        ayrıştırması SQLite deposuyla aynıdır; sıralama bm25'e yaklaşıktır.
+        """
+        terms = [(_tokens(phrase), prefix) for phrase, prefix in parse_search_terms(query)]
+        terms = [(words, prefix) for words, prefix in terms if words]
+        if not terms:
+            raise ValueError("Arama sorgusu boş.")
+        scored = []
+        for task_id in self._scope_ids(guild_id, channel_id):
+            tokens = _tokens(self._tasks[task_id].description)
+            hits = [_phrase_hits(tokens, words, prefix) for words, prefix in terms]
+            if all(hits):
+                scored.append((-sum(hits) / len(tokens), task_id))
+        scored.sort()
+        return [self._row(task_id) for _, task_id in scored[offset:offset + limit]]
+
+    async def get_task_counts(self, guild_id=None, channel_id=None):
+        """Kapsamdaki görev sayılarını (TaskCounts) döner."""
+        total, done = self._counts.get((guild_id, channel_id), (0, 0))
+        return TaskCounts(total, total - done, done)
+
+    async def get_task_by_id(self, task_id: int, guild_id=None, channel_id=None):
+        """Belirli bir ID'ye sahip görevi döner."""
+        task = self._tasks.get(task_id)
+        if task is None or not self._in_scope(task, guild_id, channel_id):
+            return None
+        return self._row(task_id)
+
+    async def delete_task(self, task_id: int, guild_id=None, channel_id=None) -> bool:
+        """Görevi siler. Başarılıysa True döner."""
+        return self._delete(task_id, guild_id, channel_id)
+
+    async def complete_task(self, task_id: int, guild_id=None, channel_id=None):
+        """Görevi tamamlar ve TaskOutcome döner."""
+        return self._complete(task_id, guild_id, channel_id)
+
+    async def delete_tasks(self, task_ids, guild_id=None, channel_id=None):
+        """Görevleri siler ve BatchResult döner."""
+        succeeded, missing = [], []
+        for task_id in sorted(set(task_ids)):
+            deleted = self._delete(task_id, guild_id, channel_id)
+            (succeeded if deleted else missing).append(task_id)
+        return BatchResult(succeeded=succeeded, already_completed=[], missing=missing)
+
+    async def complete_tasks(self, task_ids, guild_id=None, channel_id=None):
+        """Görevleri tamamlar ve BatchResult döner."""
+        result = BatchResult(succeeded=[], already_completed=[], missing=[])
+        fields = {
+            TaskOutcome.COMPLETED: result.succeeded,
+            TaskOutcome.ALREADY_COMPLETED: result.already_completed,
+            TaskOutcome.NOT_FOUND: result.missing,
+        }
+        for task_id in sorted(set(task_ids)):
+            fields[self._complete(task_id, guild_id, channel_id)].append(task_id)
+        return result
+
+    async def get_boards(self, guild_id=None, channel_id=None):
+        """Kapsamı gösteren görev panolarını `(kanal_id, mesaj_id)` olarak döner."""
+        return [(board_channel_id, message_id)
+                for board_channel_id, (message_id, scope) in self._boards.items()
+                if scope == (guild_id, channel_id)]
+
+    async def set_board(self, board_channel_id: int, message_id: int, guild_id=None, channel_id=None):
+        """Kanalın pano mesajını kaydeder ve önceki mesajın ID'sini döner."""
+        previous = self._boards.get(board_channel_id)
+        self._boards[board_channel_id] = (message_id, (guild_id, channel_id))
+        return previous[0] if previous else None
+
+    async def delete_board(self, board_channel_id: int, guild_id=None) -> bool:
+        """Kanalın pano kaydını siler."""
+        return self._boards.pop(board_channel_id, None) is not None
+
+    def close(self):
+        """Bellek deposunun kapatılacak kaynağı yoktur."""
+
+def _phrase_hits(tokens, words, prefix):
+    """`words` ifadesinin `tokens` içinde kaç kez geçtiğini döner; `prefix` ise son kelime önektir."""
+    hits = 0
+    last = len(words) - 1
+    for start in range(len(tokens) - last):
+        if all(tokens[start + i] == word for i, word in enumerate(words[:last])):
+            token = tokens[start + last]
+            if token == words[last] or (prefix and token.startswith(words[last])):
+                hits += 1
+    return hits
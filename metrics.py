@@ -0,0 +1,315 @@
+import bisect
+import functools
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Saniye cinsinden histogram sınırları; bir Discord komutu için 0.5 ms - 10 s.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+MAX_STATEMENT_LABEL_LENGTH = 120
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+class Histogram:
+    """Sabit sınırlı, Prometheus uyumlu gecikme histogramı."""
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        # Son hücre +Inf içindir.
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Yüzdelik değeri hücre içinde doğrusal ara değerle tahmin eder."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                return lower + (self.buckets[index] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def copy(self):
+        other = Histogram(self.buckets)
+        other.counts = list(self.counts)
+        other.count = self.count
+        other.sum = self.sum
+        return other
+
+class MetricsRegistry:
+    """
+    Etiketli sayaç ve histogramları tutan thread-safe kayıt. `add_collector`
+    ile verilen fonksiyonlar, başka yerde tutulan değerleri (örneğin önbellek
+    istatistikleri) okuma anında `(ad, tür, etiketler, değer)` olarak üretir.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+        self._collectors = []
+
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def increment(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    @contextmanager
+    def timer(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def add_collector(self, collector):
+        self._collectors.append(collector)
+
+    def histograms(self, name, label):
+        """Verilen addaki histogramların `{etiket değeri: Histogram}` kopyasını döner."""
+        with self._lock:
+            return {dict(labels).get(label): histogram.copy()
+                    for (hist_name, labels), histogram in self._histograms.items() if hist_name == name}
+
+    def counters(self, name):
+        """Verilen addaki sayaçları `{etiketler: değer}` olarak döner."""
+        with self._lock:
+            return {labels: value for (counter_name, labels), value in self._counters.items() if counter_name == name}
+
+    def collected(self):
+        """Toplayıcıların o anki değerlerini `{ad: değer}` olarak döner."""
+        return {name: value for collector in self._collectors for name, _, _, value in collector()}
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def _samples(self):
+        with self._lock:
+            histograms = [(name, labels, h.copy()) for (name, labels), h in self._histograms.items()]
+            counters = [(name, "counter", labels, value) for (name, labels), value in self._counters.items()]
+        for collector in self._collectors:
+            for name, kind, labels, value in collector():
+                counters.append((name, kind, tuple(sorted(labels.items())), value))
+        return histograms, counters
+
+    def render_prometheus(self):
+        """Tüm ölçümleri Prometheus metin biçiminde (0.0.4) döner."""
+        histograms, counters = self._samples()
+        lines = []
+        typed = set()
+        for name, labels, histogram in sorted(histograms, key=lambda item: item[:2]):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} histogram")
+            cumulative = 0
+            bounds = [repr(float(bound)) for bound in histogram.buckets] + ["+Inf"]
+            for bound, count in zip(bounds, histogram.counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', bound),))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum!r}")
+            lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        for name, kind, labels, value in sorted(counters, key=lambda item: (item[0], item[2])):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels) + "}"
+
+REGISTRY = MetricsRegistry()
+
+@functools.lru_cache(maxsize=512)
+def normalize_sql(sql):
+    """
+    SQL metnini etiket olarak kullanılabilecek biçime getirir: boşluklar
+    sadeleşir, değişken uzunluktaki `?, ?, ?` listeleri tek `?…` olur.
+    """
+    text = _PLACEHOLDER_LIST.sub("?…", _WHITESPACE.sub(" ", sql).strip())
+    return text[:MAX_STATEMENT_LABEL_LENGTH]
+
+class TimedCursor(sqlite3.Cursor):
+    """
+    Her ifadenin süresini ifade metnine göre tek bir örnek olarak kaydeder.
+    Satır döndüren ifadelerde örnek, çalıştırma ile satırlar tükenene, imleç
+    yeni bir ifade çalıştırana ya da kapanana kadarki okumaların toplamıdır.
+    """
+
+    _statement = None
+    _elapsed = 0.0
+
+    def _record(self):
+        if self._statement is not None:
+            REGISTRY.observe("sql_statement_duration_seconds", self._elapsed, statement=self._statement)
+            self._statement = None
+
+    def _timed(self, func, *args):
+        start = time.perf_counter()
+        try:
+            result = func(*args)
+        except BaseException:
+            self._elapsed += time.perf_counter() - start
+            self._record()
+            raise
+        self._elapsed += time.perf_counter() - start
+        return result
+
+    def _start(self, sql, func, *args):
+        self._record()
+        self._statement = normalize_sql(sql)
+        self._elapsed = 0.0
+        result = self._timed(func, *args)
+        if self.description is None:
+            # Satır döndürmeyen ifade (INSERT, UPDATE, ...) burada biter.
+            self._record()
+        return result
+
+    def execute(self, sql, parameters=()):
+        return self._start(sql, super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._start(sql, super().executemany, sql, seq_of_parameters)
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        if row is None:
+            self._record()
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        rows = self._timed(super().fetchmany, size)
+        if len(rows) < size:
+            self._record()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        self._record()
+        return rows
+
+    def close(self):
+        self._record()
+        super().close()
+
+    def __del__(self):
+        # `.fetchone()` ile tek satırı okunup bırakılan imleçlerin ölçümü burada yazılır.
+        self._record()
+
+class TimedConnection(sqlite3.Connection):
+    """İmleçleri TimedCursor olan bağlantı; kısayol `execute` çağrıları da ölçülür."""
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    # C tarafındaki Connection.execute, alt sınıfın cursor() metodunu çağırmaz.
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+def _count_statement(sql):
+    # Tetikleyici içindeki ifadeler "-- TRIGGER ad" olarak bildirilir.
+    if sql.startswith("--"):
+        kind = "TRIGGER"
+    else:
+        kind = (sql.split(None, 1) or ["?"])[0].upper()
+    REGISTRY.increment("sql_statements_total", kind=kind)
+
+def instrument_connection(conn):
+    """
+    Bağlantının çalıştırdığı her ifadeyi (örtük BEGIN/COMMIT ve tetikleyici
+    ifadeleri dahil) türüne göre sayar.
+    """
+    conn.set_trace_callback(_count_statement)
+    return conn
+
+def format_report(registry=REGISTRY, limit=8):
+    """`!perf` için komut, SQL, hata ve önbellek özetini yazar."""
+    lines = ["📈 **Performans Özeti**", "```"]
+    commands = sorted(registry.histograms("bot_command_duration_seconds", "command").items(),
+                      key=lambda item: item[1].quantile(0.99), reverse=True)
+    lines.append(f"{'komut':<18}{'adet':>7}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, histogram in commands[:limit]:
+        lines.append(f"{name[:18]:<18}{histogram.count:>7}"
+                     f"{histogram.quantile(0.5) * 1000:>10.1f}{histogram.quantile(0.99) * 1000:>10.1f}")
+    if not commands:
+        lines.append("(henüz komut yok)")
+
+    statements = sorted(registry.histograms("sql_statement_duration_seconds", "statement").items(),
+                        key=lambda item: item[1].sum, reverse=True)
+    lines.append("")
+    lines.append(f"{'en çok süren SQL':<40}{'adet':>7}{'top. ms':>10}")
+    for statement, histogram in statements[:limit]:
+        lines.append(f"{statement[:38]:<40}{histogram.count:>7}{histogram.sum * 1000:>10.1f}")
+
+    errors = registry.counters("bot_command_errors_total")
+    lines.append("")
+    lines.append(f"hatalar: {int(sum(errors.values()))}")
+    for labels, value in sorted(errors.items(), key=lambda item: -item[1])[:limit]:
+        lines.append(f"  {dict(labels).get('command')}/{dict(labels).get('error')}: {int(value)}")
+
+    cache = registry.collected()
+    if "task_cache_hits_total" in cache:
+        lookups = cache.get("task_cache_hits_total", 0) + cache.get("task_cache_misses_total", 0)
+        ratio = cache.get("task_cache_hits_total", 0) / lookups if lookups else 0.0
+        lines.append(f"önbellek: isabet %{ratio * 100:.1f}, tahliye {int(cache.get('task_cache_evictions_total', 0))}, "
+                     f"{int(cache.get('task_cache_bytes', 0)) // 1024} KB")
+    lines.append("```")
+    return "\n".join(lines)
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_http_server(port, host="127.0.0.1", registry=REGISTRY):
+    """Ölçümleri `http://host:port/metrics` adresinde arka planda sunar ve sunucuyu döner."""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
@@ -0,0 +1,241 @@
+from collections import namedtuple
+
+DEFAULT_BACKFILL_BATCH_SIZE = 1000
+
+# `apply(conn)` şema değişikliğini yapar. `backfill(conn, last_id, batch_size)`
+# verilmişse bir sonraki partiyi işler ve kaldığı ID'yi, iş bittiğinde None döner.
+Migration = namedtuple("Migration", "version description apply backfill", defaults=(None, None))
+
+class SchemaVersionError(RuntimeError):
+    """Veritabanı bu kodun bildiğinden daha yeni bir şema sürümündeyse fırlatılır."""
+
+def _create_tasks_table(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            description TEXT NOT NULL,
+            completed INTEGER DEFAULT 0 -- 0: incomplete, 1: completed
+        )
+    ''')
+
+def _add_tenant_columns(conn):
+    # Bu motordan önce init_db sütunları zaten eklemiş olabilir (user_version = 0).
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(tasks)")}
+    for column in ("guild_id", "channel_id"):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE tasks ADD COLUMN {column} INTEGER")
+
+def _create_tenant_indexes(conn):
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_guild ON tasks (guild_id, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_guild_completed ON tasks (guild_id, completed, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_guild_channel ON tasks (guild_id, channel_id, id)")
+
+# Doldurma sürerken henüz dizinlenmemiş satırlar (done_id < id <= max_id) için
+# silme/güncelleme tetikleyicileri çalışmaz: harici içerikli tabloda hiç
+# eklenmemiş bir rowid için 'delete' dizini bozar. Bu satırların güncel
+# açıklaması zaten tasks'tan okunarak dizinlenecektir.
+_BACKFILL_PENDING = "old.id > (SELECT done_id FROM tasks_fts_backfill) AND old.id <= (SELECT max_id FROM tasks_fts_backfill)"
+
+def _create_search_triggers(conn, condition=None):
+    when = f"WHEN NOT ({condition})" if condition else ""
+    conn.execute("DROP TRIGGER IF EXISTS tasks_fts_delete")
+    conn.execute("DROP TRIGGER IF EXISTS tasks_fts_update")
+    conn.execute(f'''
+        CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks {when} BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, description) VALUES ('delete', old.id, old.description);
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER tasks_fts_update AFTER UPDATE OF description ON tasks {when} BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, description) VALUES ('delete', old.id, old.description);
+            INSERT INTO tasks_fts (rowid, description) VALUES (new.id, new.description);
+        END
+    ''')
+
+def _create_search_index(conn):
+    # Harici içerikli (external content) FTS5 tablosu: açıklamalar iki kez
+    # saklanmaz, dizin tetikleyicilerle tasks tablosuyla eş tutulur.
+    conn.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+            description, content='tasks', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts (rowid, description) VALUES (new.id, new.description);
+        END
+    ''')
+    # Bu andan sonra eklenen görevleri tetikleyiciler dizinler; doldurma
+    # yalnızca mevcut en büyük ID'ye kadar çalışır ki satırlar iki kez dizinlenmesin.
+    # `done_id` dizinlenen son ID'dir; her partiyle aynı işlemde ilerler.
+    conn.execute("CREATE TABLE tasks_fts_backfill AS SELECT COALESCE(MAX(id), 0) AS max_id, 0 AS done_id FROM tasks")
+    _create_search_triggers(conn, _BACKFILL_PENDING)
+
+def _backfill_search_index(conn, last_id, batch_size):
+    max_id = conn.execute("SELECT max_id FROM tasks_fts_backfill").fetchone()[0]
+    ids = [row[0] for row in conn.execute(
+        "SELECT id FROM tasks WHERE id > ? AND id <= ? ORDER BY id LIMIT ?", (last_id, max_id, batch_size)
+    )]
+    if not ids:
+        # Tetikleyiciler artık koşulsuzdur ve silinen tabloya başvurmaz.
+        _create_search_triggers(conn)
+        conn.execute("DROP TABLE tasks_fts_backfill")
+        return None
+    conn.execute(
+        "INSERT INTO tasks_fts (rowid, description) SELECT id, description FROM tasks WHERE id BETWEEN ? AND ?",
+        (ids[0], ids[-1]),
+    )
+    conn.execute("UPDATE tasks_fts_backfill SET done_id = ?", (ids[-1],))
+    return ids[-1]
+
+def _create_open_task_index(conn):
+    # Açık görevler tablonun küçük bir kısmıdır; kısmi indeks yalnızca onları
+    # içerir ve sorgular koşulu aynen `completed = 0` diye yazmalıdır. Sunucu
+    # kapsamı için idx_tasks_guild_completed zaten yalnızca açık satırları tarar.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_open_channel ON tasks (guild_id, channel_id, id) WHERE completed = 0"
+    )
+
+# NULL değerler birincil anahtarda birbirine eşit sayılmaz; kapsam -1 ile saklanır.
+_COUNT_KEY = "COALESCE({0}.guild_id, -1), COALESCE({0}.channel_id, -1)"
+
+def _count_upsert(row, sign):
+    return f"""
+        INSERT INTO task_counts (guild_key, channel_key, total, done)
+        VALUES ({_COUNT_KEY.format(row)}, {sign}1, {sign}({row}.completed = 1))
+        ON CONFLICT (guild_key, channel_key) DO UPDATE SET
+            total = total + excluded.total, done = done + excluded.done;
+    """
+
+def rebuild_task_counts(conn):
+    """task_counts tablosunu tasks tablosundan yeniden hesaplar; çağıran işlemi yönetir."""
+    conn.execute("DELETE FROM task_counts")
+    conn.execute('''
+        INSERT INTO task_counts (guild_key, channel_key, total, done)
+        SELECT COALESCE(guild_id, -1), COALESCE(channel_id, -1), COUNT(*), SUM(completed = 1)
+        FROM tasks GROUP BY 1, 2
+    ''')
+
+def _create_task_counts(conn):
+    # Sayaçlar tetikleyicilerle aynı işlemde tek bir GROUP BY ile doldurulur.
+    # Parça parça doldurmada, henüz sayılmamış satırların silinmesi ya da
+    # güncellenmesi tetikleyiciler yüzünden sayaçları bozardı.
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS task_counts (
+            guild_key INTEGER NOT NULL,
+            channel_key INTEGER NOT NULL,
+            total INTEGER NOT NULL DEFAULT 0,
+            done INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (guild_key, channel_key)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS task_counts_insert AFTER INSERT ON tasks BEGIN {_count_upsert('new', '+')} END")
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS task_counts_delete AFTER DELETE ON tasks BEGIN {_count_upsert('old', '-')} END")
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS task_counts_update AFTER UPDATE OF completed, guild_id, channel_id ON tasks BEGIN
+            {_count_upsert('old', '-')}
+            {_count_upsert('new', '+')}
+        END
+    """)
+    rebuild_task_counts(conn)
+
+def _create_task_boards(conn):
+    # Kanal başına bir pano; guild_id/scope_channel_id panonun gösterdiği görev kapsamıdır.
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS task_boards (
+            channel_id INTEGER PRIMARY KEY,
+            message_id INTEGER NOT NULL,
+            guild_id INTEGER,
+            scope_channel_id INTEGER
+        )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_task_boards_scope ON task_boards (guild_id, scope_channel_id)")
+
+MIGRATIONS = [
+    Migration(1, "tasks tablosu", _create_tasks_table),
+    Migration(2, "guild_id ve channel_id sütunları", _add_tenant_columns),
+    Migration(3, "kiracı indeksleri", _create_tenant_indexes),
+    Migration(4, "tam metin arama dizini", _create_search_index, _backfill_search_index),
+    Migration(5, "kanal kapsamında açık görevler için kısmi indeks", _create_open_task_index),
+    Migration(6, "tetikleyicilerle tutulan görev sayaçları", _create_task_counts),
+    Migration(7, "görev panoları", _create_task_boards),
+]
+
+def get_schema_version(conn):
+    """Veritabanının şema sürümünü (PRAGMA user_version) döner."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def _ensure_progress_table(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_backfill (
+            version INTEGER PRIMARY KEY,
+            last_id INTEGER NOT NULL
+        )
+    ''')
+
+def _run_step(conn, migration, batch_size):
+    """
+    Tek bir göçü uygular. Şema değişikliği tek bir işlemde yapılır; veri
+    doldurma (backfill) varsa her parti ayrı ve kısa bir işlemde yürür, böylece
+    yazma kilidi uzun süre tutulmaz. Yarıda kalan doldurma kaldığı yerden sürer.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Başka bir süreç aynı göçü bu arada uygulamış olabilir.
+        if get_schema_version(conn) >= migration.version:
+            conn.commit()
+            return False
+        if migration.backfill is None:
+            if migration.apply is not None:
+                migration.apply(conn)
+            conn.execute(f"PRAGMA user_version = {int(migration.version)}")
+            conn.commit()
+            return True
+
+        _ensure_progress_table(conn)
+        row = conn.execute("SELECT last_id FROM schema_backfill WHERE version = ?", (migration.version,)).fetchone()
+        if row is None:
+            if migration.apply is not None:
+                migration.apply(conn)
+            conn.execute("INSERT INTO schema_backfill (version, last_id) VALUES (?, 0)", (migration.version,))
+            last_id = 0
+        else:
+            last_id = row[0]
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+    while last_id is not None:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            last_id = migration.backfill(conn, last_id, batch_size)
+            if last_id is None:
+                conn.execute("DELETE FROM schema_backfill WHERE version = ?", (migration.version,))
+                conn.execute(f"PRAGMA user_version = {int(migration.version)}")
+            else:
+                conn.execute("UPDATE schema_backfill SET last_id = ? WHERE version = ?", (last_id, migration.version))
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    return True
+
+def migrate(conn, migrations=None, batch_size=DEFAULT_BACKFILL_BATCH_SIZE):
+    """
+    Bekleyen göçleri sürüm sırasıyla uygular ve uygulanan sürümleri döner.
+    Şema güncelse yalnızca tek bir PRAGMA okunur.
+    """
+    migrations = sorted(migrations if migrations is not None else MIGRATIONS, key=lambda m: m.version)
+    latest = migrations[-1].version if migrations else 0
+    current = get_schema_version(conn)
+    if current > latest:
+        raise SchemaVersionError(
+            f"Veritabanı şema sürümü {current}, bu sürüm en fazla {latest} destekliyor."
+        )
+    applied = []
+    for migration in migrations:
+        if migration.version > current and _run_step(conn, migration, batch_size):
+            applied.append(migration.version)
+    return applied
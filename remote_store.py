@@ -0,0 +1,193 @@
+import asyncio
+import itertools
+import weakref
+
+from database import DEFAULT_PAGE_SIZE, BatchResult, TaskCounts, TaskOutcome
+from rendering import RenderedPage
+from storage import DEFAULT_SOCKET_PATH, StoreBusyError
+from storage_service import FrameOutbox, read_frame
+
+DEFAULT_CALL_TIMEOUT = 30.0
+
+class StorageServiceError(RuntimeError):
+    """Depolama servisine ulaşılamadığında ya da servis beklenmeyen bir hata döndüğünde fırlatılır."""
+
+# Serviste oluşup istemcide aynı türle yeniden fırlatılan hatalar.
+_REMOTE_ERRORS = {"ValueError": ValueError, "StoreBusyError": StoreBusyError}
+
+def _rows(value):
+    return [tuple(row) for row in value]
+
+# JSON'dan gelen değerleri yerel depoların döndüğü türlere çevirir.
+_DECODERS = {
+    "get_tasks": _rows,
+    "get_tasks_page": _rows,
+    "search_tasks": _rows,
+    "get_boards": _rows,
+    "render_tasks_page": lambda value: RenderedPage(*value),
+    "get_task_counts": lambda value: TaskCounts(*value),
+    "get_task_by_id": lambda value: tuple(value) if value is not None else None,
+    "complete_task": TaskOutcome,
+    "delete_tasks": lambda value: BatchResult(*value),
+    "complete_tasks": lambda value: BatchResult(*value),
+}
+
+class _Connection:
+    def __init__(self, path):
+        self.pending = {}
+        self.closed = False
+        self.outbox = None
+        self.writer = None
+        self._opening = asyncio.ensure_future(self._open(path))
+
+    async def _open(self, path):
+        try:
+            reader, self.writer = await asyncio.open_unix_connection(path)
+        except OSError as e:
+            self.closed = True
+            raise StorageServiceError(f"Depolama servisine bağlanılamadı ({path}): {e}") from e
+        self.outbox = FrameOutbox(self.writer)
+        asyncio.ensure_future(self._read(reader))
+
+    async def ready(self):
+        await asyncio.shield(self._opening)
+
+    async def _read(self, reader):
+        try:
+            while True:
+                for call_id, ok, value in await read_frame(reader):
+                    future = self.pending.pop(call_id, None)
+                    if future is None or future.done():
+                        continue
+                    if ok:
+                        future.set_result(value)
+                    else:
+                        name, message = value
+                        error = _REMOTE_ERRORS.get(name)
+                        future.set_exception(error(message) if error else StorageServiceError(f"{name}: {message}"))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        self.closed = True
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(StorageServiceError("Depolama servisiyle bağlantı koptu."))
+        self.pending.clear()
+        if self.writer is not None:
+            self.writer.close()
+
+class RemoteTaskStore:
+    """
+    Görev işlemlerini Unix soketi üzerinden depolama servisine (bkz.
+    storage_service.py) ileten TaskStore. Aynı olay döngüsü turunda yapılan
+    çağrılar tek bir çerçevede gönderilir. Her olay döngüsü servise kendi
+    bağlantısını açar; bağlantı koparsa bekleyen çağrılar StorageServiceError
+    ile biter ve sonraki çağrı yeniden bağlanır.
+    """
+
+    def __init__(self, path=DEFAULT_SOCKET_PATH, timeout=DEFAULT_CALL_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+        self._connections = weakref.WeakKeyDictionary()
+
+    async def _connection(self):
+        loop = asyncio.get_running_loop()
+        connection = self._connections.get(loop)
+        if connection is None or connection.closed:
+            connection = self._connections[loop] = _Connection(self.path)
+        await connection.ready()
+        return connection
+
+    async def _call(self, method, *args, **kwargs):
+        connection = await self._connection()
+        call_id = next(self._ids)
+        future = connection.pending[call_id] = asyncio.get_running_loop().create_future()
+        connection.outbox.put([call_id, method, list(args), kwargs])
+        try:
+            value = await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            connection.pending.pop(call_id, None)
+            raise StorageServiceError(f"Depolama servisi {self.timeout} saniyede yanıt vermedi.") from None
+        decode = _DECODERS.get(method)
+        return decode(value) if decode else value
+
+    async def init(self):
+        """Depo servis tarafında hazırlanır."""
+        return []
+
+    async def add_task(self, description: str, guild_id=None, channel_id=None):
+        """Yeni bir görev ekler ve ID'sini döner."""
+        return await self._call("add_task", description, guild_id=guild_id, channel_id=channel_id)
+
+    async def add_tasks(self, descriptions, guild_id=None, channel_id=None, completed=None):
+        """Birden fazla görevi tek işlemde ekler ve ID'lerini döner."""
+        return await self._call("add_tasks", list(descriptions), guild_id=guild_id, channel_id=channel_id,
+                                completed=list(completed) if completed is not None else None)
+
+    async def get_tasks(self, guild_id=None, channel_id=None, status="all"):
+        """Kapsamdaki görevleri (`status`: "all", "open" veya "done") döner."""
+        return await self._call("get_tasks", guild_id=guild_id, channel_id=channel_id, status=status)
+
+    async def get_tasks_page(self, after_id: int = 0, limit: int = DEFAULT_PAGE_SIZE,
+                             guild_id=None, channel_id=None, status="all"):
+        """ID'si `after_id`'den büyük en fazla `limit` görevi döner."""
+        return await self._call("get_tasks_page", after_id, limit,
+                                guild_id=guild_id, channel_id=channel_id, status=status)
+
+    async def render_tasks_page(self, after_id: int = 0, page_size: int = DEFAULT_PAGE_SIZE,
+                                guild_id=None, channel_id=None, status="all"):
+        """`after_id`'den sonraki görev sayfasını yazılmış halde (RenderedPage) döner."""
+        return await self._call("render_tasks_page", after_id, page_size,
+                                guild_id=guild_id, channel_id=channel_id, status=status)
+
+    async def search_tasks(self, query: str, offset: int = 0, limit: int = DEFAULT_PAGE_SIZE,
+                           guild_id=None, channel_id=None):
+        """Sorguyla eşleşen görevleri alaka sırasıyla döner."""
+        return await self._call("search_tasks", query, offset, limit, guild_id=guild_id, channel_id=channel_id)
+
+    async def get_task_counts(self, guild_id=None, channel_id=None):
+        """Kapsamdaki görev sayılarını (TaskCounts) döner."""
+        return await self._call("get_task_counts", guild_id=guild_id, channel_id=channel_id)
+
+    async def get_task_by_id(self, task_id: int, guild_id=None, channel_id=None):
+        """Belirli bir ID'ye sahip görevi döner."""
+        return await self._call("get_task_by_id", task_id, guild_id=guild_id, channel_id=channel_id)
+
+    async def delete_task(self, task_id: int, guild_id=None, channel_id=None) -> bool:
+        """Görevi siler. Başarılıysa True döner."""
+        return await self._call("delete_task", task_id, guild_id=guild_id, channel_id=channel_id)
+
+    async def complete_task(self, task_id: int, guild_id=None, channel_id=None):
+        """Görevi tamamlar ve TaskOutcome döner."""
+        return await self._call("complete_task", task_id, guild_id=guild_id, channel_id=channel_id)
+
+    async def delete_tasks(self, task_ids, guild_id=None, channel_id=None):
+        """Görevleri tek işlemde siler ve BatchResult döner."""
+        return await self._call("delete_tasks", list(task_ids), guild_id=guild_id, channel_id=channel_id)
+
+    async def complete_tasks(self, task_ids, guild_id=None, channel_id=None):
+        """Görevleri tek işlemde tamamlar ve BatchResult döner."""
+        return await self._call("complete_tasks", list(task_ids), guild_id=guild_id, channel_id=channel_id)
+
+    async def get_boards(self, guild_id=None, channel_id=None):
+        """Kapsamı gösteren görev panolarını `(kanal_id, mesaj_id)` olarak döner."""
+        return await self._call("get_boards", guild_id=guild_id, channel_id=channel_id)
+
+    async def set_board(self, board_channel_id: int, message_id: int, guild_id=None, channel_id=None):
+        """Kanalın pano mesajını kaydeder ve önceki mesajın ID'sini döner."""
+        return await self._call("set_board", board_channel_id, message_id, guild_id=guild_id, channel_id=channel_id)
+
+    async def delete_board(self, board_channel_id: int, guild_id=None) -> bool:
+        """Kanalın pano kaydını siler."""
+        return await self._call("delete_board", board_channel_id, guild_id=guild_id)
+
+    def close(self):
+        """Açık bağlantıları kapatır."""
+        for loop, connection in list(self._connections.items()):
+            if not loop.is_closed():
+                connection.close()
+        self._connections.clear()
@@ -0,0 +1,121 @@
+from collections import OrderedDict, namedtuple
+
+MESSAGE_LIMIT = 2000
+MAX_DESCRIPTION_LENGTH = 300
+TASK_LIST_TITLE = "📋 **Görev Listesi:**\n"
+STATUS_TITLES = {
+    "all": TASK_LIST_TITLE,
+    "open": "📋 **Açık Görevler:**\n",
+    "done": "📋 **Tamamlanan Görevler:**\n",
+}
+SEARCH_RESULTS_TITLE = "🔎 **Arama sonuçları:**\n"
+BOARD_TITLE = "📌 **Görev Panosu** (açık görevler)\n"
+# Kiracı başına saklanacak en fazla hazır sayfa; fazlası en eski kullanılandan atılır.
+MAX_RENDERED_PAGES = 32
+# Saklanan satır ya da sayfa başına metnin dışındaki kabaca bellek yükü.
+RENDERED_OVERHEAD_BYTES = 120
+
+# `count` sayfaya yazılan görev sayısı, `last_id` son yazılan görevin ID'si,
+# `has_more` ise bu sayfadan sonra gösterilecek görev kalıp kalmadığıdır.
+RenderedPage = namedtuple("RenderedPage", "text count last_id has_more")
+# Sayfalı bir mesajın sayfası: `cursor` bu sayfayı, `next_cursor` sonrakini
+# getiren imleçtir; sonraki sayfa yoksa None'dır (bkz. views.PaginatedView).
+Page = namedtuple("Page", "text cursor next_cursor")
+
+def format_task_line(task):
+    """Bir görev satırını `id: açıklama ✅/❌` biçiminde yazar."""
+    task_id, description, completed = task
+    if len(description) > MAX_DESCRIPTION_LENGTH:
+        description = description[:MAX_DESCRIPTION_LENGTH - 1] + "…"
+    status_emoji = "✅" if completed else "❌"
+    return f"{task_id}: {description} {status_emoji}\n"
+
+def render_task_page(tasks, title=TASK_LIST_TITLE, limit=MESSAGE_LIMIT, format_line=format_task_line):
+    """
+    Görevleri mesaj sınırını aşmayacak şekilde tek bir sayfaya yazar.
+    `(metin, yazılan_görev_sayısı)` döner; sığmayan görevler bir sonraki sayfaya kalır.
+    """
+    parts = [title]
+    length = len(title)
+    count = 0
+    for task in tasks:
+        line = format_line(task)
+        if count and length + len(line) > limit:
+            break
+        parts.append(line)
+        length += len(line)
+        count += 1
+    return "".join(parts), count
+
+def render_page(tasks, page_size, format_line=format_task_line, title=TASK_LIST_TITLE):
+    """
+    İmleçten sonraki en fazla `page_size + 1` görevden bir RenderedPage üretir;
+    fazladan satır yalnızca sonraki sayfanın olup olmadığını anlamak içindir.
+    """
+    text, count = render_task_page(tasks[:page_size], title, format_line=format_line)
+    last_id = tasks[count - 1][0] if count else None
+    return RenderedPage(text, count, last_id, len(tasks) > count)
+
+def render_board(open_tasks, counts, limit=MESSAGE_LIMIT):
+    """
+    Sabitlenmiş pano mesajını yazar: sığdığı kadar açık görev ve altında
+    toplam/açık/tamamlanan sayıları. `counts` bir database.TaskCounts'tur.
+    """
+    footer = f"\nToplam: {counts.total} • ❌ Açık: {counts.open} • ✅ Tamamlanan: {counts.done}"
+    more_note_length = len(f"… ve {counts.open} açık görev daha\n")
+    text, shown = render_task_page(open_tasks, BOARD_TITLE, limit - len(footer) - more_note_length)
+    if not shown:
+        text += "Açık görev yok. 🎉\n"
+    elif counts.open > shown:
+        text += f"… ve {counts.open - shown} açık görev daha\n"
+    return text + footer
+
+class RenderedTaskList:
+    """
+    Bir kiracının biçimlenmiş görev satırlarını ve bu satırlardan kurulan
+    sayfaları saklar. Bir görev eklenince, tamamlanınca ya da silinince
+    yalnızca o satır ve onu kapsayan sayfalar yeniden üretilir; tekrarlanan
+    listelemeler hazır metni döner. En fazla `max_pages` sayfa tutulur;
+    `size` saklanan metnin yaklaşık bellek kullanımıdır (bayt).
+    """
+
+    def __init__(self, max_pages=MAX_RENDERED_PAGES):
+        self.max_pages = max_pages
+        self.size = 0
+        self._lines = {}
+        self._pages = OrderedDict()
+
+    def _line(self, task):
+        line = self._lines.get(task[0])
+        if line is None:
+            line = self._lines[task[0]] = format_task_line(task)
+            self.size += len(line) + RENDERED_OVERHEAD_BYTES
+        return line
+
+    def _drop_page(self, key):
+        self.size -= len(self._pages.pop(key).text) + RENDERED_OVERHEAD_BYTES
+
+    def page(self, after_id, page_size, tasks_after, title=TASK_LIST_TITLE):
+        """
+        `tasks_after(limit)` imleçten sonraki satırları verir; yalnızca sayfa
+        önbellekte yoksa çağrılır. Süzülmüş listeler kendi başlıklarıyla ayrı saklanır.
+        """
+        key = (after_id, page_size, title)
+        page = self._pages.get(key)
+        if page is not None:
+            self._pages.move_to_end(key)
+            return page
+        page = self._pages[key] = render_page(tasks_after(page_size + 1), page_size, self._line, title)
+        self.size += len(page.text) + RENDERED_OVERHEAD_BYTES
+        while len(self._pages) > self.max_pages:
+            self._drop_page(next(iter(self._pages)))
+        return page
+
+    def task_changed(self, task_id):
+        """Görevin satırını ve onu içeren (ya da içerebilecek) sayfaları atar."""
+        line = self._lines.pop(task_id, None)
+        if line is not None:
+            self.size -= len(line) + RENDERED_OVERHEAD_BYTES
+        for key, page in list(self._pages.items()):
+            if key[0] < task_id and (not page.has_more or task_id <= page.last_id):
+                self._drop_page(key)
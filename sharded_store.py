@@ -0,0 +1,203 @@
+import asyncio
+import os
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import database
+from metrics import REGISTRY
+from storage import DEFAULT_MAX_PENDING, DEFAULT_ACQUIRE_TIMEOUT, SqliteTaskStore
+
+DEFAULT_SHARD_DIR = "shards"
+DEFAULT_SHARD_MODE = "guild"
+DEFAULT_SHARD_BUCKETS = 16
+DEFAULT_MAX_OPEN_SHARDS = 64
+DEFAULT_SHARD_WORKERS = 8
+SHARD_MODES = ("guild", "hash")
+
+def shard_name(guild_id, mode=DEFAULT_SHARD_MODE, buckets=DEFAULT_SHARD_BUCKETS):
+    """
+    Sunucunun görevlerini tutan parça dosyasının adını (uzantısız) döner.
+    "guild" kipinde her sunucunun kendi dosyası vardır, DM görevleri
+    `guild_dm` dosyasında toplanır; "hash" kipinde sunucular `buckets` dosyaya
+    kararlı bir özetle (CRC32) dağıtılır.
+    """
+    if mode == "guild":
+        return "guild_dm" if guild_id is None else f"guild_{guild_id}"
+    if mode == "hash":
+        return f"shard_{zlib.crc32(str(guild_id).encode()) % buckets:03d}"
+    raise ValueError(f"Bilinmeyen parçalama kipi: {mode} (seçenekler: {', '.join(SHARD_MODES)})")
+
+def _prepare_shard(path, closing):
+    # Aynı dosyanın önceki kapanışı (havuz ve checkpoint thread'i) bitmeden yeniden açılmaz.
+    if closing is not None:
+        wait([closing])
+    applied = database.init_db(path)
+    if database.get_storage_profile().journal_mode == "WAL":
+        database.enable_checkpointer(path)
+    return applied
+
+class _Shard:
+    __slots__ = ("store", "ready", "active")
+
+    def __init__(self, store, ready):
+        self.store = store
+        # Şema göçlerini çalıştıran iş; parçayı kullanan herkes bunu bekler.
+        self.ready = ready
+        self.active = 0
+
+class ShardedTaskStore:
+    """
+    Görevleri `directory` altında sunucu başına (ya da özet kovası başına)
+    ayrı SQLite dosyalarında tutan TaskStore. Böylece farklı sunuculara yapılan
+    yazmalar aynı veritabanı kilidini beklemez ve büyük bir sunucu diğerlerini
+    yavaşlatmaz.
+
+    Açık parçalar (bağlantı havuzu ve dosya tanıtıcıları) en fazla
+    `max_open_shards` tane olacak şekilde LRU sırasıyla tutulur; sınır aşılınca
+    o anda kullanılmayan en eski parça kapatılır ve havuzu close_pool ile
+    bırakılır. Kapatma (WAL'da son bağlantı checkpoint yapar) thread havuzunda
+    yürür. Depolama profili WAL ise her açık parçanın kendi arka plan
+    checkpoint thread'i vardır. Tüm parçalar tek bir thread havuzunu paylaşır.
+    """
+
+    def __init__(self, directory=DEFAULT_SHARD_DIR, mode=DEFAULT_SHARD_MODE, buckets=DEFAULT_SHARD_BUCKETS,
+                 max_open_shards=DEFAULT_MAX_OPEN_SHARDS, max_workers=DEFAULT_SHARD_WORKERS,
+                 max_pending=DEFAULT_MAX_PENDING, acquire_timeout=DEFAULT_ACQUIRE_TIMEOUT):
+        if max_open_shards < 1:
+            raise ValueError("max_open_shards en az 1 olmalı.")
+        shard_name(None, mode, buckets)
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.mode = mode
+        self.buckets = buckets
+        self.max_open_shards = max_open_shards
+        self.max_pending = max_pending
+        self.acquire_timeout = acquire_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="task-shard")
+        self._shards = OrderedDict()
+        # Thread havuzunda kapanmakta olan parçalar: yol -> kapatma işi.
+        self._closing = {}
+
+    def shard_path(self, guild_id):
+        """Sunucunun parça dosyasının yolunu döner."""
+        return os.path.join(self.directory, shard_name(guild_id, self.mode, self.buckets) + ".db")
+
+    def open_shards(self):
+        """Açık parça dosyalarını en eskiden en yeniye kullanım sırasıyla döner."""
+        return list(self._shards)
+
+    def _open(self, guild_id):
+        path = self.shard_path(guild_id)
+        shard = self._shards.get(path)
+        if shard is not None and shard.ready.done() and shard.ready.exception() is not None:
+            # Göç başarısız olduysa bir sonraki çağrı yeniden denesin.
+            self._close_shard(path)
+            shard = None
+        if shard is None:
+            store = SqliteTaskStore(db_name=path, max_pending=self.max_pending,
+                                    acquire_timeout=self.acquire_timeout, executor=self._executor)
+            ready = self._executor.submit(_prepare_shard, path, self._closing.pop(path, None))
+            shard = self._shards[path] = _Shard(store, ready)
+            REGISTRY.increment("task_shard_opens_total")
+        self._shards.move_to_end(path)
+        return shard
+
+    def _close_shard(self, path):
+        # Olay döngüsünde dosya G/Ç'si yapılmasın; aynı parça yeniden açılırsa bu iş beklenir.
+        self._closing = {other: future for other, future in self._closing.items() if not future.done()}
+        self._closing[path] = self._executor.submit(self._shards.pop(path).store.close)
+
+    def _evict(self):
+        # Üzerinde iş süren parça kapatılmaz; sınır o işler bitene kadar aşılabilir.
+        for path in [path for path, shard in self._shards.items() if not shard.active]:
+            if len(self._shards) <= self.max_open_shards:
+                break
+            self._close_shard(path)
+            REGISTRY.increment("task_shard_evictions_total")
+
+    async def _call(self, method, *args, guild_id=None, **kwargs):
+        shard = self._open(guild_id)
+        shard.active += 1
+        try:
+            await asyncio.wrap_future(shard.ready)
+            return await getattr(shard.store, method)(*args, guild_id=guild_id, **kwargs)
+        finally:
+            shard.active -= 1
+            self._evict()
+
+    async def init(self):
+        """Parçalar ilk kullanıldıklarında hazırlanır; burada yapılacak iş yoktur."""
+        return []
+
+    async def add_task(self, description: str, guild_id=None, channel_id=None):
+        """Yeni bir görev ekler ve ID'sini döner."""
+        return await self._call("add_task", description, guild_id=guild_id, channel_id=channel_id)
+
+    async def add_tasks(self, descriptions, guild_id=None, channel_id=None, completed=None):
+        """Birden fazla görevi tek işlemde ekler ve ID'lerini döner."""
+        return await self._call("add_tasks", list(descriptions), guild_id=guild_id, channel_id=channel_id,
+                                completed=completed)
+
+    async def get_tasks(self, guild_id=None, channel_id=None, status="all"):
+        """Kapsamdaki görevleri (`status`: "all", "open" veya "done") döner."""
+        return await self._call("get_tasks", guild_id=guild_id, channel_id=channel_id, status=status)
+
+    async def get_tasks_page(self, after_id: int = 0, limit: int = database.DEFAULT_PAGE_SIZE,
+                             guild_id=None, channel_id=None, status="all"):
+        """ID'si `after_id`'den büyük en fazla `limit` görevi döner."""
+        return await self._call("get_tasks_page", after_id, limit,
+                                guild_id=guild_id, channel_id=channel_id, status=status)
+
+    async def render_tasks_page(self, after_id: int = 0, page_size: int = database.DEFAULT_PAGE_SIZE,
+                                guild_id=None, channel_id=None, status="all"):
+        """`after_id`'den sonraki görev sayfasını yazılmış halde (RenderedPage) döner."""
+        return await self._call("render_tasks_page", after_id, page_size,
+                                guild_id=guild_id, channel_id=channel_id, status=status)
+
+    async def search_tasks(self, query: str, offset: int = 0, limit: int = database.DEFAULT_PAGE_SIZE,
+                           guild_id=None, channel_id=None):
+        """Sorguyla eşleşen görevleri alaka sırasıyla döner."""
+        return await self._call("search_tasks", query, offset, limit, guild_id=guild_id, channel_id=channel_id)
+
+    async def get_task_counts(self, guild_id=None, channel_id=None):
+        """Kapsamdaki görev sayılarını (TaskCounts) döner."""
+        return await self._call("get_task_counts", guild_id=guild_id, channel_id=channel_id)
+
+    async def get_task_by_id(self, task_id: int, guild_id=None, channel_id=None):
+        """Belirli bir ID'ye sahip görevi döner."""
+        return await self._call("get_task_by_id", task_id, guild_id=guild_id, channel_id=channel_id)
+
+    async def delete_task(self, task_id: int, guild_id=None, channel_id=None) -> bool:
+        """Görevi siler. Başarılıysa True döner."""
+        return await self._call("delete_task", task_id, guild_id=guild_id, channel_id=channel_id)
+
+    async def complete_task(self, task_id: int, guild_id=None, channel_id=None):
+        """Görevi tamamlar ve TaskOutcome döner."""
+        return await self._call("complete_task", task_id, guild_id=guild_id, channel_id=channel_id)
+
+    async def delete_tasks(self, task_ids, guild_id=None, channel_id=None):
+        """Görevleri tek işlemde siler ve BatchResult döner."""
+        return await self._call("delete_tasks", list(task_ids), guild_id=guild_id, channel_id=channel_id)
+
+    async def complete_tasks(self, task_ids, guild_id=None, channel_id=None):
+        """Görevleri tek işlemde tamamlar ve BatchResult döner."""
+        return await self._call("complete_tasks", list(task_ids), guild_id=guild_id, channel_id=channel_id)
+
+    async def get_boards(self, guild_id=None, channel_id=None):
+        """Kapsamı gösteren görev panolarını `(kanal_id, mesaj_id)` olarak döner."""
+        return await self._call("get_boards", guild_id=guild_id, channel_id=channel_id)
+
+    async def set_board(self, board_channel_id: int, message_id: int, guild_id=None, channel_id=None):
+        """Kanalın pano mesajını kaydeder ve önceki mesajın ID'sini döner."""
+        return await self._call("set_board", board_channel_id, message_id, guild_id=guild_id, channel_id=channel_id)
+
+    async def delete_board(self, board_channel_id: int, guild_id=None) -> bool:
+        """Kanalın pano kaydını, sunucunun parçasından siler."""
+        return await self._call("delete_board", board_channel_id, guild_id=guild_id)
+
+    def close(self):
+        """Tüm parçaları kapatır ve thread havuzunu durdurur."""
+        for path in list(self._shards):
+            self._shards.pop(path).store.close()
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,340 @@
+import asyncio
+import functools
+import os
+import weakref
+from typing import Protocol, runtime_checkable
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+import database
+from dbconfig import load_profile
+from metrics import REGISTRY
+
+DEFAULT_MAX_WORKERS = database.DEFAULT_POOL_SIZE
+DEFAULT_MAX_PENDING = 64
+DEFAULT_ACQUIRE_TIMEOUT = 5.0
+
+class StoreBusyError(RuntimeError):
+    """Bekleyen veritabanı işi sınırı aşıldığında fırlatılır."""
+
+def single_flight(method):
+    """
+    Aynı argümanlarla eşzamanlı çağrılan async okuma metotlarını birleştirir:
+    bir çağrı sürerken gelen özdeş çağrılar yeni sorgu başlatmaz, aynı sonucu
+    (ya da aynı hatayı) bekler. Sonuç paylaşıldığı için çağıranlar onu
+    değiştirmemelidir. Anahtar, nesnenin `generation` değerini de içerir; yazma
+    yapan metotlar bu değeri artırarak bir yazmadan sonra başlayan okumaların,
+    yazmadan önce başlamış bir sorguya katılmamasını sağlar.
+    """
+    # Future'lar bir olay döngüsüne bağlıdır; her döngünün kendi tablosu vardır.
+    in_flight = weakref.WeakKeyDictionary()
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        calls = in_flight.get(loop)
+        if calls is None:
+            calls = in_flight[loop] = {}
+        key = (self, getattr(self, "generation", None), args, tuple(sorted(kwargs.items())))
+        future = calls.get(key)
+        if future is None:
+            future = calls[key] = asyncio.ensure_future(method(self, *args, **kwargs))
+            future.add_done_callback(functools.partial(_forget_call, calls, key))
+        else:
+            REGISTRY.increment("store_coalesced_reads_total", method=method.__name__)
+        # Bekleyenlerden biri iptal edilirse ortak sorgu diğerleri için sürmeli.
+        return await asyncio.shield(future)
+
+    return wrapper
+
+def _forget_call(calls, key, future):
+    if calls.get(key) is future:
+        del calls[key]
+    # Tüm bekleyenler iptal edildiyse hata yine de okunmuş sayılsın.
+    if not future.cancelled():
+        future.exception()
+
+@runtime_checkable
+class TaskStore(Protocol):
+    """
+    Botun görev deposundan beklediği arayüz. Kapsam her çağrıda
+    `guild_id`/`channel_id` ile verilir; `channel_id` None ise sunucunun tüm
+    görevleri kastedilir. Arka uçlar: SqliteTaskStore (kalıcı, varsayılan),
+    memory_store.MemoryTaskStore (yalnızca bellek),
+    eventlog_store.EventLogTaskStore (olay günlüğü) ve
+    sharded_store.ShardedTaskStore (sunucu başına SQLite dosyası).
+    """
+
+    async def init(self): ...
+    async def add_task(self, description, guild_id=None, channel_id=None): ...
+    async def add_tasks(self, descriptions, guild_id=None, channel_id=None, completed=None): ...
+    async def get_tasks(self, guild_id=None, channel_id=None, status="all"): ...
+    async def get_tasks_page(self, after_id=0, limit=database.DEFAULT_PAGE_SIZE,
+                             guild_id=None, channel_id=None, status="all"): ...
+    async def render_tasks_page(self, after_id=0, page_size=database.DEFAULT_PAGE_SIZE,
+                                guild_id=None, channel_id=None, status="all"): ...
+    async def search_tasks(self, query, offset=0, limit=database.DEFAULT_PAGE_SIZE,
+                           guild_id=None, channel_id=None): ...
+    async def get_task_counts(self, guild_id=None, channel_id=None): ...
+    async def get_task_by_id(self, task_id, guild_id=None, channel_id=None): ...
+    async def delete_task(self, task_id, guild_id=None, channel_id=None): ...
+    async def complete_task(self, task_id, guild_id=None, channel_id=None): ...
+    async def delete_tasks(self, task_ids, guild_id=None, channel_id=None): ...
+    async def complete_tasks(self, task_ids, guild_id=None, channel_id=None): ...
+    async def get_boards(self, guild_id=None, channel_id=None): ...
+    async def set_board(self, board_channel_id, message_id, guild_id=None, channel_id=None): ...
+    async def delete_board(self, board_channel_id, guild_id=None): ...
+    def close(self): ...
+
+class SqliteTaskStore:
+    """
+    database.py fonksiyonlarının awaitable karşılıkları.
+    Her çağrı ayrı bir thread havuzunda çalışır, böylece SQLite G/Ç'si ve fsync
+    Discord olay döngüsünü bloklamaz. Aynı anda bekleyebilecek iş sayısı
+    `max_pending` ile sınırlıdır; sınır `acquire_timeout` süresince
+    boşalmazsa StoreBusyError fırlatılır.
+    """
+
+    def __init__(self, db_name=None, max_workers=DEFAULT_MAX_WORKERS,
+                 max_pending=DEFAULT_MAX_PENDING, acquire_timeout=DEFAULT_ACQUIRE_TIMEOUT, executor=None):
+        self.db_name = db_name
+        self.max_pending = max_pending
+        self.acquire_timeout = acquire_timeout
+        self._max_workers = max_workers
+        # Dışarıdan verilen thread havuzu paylaşılır; close() onu durdurmaz.
+        self._executor = executor
+        self._owns_executor = executor is None
+        # Her yazmadan sonra artar; bkz. single_flight.
+        self.generation = 0
+        # asyncio.Semaphore bir olay döngüsüne bağlanır; her döngüye ayrı sınırlayıcı.
+        self._limiters = weakref.WeakKeyDictionary()
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="task-store"
+            )
+        return self._executor
+
+    def _get_limiter(self, loop):
+        limiter = self._limiters.get(loop)
+        if limiter is None:
+            limiter = self._limiters[loop] = asyncio.Semaphore(self.max_pending)
+        return limiter
+
+    @asynccontextmanager
+    async def _slot(self):
+        limiter = self._get_limiter(asyncio.get_running_loop())
+        try:
+            await asyncio.wait_for(limiter.acquire(), self.acquire_timeout)
+        except asyncio.TimeoutError:
+            raise StoreBusyError("Veritabanı kuyruğu dolu.") from None
+        try:
+            yield
+        finally:
+            limiter.release()
+
+    async def _run(self, func, *args, **kwargs):
+        async with self._slot():
+            call = functools.partial(func, *args, db_name=self.db_name, **kwargs)
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), call)
+
+    async def _write(self, operation, *args):
+        try:
+            # Grup commit modunda yazıcının Future'ı doğrudan beklenir; böylece
+            # bekleyen yazmalar executor thread'lerini işgal etmez ve toplanabilir.
+            if database.get_write_coordinator(self.db_name) is None:
+                return await self._run(database.run_write, operation, *args)
+            async with self._slot():
+                future = database.submit_write(operation, *args, db_name=self.db_name)
+                return await asyncio.wrap_future(future)
+        finally:
+            self.generation += 1
+
+    async def init(self):
+        """Veritabanını hazırlar."""
+        return await self._run(database.init_db)
+
+    async def add_task(self, description: str, guild_id=None, channel_id=None):
+        """Yeni bir görev ekler ve ID'sini döner."""
+        return await self._write("add_task", description, guild_id, channel_id)
+
+    async def add_tasks(self, descriptions, guild_id=None, channel_id=None, completed=None):
+        """
+        Birden fazla görevi tek işlemde ekler ve ID'lerini döner. `completed`
+        bayrakları verilirse tamamlanmış görevler aynı işlemde işaretlenir.
+        """
+        return await self._write("add_tasks", list(descriptions), guild_id, channel_id,
+                                 list(completed) if completed is not None else None)
+
+    @single_flight
+    async def get_tasks(self, guild_id=None, channel_id=None, status="all"):
+        """Kapsamdaki görevleri (`status`: "all", "open" veya "done") döner."""
+        return await self._run(database.get_tasks_db, guild_id=guild_id, channel_id=channel_id, status=status)
+
+    @single_flight
+    async def get_tasks_page(self, after_id: int = 0, limit: int = database.DEFAULT_PAGE_SIZE,
+                             guild_id=None, channel_id=None, status="all"):
+        """ID'si `after_id`'den büyük en fazla `limit` görevi döner."""
+        return await self._run(database.get_tasks_page_db, after_id, limit,
+                               guild_id=guild_id, channel_id=channel_id, status=status)
+
+    @single_flight
+    async def render_tasks_page(self, after_id: int = 0, page_size: int = database.DEFAULT_PAGE_SIZE,
+                                guild_id=None, channel_id=None, status="all"):
+        """`after_id`'den sonraki görev sayfasını yazılmış halde (RenderedPage) döner."""
+        return await self._run(database.render_tasks_page_db, after_id, page_size,
+                               guild_id=guild_id, channel_id=channel_id, status=status)
+
+    @single_flight
+    async def search_tasks(self, query: str, offset: int = 0, limit: int = database.DEFAULT_PAGE_SIZE,
+                           guild_id=None, channel_id=None):
+        """Sorguyla eşleşen görevleri alaka sırasıyla döner."""
+        return await self._run(database.search_tasks_db, query, offset, limit,
+                               guild_id=guild_id, channel_id=channel_id)
+
+    @single_flight
+    async def get_task_counts(self, guild_id=None, channel_id=None):
+        """Kapsamdaki görev sayılarını (TaskCounts) döner."""
+        return await self._run(database.get_task_counts_db, guild_id=guild_id, channel_id=channel_id)
+
+    @single_flight
+    async def get_task_by_id(self, task_id: int, guild_id=None, channel_id=None):
+        """Belirli bir ID'ye sahip görevi döner."""
+        return await self._run(database.get_task_by_id_db, task_id, guild_id=guild_id, channel_id=channel_id)
+
+    async def delete_task(self, task_id: int, guild_id=None, channel_id=None) -> bool:
+        """Görevi siler. Başarılıysa True döner."""
+        return await self._write("delete_task", task_id, guild_id, channel_id)
+
+    async def complete_task(self, task_id: int, guild_id=None, channel_id=None):
+        """Görevi tek bir koşullu UPDATE ile tamamlar ve TaskOutcome döner."""
+        return await self._write("complete_task", task_id, guild_id, channel_id)
+
+    async def delete_tasks(self, task_ids, guild_id=None, channel_id=None):
+        """Görevleri tek işlemde siler ve BatchResult döner."""
+        return await self._write("delete_tasks", list(task_ids), guild_id, channel_id)
+
+    async def complete_tasks(self, task_ids, guild_id=None, channel_id=None):
+        """Görevleri tek işlemde tamamlar ve BatchResult döner."""
+        return await self._write("complete_tasks", list(task_ids), guild_id, channel_id)
+
+    @single_flight
+    async def get_boards(self, guild_id=None, channel_id=None):
+        """Kapsamı gösteren görev panolarını `(kanal_id, mesaj_id)` olarak döner."""
+        return await self._run(database.get_boards_db, guild_id=guild_id, channel_id=channel_id)
+
+    async def set_board(self, board_channel_id: int, message_id: int, guild_id=None, channel_id=None):
+        """Kanalın pano mesajını kaydeder ve önceki mesajın ID'sini döner."""
+        return await self._write("set_board", board_channel_id, message_id, guild_id, channel_id)
+
+    async def delete_board(self, board_channel_id: int, guild_id=None) -> bool:
+        """Kanalın pano kaydını siler. `guild_id` yalnızca parçalı depoda yönlendirme içindir."""
+        return await self._write("delete_board", board_channel_id)
+
+    def close(self):
+        """Thread havuzunu durdurur ve veritabanı bağlantılarını kapatır."""
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        database.disable_write_coordinator(self.db_name)
+        database.disable_checkpointer(self.db_name)
+        database.close_pool(self.db_name)
+
+# Eski ad; mevcut içe aktarmalar çalışmaya devam etsin.
+AsyncTaskStore = SqliteTaskStore
+
+STORE_KINDS = ("sqlite", "memory", "eventlog", "sharded", "remote")
+DEFAULT_SOCKET_PATH = "task-storage.sock"
+
+def create_store(kind="sqlite", **options) -> TaskStore:
+    """
+    `kind` (STORE_KINDS'tan biri) türünde bir görev deposu oluşturur;
+    `options` deponun kurucusuna iletilir. Bilinmeyen türde ValueError fırlatır.
+    """
+    if kind == "sqlite":
+        return SqliteTaskStore(**options)
+    if kind == "memory":
+        from memory_store import MemoryTaskStore
+        return MemoryTaskStore(**options)
+    if kind == "eventlog":
+        from eventlog_store import EventLogTaskStore
+        return EventLogTaskStore(**options)
+    if kind == "sharded":
+        from sharded_store import ShardedTaskStore
+        return ShardedTaskStore(**options)
+    if kind == "remote":
+        from remote_store import RemoteTaskStore
+        return RemoteTaskStore(**options)
+    raise ValueError(f"Bilinmeyen görev deposu: {kind} (seçenekler: {', '.join(STORE_KINDS)})")
+
+def store_options(kind, environ=os.environ):
+    """`kind` türündeki deponun kurucu seçeneklerini TASK_* ortam değişkenlerinden üretir."""
+    if kind == "eventlog":
+        return {"directory": environ.get("TASK_EVENTLOG_DIR", "eventlog")}
+    if kind == "sharded":
+        return {
+            "directory": environ.get("TASK_SHARD_DIR", "shards"),
+            "mode": environ.get("TASK_SHARD_MODE", "guild"),
+            "buckets": int(environ.get("TASK_SHARD_BUCKETS", "16")),
+            "max_open_shards": int(environ.get("TASK_MAX_OPEN_SHARDS", "64")),
+        }
+    if kind == "remote":
+        return {"path": environ.get("TASK_STORAGE_SOCKET", DEFAULT_SOCKET_PATH)}
+    return {}
+
+def prepare_store(kind, environ=os.environ, options=None):
+    """
+    Süreç başında bir kez, deponun kalıcı kaynaklarını hazırlar: SQLite için
+    depolama profili, şema göçleri, (TASK_LEGACY_GUILD_ID verilmişse) eski
+    kapsamsız görevlerin sunucuya taşınması, arka plan checkpoint'i ve
+    (TASK_GROUP_COMMIT=1 ise) grup commit yazıcısı. `options` deponun
+    kurucu seçenekleridir (bkz. create_store); verilmezse store_options ile
+    ortamdan okunur. Kullanıcıya gösterilecek bir açıklama döner.
+    """
+    options = store_options(kind, environ) if options is None else options
+    if kind == "sqlite":
+        db_name = options.get("db_name")
+        profile = load_profile(environ=environ)
+        database.configure_storage(profile)
+        # on_ready her yeniden bağlanmada tekrar çalışır; şema yalnızca süreç başında güncellenir.
+        database.init_db(db_name)
+        status = "Veritabanı hazır."
+        legacy_guild_id = environ.get("TASK_LEGACY_GUILD_ID")
+        if legacy_guild_id:
+            legacy_channel_id = environ.get("TASK_LEGACY_CHANNEL_ID")
+            adopted = database.adopt_legacy_tasks_db(
+                int(legacy_guild_id), int(legacy_channel_id) if legacy_channel_id else None, db_name=db_name)
+            if adopted:
+                status += f" Kapsamsız {adopted} eski görev {legacy_guild_id} sunucusuna taşındı."
+        if profile.journal_mode == "WAL":
+            database.enable_checkpointer(db_name)
+        if environ.get("TASK_GROUP_COMMIT") == "1":
+            database.enable_write_coordinator(
+                db_name,
+                max_batch_size=int(environ.get("TASK_WRITE_BATCH_SIZE", database.DEFAULT_MAX_BATCH_SIZE)),
+                max_latency=float(environ.get("TASK_WRITE_MAX_LATENCY_MS", database.DEFAULT_MAX_LATENCY * 1000)) / 1000,
+            )
+        return status
+    if kind == "sharded":
+        # Parçalar ilk kullanımda göç edilir ve (WAL'da) checkpoint thread'i alır; profil tüm parçalara uygulanır.
+        database.configure_storage(load_profile(environ=environ))
+        return f"Görev deposu: {options['directory']} altında parçalı SQLite."
+    if kind == "memory":
+        return "Görev deposu: bellek (veriler kalıcı değildir)."
+    if kind == "remote":
+        return f"Görev deposu: {options['path']} üzerindeki depolama servisi."
+    return f"Görev deposu: {kind}."
+
+def options_of(store, options=None):
+    """
+    `options` (deponun ayardaki kurucu seçenekleri) üzerine deponun gerçekte
+    kullandığı dosya ve dizin yollarını (db_name, directory, path) yazarak döner.
+    Dışarıdan verilen bir deponun ayardan farklı dosyası böylece hazırlanır.
+    """
+    options = dict(options or {})
+    for name in ("db_name", "directory", "path"):
+        value = vars(store).get(name)
+        if value is not None:
+            options[name] = value
+    return options
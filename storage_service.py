@@ -0,0 +1,175 @@
+"""
+Birden fazla bot sürecinin tek bir görev deposunu paylaşması için yerel
+depolama servisi. Servis, deponun (varsayılan SQLite) tek sahibidir; bot
+süreçleri Unix soketi üzerinden RemoteTaskStore ile bağlanır.
+
+    python storage_service.py --socket task-storage.sock
+
+Protokol: her çerçeve 4 bayt (big-endian) uzunluk + UTF-8 JSON'dur. İstemci
+çerçevesi çağrı listesidir: `[[id, metot, [argümanlar], {anahtar argümanlar}], ...]`;
+servis çerçevesi yanıt listesidir: `[[id, true, değer], [id, false, [hata türü, mesaj]], ...]`.
+Aynı olay döngüsü turunda biriken çağrılar ve yanıtlar tek çerçevede gönderilir.
+"""
+import argparse
+import asyncio
+import enum
+import functools
+import json
+import os
+import signal
+import struct
+import sys
+
+from metrics import REGISTRY
+from storage import DEFAULT_SOCKET_PATH, STORE_KINDS, create_store, prepare_store, store_options
+
+FRAME_HEADER = struct.Struct("!I")
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+# Servisin dışarıya açtığı TaskStore metotları.
+REMOTE_METHODS = frozenset({
+    "add_task", "add_tasks", "get_tasks", "get_tasks_page", "render_tasks_page", "search_tasks",
+    "get_task_counts", "get_task_by_id", "delete_task", "complete_task", "delete_tasks",
+    "complete_tasks", "get_boards", "set_board", "delete_board",
+})
+
+class FrameTooLargeError(ValueError):
+    """Çerçeve MAX_FRAME_SIZE sınırını aştığında fırlatılır."""
+
+def _default(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"JSON'a çevrilemeyen değer: {type(value).__name__}")
+
+def encode_frame(message):
+    """Mesajı uzunluk önekli bir çerçeveye çevirir."""
+    payload = json.dumps(message, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+    if len(payload) > MAX_FRAME_SIZE:
+        raise FrameTooLargeError(f"Çerçeve çok büyük: {len(payload)} bayt")
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+async def read_frame(reader):
+    """Akıştan bir çerçeve okur; bağlantı kapandıysa asyncio.IncompleteReadError fırlatır."""
+    (length,) = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    if length > MAX_FRAME_SIZE:
+        raise FrameTooLargeError(f"Çerçeve çok büyük: {length} bayt")
+    return json.loads(await reader.readexactly(length))
+
+class FrameOutbox:
+    """Aynı olay döngüsü turunda biriken mesajları tek çerçevede yazar."""
+
+    def __init__(self, writer):
+        self._writer = writer
+        self._messages = []
+
+    def put(self, message):
+        self._messages.append(message)
+        if len(self._messages) == 1:
+            asyncio.get_running_loop().call_soon(self.flush)
+
+    def flush(self):
+        messages, self._messages = self._messages, []
+        if messages and not self._writer.is_closing():
+            self._writer.write(encode_frame(messages))
+
+class StorageService:
+    """
+    Bir TaskStore'u Unix soketi üzerinden sunar. Her çağrı ayrı bir görev
+    olarak çalışır; yavaş bir yazma aynı çerçevedeki okumaları bekletmez.
+    Yazmalar tek süreçte toplandığı için SQLite'ın tek bir yazıcısı olur.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.path = None
+        self._server = None
+        self._writers = set()
+
+    async def start(self, path=DEFAULT_SOCKET_PATH):
+        """Soketi açar; eski bir soket dosyası varsa siler. Dosya yalnızca sahibine açıktır."""
+        if os.path.exists(path):
+            os.remove(path)
+        self.path = path
+        self._server = await asyncio.start_unix_server(self._handle, path)
+        os.chmod(path, 0o600)
+
+    async def close(self):
+        """Bağlantıları kapatır ve soket dosyasını siler."""
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+    async def _handle(self, reader, writer):
+        outbox = FrameOutbox(writer)
+        calls = set()
+        self._writers.add(writer)
+        try:
+            while True:
+                try:
+                    batch = await read_frame(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                REGISTRY.increment("storage_service_frames_total")
+                REGISTRY.increment("storage_service_calls_total", len(batch))
+                for call_id, method, args, kwargs in batch:
+                    call = asyncio.ensure_future(self._execute(method, args, kwargs))
+                    calls.add(call)
+                    call.add_done_callback(calls.discard)
+                    call.add_done_callback(functools.partial(_reply, outbox, call_id))
+        finally:
+            for call in calls:
+                call.cancel()
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _execute(self, method, args, kwargs):
+        if method not in REMOTE_METHODS:
+            raise ValueError(f"Bilinmeyen metot: {method}")
+        return await getattr(self.store, method)(*args, **kwargs)
+
+def _reply(outbox, call_id, call):
+    if call.cancelled():
+        return
+    error = call.exception()
+    if error is None:
+        outbox.put([call_id, True, call.result()])
+    else:
+        outbox.put([call_id, False, [type(error).__name__, str(error)]])
+
+async def serve(path, store):
+    """Servisi SIGINT/SIGTERM gelene kadar çalıştırır."""
+    service = StorageService(store)
+    await service.start(path)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+    print(f"Depolama servisi {path} üzerinde hazır.", flush=True)
+    try:
+        await stop.wait()
+    finally:
+        await service.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Görev botu yerel depolama servisi")
+    parser.add_argument("--socket", default=os.getenv("TASK_STORAGE_SOCKET", DEFAULT_SOCKET_PATH),
+                        help="Dinlenecek Unix soketi.")
+    parser.add_argument("--store", default=os.getenv("TASK_SERVICE_STORE", "sqlite"),
+                        choices=[kind for kind in STORE_KINDS if kind != "remote"],
+                        help="Servisin kullanacağı görev deposu.")
+    args = parser.parse_args(argv)
+
+    print(prepare_store(args.store), flush=True)
+    store = create_store(args.store, **store_options(args.store))
+    try:
+        asyncio.run(serve(args.socket, store))
+    finally:
+        store.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,7 +3,7 @@ import os
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from database import init_db, add_task_db, get_tasks_db, clear_tasks_table
+from database import init_db, add_task_db, add_tasks_db, get_tasks_db, clear_tasks_table, close_pool
 
 class TestAddTask(unittest.TestCase):
     TEST_DB_NAME = "test_add_tasks.db"
@@ -16,6 +16,7 @@ class TestAddTask(unittest.TestCase):
 
     @classmethod
     def tearDownClass(cls):
+        close_pool(cls.TEST_DB_NAME)
         if os.path.exists(cls.TEST_DB_NAME):
             os.remove(cls.TEST_DB_NAME)
 
@@ -111,6 +112,26 @@ class TestAddTask(unittest.TestCase):
         tasks = get_tasks_db(db_name=self.TEST_DB_NAME)
         self.assertEqual(tasks[0][1], multiline_desc)
 
+    def test_add_tasks_bulk(self):
+        descriptions = [f"Bulk task {i}" for i in range(100)]
+        task_ids = add_tasks_db(descriptions, db_name=self.TEST_DB_NAME)
+        
+        self.assertEqual(task_ids, list(range(1, 101)))
+        tasks = get_tasks_db(db_name=self.TEST_DB_NAME)
+        self.assertEqual([task[1] for task in tasks], descriptions)
+
+    def test_add_tasks_bulk_after_single_adds(self):
+        add_task_db("Single", db_name=self.TEST_DB_NAME)
+        task_ids = add_tasks_db(["Bulk 1", "Bulk 2"], db_name=self.TEST_DB_NAME)
+        
+        self.assertEqual(task_ids, [2, 3])
+        tasks = get_tasks_db(db_name=self.TEST_DB_NAME)
+        self.assertEqual([(task[0], task[1]) for task in tasks[1:]], [(2, "Bulk 1"), (3, "Bulk 2")])
+
+    def test_add_tasks_bulk_empty(self):
+        self.assertEqual(add_tasks_db([], db_name=self.TEST_DB_NAME), [])
+        self.assertEqual(get_tasks_db(db_name=self.TEST_DB_NAME), [])
+
     def test_add_and_show_tasks_with_print(self):
         print("Testing get_all_tasks() function.")
         print("Database connection is initialized.")
@@ -0,0 +1,168 @@
+import unittest
+import os
+import sys
+import asyncio
+import threading
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import init_db, clear_tasks_table, close_pool
+from unittest.mock import patch
+from storage import AsyncTaskStore, StoreBusyError, single_flight
+
+class TestAsyncTaskStore(unittest.TestCase):
+    TEST_DB_NAME = "test_async_store.db"
+
+    @classmethod
+    def setUpClass(cls):
+        if os.path.exists(cls.TEST_DB_NAME):
+            os.remove(cls.TEST_DB_NAME)
+        init_db(db_name=cls.TEST_DB_NAME)
+
+    @classmethod
+    def tearDownClass(cls):
+        close_pool(cls.TEST_DB_NAME)
+        if os.path.exists(cls.TEST_DB_NAME):
+            os.remove(cls.TEST_DB_NAME)
+
+    def setUp(self):
+        clear_tasks_table(db_name=self.TEST_DB_NAME)
+        self.store = AsyncTaskStore(db_name=self.TEST_DB_NAME)
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_add_and_get_tasks(self):
+        async def scenario():
+            task_id = await self.store.add_task("Async task")
+            return task_id, await self.store.get_tasks()
+
+        task_id, tasks = asyncio.run(scenario())
+        self.assertEqual(tasks, [(task_id, "Async task", 0)])
+
+    def test_complete_and_delete_task(self):
+        async def scenario():
+            task_id = await self.store.add_task("Async task")
+            completed = await self.store.complete_task(task_id)
+            task = await self.store.get_task_by_id(task_id)
+            deleted = await self.store.delete_task(task_id)
+            return completed, task, deleted
+
+        completed, task, deleted = asyncio.run(scenario())
+        self.assertTrue(completed)
+        self.assertEqual(task[2], 1)
+        self.assertTrue(deleted)
+
+    def test_database_work_runs_off_the_event_loop(self):
+        loop_thread = threading.get_ident()
+        seen = []
+
+        def record(db_name=None):
+            seen.append(threading.get_ident())
+
+        async def scenario():
+            await self.store._run(record)
+
+        asyncio.run(scenario())
+        self.assertNotEqual(seen, [loop_thread])
+
+    def test_concurrent_adds(self):
+        async def scenario():
+            await asyncio.gather(*(self.store.add_task(f"Task {i}") for i in range(50)))
+            return await self.store.get_tasks()
+
+        self.assertEqual(len(asyncio.run(scenario())), 50)
+
+    def test_backpressure_raises_when_queue_is_full(self):
+        store = AsyncTaskStore(db_name=self.TEST_DB_NAME, max_pending=1, acquire_timeout=0.05)
+        release = threading.Event()
+
+        def blocking(db_name=None):
+            release.wait(1)
+
+        async def scenario():
+            first = asyncio.ensure_future(store._run(blocking))
+            await asyncio.sleep(0.01)
+            try:
+                with self.assertRaises(StoreBusyError):
+                    await store._run(blocking)
+            finally:
+                release.set()
+                await first
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            store.close()
+
+class TestSingleFlight(unittest.TestCase):
+    def test_identical_concurrent_reads_share_one_query(self):
+        store = AsyncTaskStore(db_name="unused.db")
+        calls = []
+
+        def slow_read(after_id, limit, db_name=None, guild_id=None, channel_id=None, status="all"):
+            calls.append((after_id, guild_id, status))
+            threading.Event().wait(0.05)
+            return [(1, "Task", 0)]
+
+        async def scenario():
+            same = [store.get_tasks_page(0, 21, guild_id=1) for _ in range(10)]
+            other = [store.get_tasks_page(0, 21, guild_id=2), store.get_tasks_page(0, 21, guild_id=1, status="open")]
+            return await asyncio.gather(*same, *other)
+
+        try:
+            with patch("database.get_tasks_page_db", side_effect=slow_read):
+                results = asyncio.run(scenario())
+        finally:
+            store.close()
+        self.assertEqual(sorted(calls), [(0, 1, "all"), (0, 1, "open"), (0, 2, "all")])
+        self.assertTrue(all(result is results[0] for result in results[:10]))
+
+    def test_reads_after_a_write_do_not_join_older_queries(self):
+        class Source:
+            generation = 0
+            queries = 0
+
+            @single_flight
+            async def read(self):
+                self.queries += 1
+                query = self.queries
+                await asyncio.sleep(0.02)
+                return query
+
+        source = Source()
+
+        async def scenario():
+            first = asyncio.ensure_future(source.read())
+            await asyncio.sleep(0)
+            source.generation += 1
+            second = await source.read()
+            return await first, second
+
+        self.assertEqual(asyncio.run(scenario()), (1, 2))
+
+    def test_errors_and_cancellation(self):
+        class Source:
+            @single_flight
+            async def read(self, fail):
+                await asyncio.sleep(0.02)
+                if fail:
+                    raise ValueError("boom")
+                return "ok"
+
+        source = Source()
+
+        async def scenario():
+            failures = await asyncio.gather(source.read(True), source.read(True), return_exceptions=True)
+            cancelled = asyncio.ensure_future(source.read(False))
+            survivor = asyncio.ensure_future(source.read(False))
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            return failures, await survivor, cancelled
+
+        failures, result, cancelled = asyncio.run(scenario())
+        self.assertTrue(all(isinstance(error, ValueError) for error in failures))
+        self.assertEqual(result, "ok")
+        self.assertTrue(cancelled.cancelled())
+
+if __name__ == '__main__':
+    unittest.main()
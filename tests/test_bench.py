@@ -0,0 +1,38 @@
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bench.run import percentile, compare, run
+
+class TestBench(unittest.TestCase):
+    def test_percentile(self):
+        samples = list(range(1, 101))
+        self.assertEqual(percentile(samples, 0.50), 50)
+        self.assertEqual(percentile(samples, 0.99), 99)
+        self.assertEqual(percentile([7], 0.99), 7)
+
+    def test_compare_flags_regressions(self):
+        baseline = {"results": [{"name": "add_task_db", "size": 1000, "p50_ms": 1.0, "p99_ms": 2.0}]}
+        faster = {"results": [{"name": "add_task_db", "size": 1000, "p50_ms": 0.9, "p99_ms": 2.1}]}
+        slower = {"results": [{"name": "add_task_db", "size": 1000, "p50_ms": 1.0, "p99_ms": 3.0}]}
+        
+        self.assertFalse(compare(faster, baseline)[1])
+        self.assertTrue(compare(slower, baseline)[1])
+
+    def test_small_run_produces_all_measurements(self):
+        result = run([50], iterations=5)
+        names = {r["name"] for r in result["results"]}
+        self.assertIn("get_tasks_db", names)
+        self.assertIn("cmd:show_tasks", names)
+        self.assertTrue(all(r["p99_ms"] >= r["p50_ms"] for r in result["results"]))
+
+    def test_memory_store_run_measures_commands_only(self):
+        result = run([50], iterations=5, store="memory")
+        names = {r["name"] for r in result["results"]}
+        self.assertEqual(result["meta"]["store"], "memory")
+        self.assertIn("cmd:show_tasks", names)
+        self.assertNotIn("get_tasks_db", names)
+
+if __name__ == '__main__':
+    unittest.main()
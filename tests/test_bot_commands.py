@@ -5,37 +5,32 @@ import asyncio
 from unittest.mock import Mock, patch, AsyncMock
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from database import init_db, clear_tasks_table, get_tasks_db
+from bot import BotConfig
+from memory_store import MemoryTaskStore
 
 class TestBotCommands(unittest.TestCase):
-    TEST_DB_NAME = "test_bot_commands.db"
-
-    @classmethod
-    def setUpClass(cls):
-        if os.path.exists(cls.TEST_DB_NAME):
-            os.remove(cls.TEST_DB_NAME)
-        init_db(db_name=cls.TEST_DB_NAME)
-
-    @classmethod
-    def tearDownClass(cls):
-        if os.path.exists(cls.TEST_DB_NAME):
-            os.remove(cls.TEST_DB_NAME)
-
     def setUp(self):
-        clear_tasks_table(db_name=self.TEST_DB_NAME)
+        # Komutlar disk yerine her test için boş bir bellek deposuyla çalışır.
+        self.store = MemoryTaskStore()
         self.mock_ctx = Mock()
+        self.mock_ctx.bot.store = self.store
+        self.mock_ctx.bot.config = BotConfig()
         self.mock_ctx.send = AsyncMock()
+        self.mock_ctx.message.attachments = []
+        self.mock_ctx.guild.id = 42
+        self.mock_ctx.channel.id = 7
+        self.scope = {"guild_id": 42, "channel_id": None}
 
     def test_add_task_command_valid_description(self):
         from bot import add_task
         description = "Test task description"
         
-        with patch('bot.add_task_db') as mock_add_task:
+        with patch.object(self.store, 'add_task', new_callable=AsyncMock) as mock_add_task:
             mock_add_task.return_value = 1
             
             asyncio.run(add_task(self.mock_ctx, description=description))
             
-            mock_add_task.assert_called_once_with(description)
+            mock_add_task.assert_called_once_with(description, **self.scope)
             self.mock_ctx.send.assert_called_once_with(f"✅ Görev eklendi! ID: `1`. Görev: `{description}`")
 
     def test_add_task_command_empty_description(self):
@@ -48,169 +43,429 @@ class TestBotCommands(unittest.TestCase):
     def test_add_task_command_whitespace_description(self):
         from bot import add_task
         
-        with patch('bot.add_task_db') as mock_add_task:
+        with patch.object(self.store, 'add_task', new_callable=AsyncMock) as mock_add_task:
             mock_add_task.return_value = 1
             
             asyncio.run(add_task(self.mock_ctx, description="   "))
             
-            mock_add_task.assert_called_once_with("   ")
+            mock_add_task.assert_called_once_with("   ", **self.scope)
             self.mock_ctx.send.assert_called_once_with("✅ Görev eklendi! ID: `1`. Görev: `   `")
 
     def test_add_task_command_special_characters(self):
         from bot import add_task
         description = "Task with !@#$%^&*()"
         
-        with patch('bot.add_task_db') as mock_add_task:
+        with patch.object(self.store, 'add_task', new_callable=AsyncMock) as mock_add_task:
             mock_add_task.return_value = 1
             
             asyncio.run(add_task(self.mock_ctx, description=description))
             
-            mock_add_task.assert_called_once_with(description)
+            mock_add_task.assert_called_once_with(description, **self.scope)
 
     def test_add_task_command_unicode_characters(self):
         from bot import add_task
         description = "Görev with émojis 🎉"
         
-        with patch('bot.add_task_db') as mock_add_task:
+        with patch.object(self.store, 'add_task', new_callable=AsyncMock) as mock_add_task:
             mock_add_task.return_value = 1
             
             asyncio.run(add_task(self.mock_ctx, description=description))
             
-            mock_add_task.assert_called_once_with(description)
+            mock_add_task.assert_called_once_with(description, **self.scope)
+
+    def test_add_tasks_command_multiline(self):
+        from bot import add_tasks
+        
+        with patch.object(self.store, 'add_tasks', new_callable=AsyncMock) as mock_add_tasks:
+            mock_add_tasks.return_value = [4, 5, 6]
+            
+            asyncio.run(add_tasks(self.mock_ctx, descriptions="Task A\n\n  Task B  \nTask C"))
+            
+            mock_add_tasks.assert_called_once_with(["Task A", "Task B", "Task C"], **self.scope)
+            self.mock_ctx.send.assert_called_once_with("✅ 3 görev eklendi! ID'ler: `4`-`6`")
+
+    def test_add_tasks_command_attachment(self):
+        from bot import add_tasks
+        attachment = Mock(size=20, filename="tasks.txt", content_type="text/plain; charset=utf-8")
+        attachment.read = AsyncMock(return_value="\ufeffFile 1\nFile 2\n".encode("utf-8"))
+        self.mock_ctx.message.attachments = [attachment]
+        
+        with patch.object(self.store, 'add_tasks', new_callable=AsyncMock) as mock_add_tasks:
+            mock_add_tasks.return_value = [1, 2, 3]
+            
+            asyncio.run(add_tasks(self.mock_ctx, descriptions="Inline"))
+            
+            mock_add_tasks.assert_called_once_with(["Inline", "File 1", "File 2"], **self.scope)
+
+    def test_add_tasks_command_rejects_binary_attachments(self):
+        from bot import add_tasks
+        image = Mock(size=20, filename="ekran.png", content_type="image/png")
+        image.read = AsyncMock(return_value=b"\x89PNG\r\n")
+        broken = Mock(size=20, filename="notlar.txt", content_type=None)
+        broken.read = AsyncMock(return_value=b"Dosya \xff\xfe\n")
+
+        with patch.object(self.store, 'add_tasks', new_callable=AsyncMock) as mock_add_tasks:
+            for attachment in (image, broken):
+                self.mock_ctx.message.attachments = [attachment]
+                asyncio.run(add_tasks(self.mock_ctx, descriptions="Inline"))
+
+            mock_add_tasks.assert_not_called()
+        image.read.assert_not_called()
+        self.assertEqual([call.args[0] for call in self.mock_ctx.send.call_args_list], [
+            "⚠️ `ekran.png` bir metin dosyası değil; yalnızca `.txt` dosyası eklenebilir.",
+            "⚠️ `notlar.txt` UTF-8 metin olarak okunamadı.",
+        ])
+
+    def test_add_tasks_command_empty(self):
+        from bot import add_tasks
+        
+        with patch.object(self.store, 'add_tasks', new_callable=AsyncMock) as mock_add_tasks:
+            asyncio.run(add_tasks(self.mock_ctx, descriptions=" \n "))
+            
+            mock_add_tasks.assert_not_called()
+            self.mock_ctx.send.assert_called_once_with("Lütfen her satıra bir görev yazın veya bir metin dosyası ekleyin. Kullanım: `!add_tasks <açıklamalar>`")
+
+    def test_add_tasks_command_too_many(self):
+        from bot import add_tasks, MAX_BULK_TASKS
+        
+        with patch.object(self.store, 'add_tasks', new_callable=AsyncMock) as mock_add_tasks:
+            asyncio.run(add_tasks(self.mock_ctx, descriptions="\n".join(["x"] * (MAX_BULK_TASKS + 1))))
+            
+            mock_add_tasks.assert_not_called()
+            self.mock_ctx.send.assert_called_once_with(f"⚠️ Tek seferde en fazla {MAX_BULK_TASKS} görev eklenebilir.")
+
+    def render_pages(self, tasks):
+        """store.render_tasks_page yerine verilen listeden sayfa yazan sahte fonksiyon."""
+        from rendering import render_page
+        
+        async def render_tasks_page(after_id, page_size, guild_id=None, channel_id=None, status="all"):
+            return render_page([task for task in tasks if task[0] > after_id][:page_size + 1], page_size)
+        return render_tasks_page
 
     def test_show_tasks_command_no_tasks(self):
         from bot import show_tasks
         
-        with patch('bot.get_tasks_db') as mock_get_tasks:
-            mock_get_tasks.return_value = []
-            
+        with patch.object(self.store, 'render_tasks_page', side_effect=self.render_pages([])) as mock_render:
             asyncio.run(show_tasks(self.mock_ctx))
             
-            mock_get_tasks.assert_called_once()
+            mock_render.assert_called_once_with(0, 20, status="all", **self.scope)
             self.mock_ctx.send.assert_called_once_with("📋 Gösterilecek görev bulunmuyor.")
 
     def test_show_tasks_command_with_tasks(self):
         from bot import show_tasks
         tasks = [(1, "Task 1", 0), (2, "Task 2", 1)]
         
-        with patch('bot.get_tasks_db') as mock_get_tasks:
-            mock_get_tasks.return_value = tasks
-            
+        with patch.object(self.store, 'render_tasks_page', side_effect=self.render_pages(tasks)) as mock_render:
             asyncio.run(show_tasks(self.mock_ctx))
             
-            mock_get_tasks.assert_called_once()
+            mock_render.assert_called_once_with(0, 20, status="all", **self.scope)
             expected_response = "📋 **Görev Listesi:**\n1: Task 1 ❌\n2: Task 2 ✅\n"
             self.mock_ctx.send.assert_called_once_with(expected_response)
 
+    def test_show_tasks_command_paginates(self):
+        from bot import show_tasks
+        from views import PaginatedView
+        tasks = [(i, f"Task {i}", 0) for i in range(1, 22)]
+        
+        with patch.object(self.store, 'render_tasks_page', side_effect=self.render_pages(tasks)):
+            asyncio.run(show_tasks(self.mock_ctx))
+        
+        text = self.mock_ctx.send.call_args.args[0]
+        view = self.mock_ctx.send.call_args.kwargs["view"]
+        self.assertIsInstance(view, PaginatedView)
+        self.assertIn("20: Task 20 ❌", text)
+        self.assertNotIn("21: Task 21", text)
+        self.assertEqual(view.page.next_cursor, 20)
+        self.assertTrue(view.previous_page.disabled)
+        self.assertFalse(view.next_page.disabled)
+
+    def test_show_tasks_view_navigation(self):
+        from bot import show_tasks
+        tasks = [(i, f"Task {i}", 0) for i in range(1, 46)]
+        
+        async def scenario():
+            with patch.object(self.store, 'render_tasks_page', side_effect=self.render_pages(tasks)):
+                await show_tasks(self.mock_ctx)
+                view = self.mock_ctx.send.call_args.kwargs["view"]
+                interaction = Mock()
+                interaction.response.edit_message = AsyncMock()
+                await view.next_page.callback(interaction)
+                await view.next_page.callback(interaction)
+                last_text = interaction.response.edit_message.call_args.kwargs["content"]
+                last_next_disabled = view.next_page.disabled
+                await view.previous_page.callback(interaction)
+                previous_text = interaction.response.edit_message.call_args.kwargs["content"]
+                return last_text, last_next_disabled, previous_text
+        
+        last_text, last_next_disabled, previous_text = asyncio.run(scenario())
+        
+        self.assertIn("41: Task 41", last_text)
+        self.assertTrue(last_next_disabled)
+        self.assertIn("21: Task 21", previous_text)
+        self.assertNotIn("41: Task 41", previous_text)
+
+    def test_show_tasks_command_page_fits_message_limit(self):
+        from bot import show_tasks
+        from rendering import MESSAGE_LIMIT
+        tasks = [(i, "A" * 1000, 0) for i in range(1, 22)]
+        
+        with patch.object(self.store, 'render_tasks_page', side_effect=self.render_pages(tasks)):
+            asyncio.run(show_tasks(self.mock_ctx))
+        
+        text = self.mock_ctx.send.call_args.args[0]
+        view = self.mock_ctx.send.call_args.kwargs["view"]
+        self.assertLessEqual(len(text), MESSAGE_LIMIT)
+        self.assertEqual(view.page.next_cursor, text.count("❌"))
+
+    def test_show_tasks_command_status_filter(self):
+        from bot import show_tasks
+        from rendering import STATUS_TITLES, render_page
+        tasks = [(1, "Open", 0), (2, "Done", 1)]
+        
+        async def render_tasks_page(after_id, page_size, guild_id=None, channel_id=None, status="all"):
+            completed = {"open": 0, "done": 1}[status]
+            return render_page([task for task in tasks if task[2] == completed], page_size, title=STATUS_TITLES[status])
+        
+        with patch.object(self.store, 'render_tasks_page', side_effect=render_tasks_page) as mock_render:
+            asyncio.run(show_tasks(self.mock_ctx, "OPEN"))
+            
+            mock_render.assert_called_once_with(0, 20, status="open", **self.scope)
+            self.mock_ctx.send.assert_called_once_with("📋 **Açık Görevler:**\n1: Open ❌\n")
+
+    def test_show_tasks_command_invalid_status(self):
+        from bot import show_tasks
+        
+        with patch.object(self.store, 'render_tasks_page', new_callable=AsyncMock) as mock_render:
+            asyncio.run(show_tasks(self.mock_ctx, "later"))
+            
+            mock_render.assert_not_called()
+            self.assertIn("`open`, `done` veya `all`", self.mock_ctx.send.call_args.args[0])
+
+    def test_task_stats_command(self):
+        from bot import task_stats
+        from database import TaskCounts
+        
+        with patch.object(self.store, 'get_task_counts', new_callable=AsyncMock) as mock_counts:
+            mock_counts.return_value = TaskCounts(5, 3, 2)
+            
+            asyncio.run(task_stats(self.mock_ctx))
+            
+            mock_counts.assert_called_once_with(**self.scope)
+            self.mock_ctx.send.assert_called_once_with(
+                "📊 **Görev İstatistikleri:**\nToplam: 5\n❌ Açık: 3\n✅ Tamamlanan: 2"
+            )
+
+    def test_search_tasks_command_lists_results(self):
+        from bot import search_tasks
+        
+        with patch.object(self.store, 'search_tasks', new_callable=AsyncMock) as mock_search:
+            mock_search.return_value = [(3, "Rapor yaz", 0)]
+            
+            asyncio.run(search_tasks(self.mock_ctx, query="rapor*"))
+            
+            mock_search.assert_called_once_with("rapor*", 0, 21, **self.scope)
+            self.mock_ctx.send.assert_called_once_with("🔎 **Arama sonuçları:**\n3: Rapor yaz ❌\n")
+
+    def test_search_tasks_command_paginates_by_rank(self):
+        from bot import search_tasks
+        results = [(i, f"Rapor {i}", 0) for i in range(30, 0, -1)]
+        
+        async def search(query, offset, limit, guild_id=None, channel_id=None):
+            return results[offset:offset + limit]
+        
+        async def scenario():
+            with patch.object(self.store, 'search_tasks', side_effect=search):
+                await search_tasks(self.mock_ctx, query="rapor")
+                view = self.mock_ctx.send.call_args.kwargs["view"]
+                interaction = Mock()
+                interaction.response.edit_message = AsyncMock()
+                await view.next_page.callback(interaction)
+                return view, interaction.response.edit_message.call_args.kwargs["content"]
+        
+        view, second_page = asyncio.run(scenario())
+        
+        self.assertIn("10: Rapor 10", second_page)
+        self.assertNotIn("11: Rapor 11", second_page)
+        self.assertTrue(view.next_page.disabled)
+
+    def test_search_tasks_command_no_results_or_empty_query(self):
+        from bot import search_tasks
+        
+        with patch.object(self.store, 'search_tasks', new_callable=AsyncMock) as mock_search:
+            mock_search.return_value = []
+            asyncio.run(search_tasks(self.mock_ctx, query="yok"))
+            self.mock_ctx.send.assert_called_once_with("🔎 Aramayla eşleşen görev bulunamadı.")
+            
+            mock_search.side_effect = ValueError("Arama sorgusu boş.")
+            asyncio.run(search_tasks(self.mock_ctx, query='""'))
+            self.assertIn("!search_tasks", self.mock_ctx.send.call_args.args[0])
+
     def test_delete_task_command_valid_id(self):
         from bot import delete_task
         
-        with patch('bot.delete_task_db') as mock_delete_task:
+        with patch.object(self.store, 'delete_task', new_callable=AsyncMock) as mock_delete_task:
             mock_delete_task.return_value = True
             
-            asyncio.run(delete_task(self.mock_ctx, task_id=1))
+            asyncio.run(delete_task(self.mock_ctx, task_ids=1))
             
-            mock_delete_task.assert_called_once_with(1)
+            mock_delete_task.assert_called_once_with(1, **self.scope)
             self.mock_ctx.send.assert_called_once_with("🗑️ Görev `1` başarıyla silindi.")
 
     def test_delete_task_command_invalid_id(self):
         from bot import delete_task
         
-        with patch('bot.delete_task_db') as mock_delete_task:
+        with patch.object(self.store, 'delete_task', new_callable=AsyncMock) as mock_delete_task:
             mock_delete_task.return_value = False
             
-            asyncio.run(delete_task(self.mock_ctx, task_id=999))
+            asyncio.run(delete_task(self.mock_ctx, task_ids=999))
             
-            mock_delete_task.assert_called_once_with(999)
+            mock_delete_task.assert_called_once_with(999, **self.scope)
             self.mock_ctx.send.assert_called_once_with("⚠️ `999` ID'li görev bulunamadı.")
 
     def test_delete_task_command_non_numeric_id(self):
         from bot import delete_task
         
-        asyncio.run(delete_task(self.mock_ctx, task_id="abc"))
+        asyncio.run(delete_task(self.mock_ctx, task_ids="abc"))
         
         self.mock_ctx.send.assert_called_once_with("Lütfen geçerli bir görev ID'si girin. Örneğin: `!delete_task 1`")
 
     def test_delete_task_command_negative_id(self):
         from bot import delete_task
         
-        with patch('bot.delete_task_db') as mock_delete_task:
+        with patch.object(self.store, 'delete_task', new_callable=AsyncMock) as mock_delete_task:
             mock_delete_task.return_value = False
             
-            asyncio.run(delete_task(self.mock_ctx, task_id=-1))
+            asyncio.run(delete_task(self.mock_ctx, task_ids=-1))
             
-            mock_delete_task.assert_called_once_with(-1)
+            mock_delete_task.assert_called_once_with(-1, **self.scope)
             self.mock_ctx.send.assert_called_once_with("⚠️ `-1` ID'li görev bulunamadı.")
 
     def test_complete_task_command_valid_id(self):
         from bot import complete_task
+        from database import TaskOutcome
         
-        with patch('bot.get_task_by_id_db') as mock_get_task:
-            mock_get_task.return_value = (1, "Task 1", 0)
-            
-            with patch('bot.complete_task_db') as mock_complete_task:
-                mock_complete_task.return_value = True
+        with patch.object(self.store, 'get_task_by_id', new_callable=AsyncMock) as mock_get_task:
+            with patch.object(self.store, 'complete_task', new_callable=AsyncMock) as mock_complete_task:
+                mock_complete_task.return_value = TaskOutcome.COMPLETED
                 
-                asyncio.run(complete_task(self.mock_ctx, task_id=1))
+                asyncio.run(complete_task(self.mock_ctx, task_ids=1))
                 
-                mock_get_task.assert_called_once_with(1)
-                mock_complete_task.assert_called_once_with(1)
+                mock_get_task.assert_not_called()
+                mock_complete_task.assert_called_once_with(1, **self.scope)
                 self.mock_ctx.send.assert_called_once_with("✔️ Görev `1` tamamlandı olarak işaretlendi.")
 
     def test_complete_task_command_already_completed(self):
         from bot import complete_task
+        from database import TaskOutcome
         
-        with patch('bot.get_task_by_id_db') as mock_get_task:
-            mock_get_task.return_value = (1, "Task 1", 1)
+        with patch.object(self.store, 'complete_task', new_callable=AsyncMock) as mock_complete_task:
+            mock_complete_task.return_value = TaskOutcome.ALREADY_COMPLETED
             
-            asyncio.run(complete_task(self.mock_ctx, task_id=1))
+            asyncio.run(complete_task(self.mock_ctx, task_ids=1))
             
-            mock_get_task.assert_called_once_with(1)
+            mock_complete_task.assert_called_once_with(1, **self.scope)
             self.mock_ctx.send.assert_called_once_with("ℹ️ `1` ID'li görev zaten tamamlanmış durumda.")
 
     def test_complete_task_command_non_existing_id(self):
         from bot import complete_task
+        from database import TaskOutcome
         
-        with patch('bot.get_task_by_id_db') as mock_get_task:
-            mock_get_task.return_value = None
+        with patch.object(self.store, 'complete_task', new_callable=AsyncMock) as mock_complete_task:
+            mock_complete_task.return_value = TaskOutcome.NOT_FOUND
             
-            asyncio.run(complete_task(self.mock_ctx, task_id=999))
+            asyncio.run(complete_task(self.mock_ctx, task_ids=999))
             
-            mock_get_task.assert_called_once_with(999)
+            mock_complete_task.assert_called_once_with(999, **self.scope)
             self.mock_ctx.send.assert_called_once_with("⚠️ `999` ID'li görev bulunamadı.")
 
     def test_complete_task_command_invalid_id(self):
         from bot import complete_task
         
-        asyncio.run(complete_task(self.mock_ctx, task_id="abc"))
+        asyncio.run(complete_task(self.mock_ctx, task_ids="abc"))
         
         self.mock_ctx.send.assert_called_once_with("Lütfen geçerli bir görev ID'si girin. Örneğin: `!complete_task 1`")
 
     def test_complete_task_command_negative_id(self):
         from bot import complete_task
+        from database import TaskOutcome
         
-        with patch('bot.get_task_by_id_db') as mock_get_task:
-            mock_get_task.return_value = None
+        with patch.object(self.store, 'complete_task', new_callable=AsyncMock) as mock_complete_task:
+            mock_complete_task.return_value = TaskOutcome.NOT_FOUND
             
-            asyncio.run(complete_task(self.mock_ctx, task_id=-1))
+            asyncio.run(complete_task(self.mock_ctx, task_ids=-1))
             
-            mock_get_task.assert_called_once_with(-1)
+            mock_complete_task.assert_called_once_with(-1, **self.scope)
             self.mock_ctx.send.assert_called_once_with("⚠️ `-1` ID'li görev bulunamadı.")
 
-    def test_complete_task_command_failure(self):
+    def test_delete_task_command_batch(self):
+        from bot import delete_task
+        from database import BatchResult
+        
+        with patch.object(self.store, 'delete_tasks', new_callable=AsyncMock) as mock_delete_tasks:
+            mock_delete_tasks.return_value = BatchResult(succeeded=[3, 10, 11, 12], already_completed=[], missing=[7])
+            
+            asyncio.run(delete_task(self.mock_ctx, task_ids="3, 7,10-12"))
+            
+            mock_delete_tasks.assert_called_once_with([3, 7, 10, 11, 12], **self.scope)
+            self.mock_ctx.send.assert_called_once_with(
+                "🗑️ **Toplu silme sonucu:**\nSilinen (4): `3, 10-12`\n⚠️ Bulunamayan (1): `7`"
+            )
+
+    def test_complete_task_command_batch(self):
         from bot import complete_task
+        from database import BatchResult
         
-        with patch('bot.get_task_by_id_db') as mock_get_task:
-            mock_get_task.return_value = (1, "Task 1", 0)
+        with patch.object(self.store, 'complete_tasks', new_callable=AsyncMock) as mock_complete_tasks:
+            mock_complete_tasks.return_value = BatchResult(succeeded=[1, 2], already_completed=[3], missing=[4, 5])
             
-            with patch('bot.complete_task_db') as mock_complete_task:
-                mock_complete_task.return_value = False
-                
-                asyncio.run(complete_task(self.mock_ctx, task_id=1))
-                
-                mock_get_task.assert_called_once_with(1)
-                mock_complete_task.assert_called_once_with(1)
-                self.mock_ctx.send.assert_called_once_with("⚠️ `1` ID'li görev tamamlanamadı veya bulunamadı.")
+            asyncio.run(complete_task(self.mock_ctx, task_ids="1-5"))
+            
+            mock_complete_tasks.assert_called_once_with([1, 2, 3, 4, 5], **self.scope)
+            self.mock_ctx.send.assert_called_once_with(
+                "✔️ **Toplu tamamlama sonucu:**\nTamamlanan (2): `1-2`\n"
+                "ℹ️ Zaten tamamlanmış (1): `3`\n⚠️ Bulunamayan (2): `4-5`"
+            )
+
+    def test_complete_task_command_invalid_range(self):
+        from bot import complete_task
+        
+        asyncio.run(complete_task(self.mock_ctx, task_ids="10-3"))
+        
+        self.mock_ctx.send.assert_called_once_with("Lütfen geçerli bir görev ID'si girin. Örneğin: `!complete_task 1`")
+
+    def test_task_scope_guild_mode(self):
+        from bot import task_scope
+        
+        self.assertEqual(task_scope(self.mock_ctx), {"guild_id": 42, "channel_id": None})
+
+    def test_task_scope_channel_mode(self):
+        from bot import task_scope
+        
+        self.mock_ctx.bot.config = BotConfig(scope="channel")
+        
+        self.assertEqual(task_scope(self.mock_ctx), {"guild_id": 42, "channel_id": 7})
+
+    def test_task_scope_direct_message(self):
+        from bot import task_scope
+        self.mock_ctx.guild = None
+        
+        self.assertEqual(task_scope(self.mock_ctx), {"guild_id": None, "channel_id": 7})
+
+    def test_parse_id_spec(self):
+        from bot import parse_id_spec, MAX_BATCH_IDS
+        
+        self.assertEqual(parse_id_spec("3,7,10-12"), [3, 7, 10, 11, 12])
+        self.assertEqual(parse_id_spec("5 5 4"), [4, 5])
+        self.assertEqual(parse_id_spec(-1), [-1])
+        for bad in ["", "abc", "3-", "1-2-3", f"1-{MAX_BATCH_IDS + 1}"]:
+            with self.assertRaises(ValueError):
+                parse_id_spec(bad)
+
+    def test_format_id_ranges(self):
+        from bot import format_id_ranges
+        
+        self.assertEqual(format_id_ranges([1, 2, 3, 5, 7, 8]), "1-3, 5, 7-8")
+        self.assertTrue(format_id_ranges(list(range(0, 2000, 2)), limit=20).endswith(", …"))
 
     def test_command_error_handling(self):
         from bot import on_command_error
@@ -244,6 +499,47 @@ class TestBotCommands(unittest.TestCase):
         
         self.mock_ctx.send.assert_called_once_with("⚠️ Geçersiz argüman tipi. Komutun doğru kullanımı için `!help test_command` yazın.")
 
+    def test_store_busy_error_handling(self):
+        from bot import on_command_error
+        from discord.ext import commands
+        from storage import StoreBusyError
+        
+        error = commands.CommandInvokeError(StoreBusyError("busy"))
+        
+        asyncio.run(on_command_error(self.mock_ctx, error))
+        
+        self.mock_ctx.send.assert_called_once_with("⏳ Bot şu anda çok yoğun. Lütfen birkaç saniye sonra tekrar deneyin.")
+
+    def test_missing_permissions_error_handling(self):
+        from bot import on_command_error
+        from discord.ext import commands
+        from metrics import REGISTRY
+        self.mock_ctx.command.qualified_name = "perf"
+        
+        asyncio.run(on_command_error(self.mock_ctx, commands.MissingPermissions(["administrator"])))
+        
+        self.mock_ctx.send.assert_called_once_with("⛔ Bu komutu yalnızca sunucu yöneticileri kullanabilir.")
+        self.assertIn((("command", "perf"), ("error", "MissingPermissions")), REGISTRY.counters("bot_command_errors_total"))
+
+    def test_perf_command_requires_administrator(self):
+        from bot import create_bot, perf
+        self.assertTrue(create_bot(BotConfig(), store=self.store).get_command("perf").checks)
+        
+        with patch('bot.format_report', return_value="rapor"):
+            asyncio.run(perf(self.mock_ctx))
+        
+        self.mock_ctx.send.assert_called_once_with("rapor")
+
+    def test_command_latency_hooks(self):
+        from bot import start_command_timer, record_command_latency
+        from metrics import REGISTRY
+        self.mock_ctx.command.qualified_name = "latency_probe"
+        
+        asyncio.run(start_command_timer(self.mock_ctx))
+        asyncio.run(record_command_latency(self.mock_ctx))
+        
+        self.assertEqual(REGISTRY.histograms("bot_command_duration_seconds", "command")["latency_probe"].count, 1)
+
     def test_generic_error_handling(self):
         from bot import on_command_error
         
@@ -0,0 +1,124 @@
+import unittest
+import os
+import sys
+import asyncio
+import json
+import sqlite3
+import subprocess
+import tempfile
+from contextlib import closing
+from unittest.mock import patch
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bot import BotConfig, create_bot, load_config
+from memory_store import MemoryTaskStore
+from migrations import MIGRATIONS, get_schema_version
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# `import bot` için süre bütçesi (yorumlayıcının açılışı hariç). discord.py
+# tek başına bunun yaklaşık yarısını tüketir; içe aktarılırsa bütçe aşılır.
+IMPORT_BUDGET_SECONDS = 0.3
+
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import bot
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "modules": sorted(m for m in ("discord", "dotenv") if m in sys.modules)}))
+"""
+
+class TestImportSafety(unittest.TestCase):
+    def probe_import(self):
+        env = {key: value for key, value in os.environ.items() if key != "DISCORD_TOKEN"}
+        with tempfile.TemporaryDirectory() as directory:
+            result = subprocess.run([sys.executable, "-c", IMPORT_PROBE], cwd=directory, capture_output=True,
+                                    text=True, timeout=60, env={**env, "PYTHONPATH": ROOT})
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertEqual(os.listdir(directory), [])
+        return json.loads(result.stdout)
+
+    def test_import_has_no_side_effects(self):
+        # Token yokken de içe aktarılır; discord.py ve .env yüklenmez, dosya oluşturulmaz.
+        self.assertEqual(self.probe_import()["modules"], [])
+
+    def test_import_within_startup_budget(self):
+        # Ölçüm gürültüsüne karşı en iyi üç denemeden biri.
+        fastest = min(self.probe_import()["seconds"] for _ in range(3))
+        self.assertLess(fastest, IMPORT_BUDGET_SECONDS)
+
+class TestCreateBot(unittest.TestCase):
+    def test_registers_commands_and_uses_given_store(self):
+        store = MemoryTaskStore()
+        bot = create_bot(BotConfig(store="memory"), store=store)
+
+        self.assertIs(bot.store, store)
+        self.assertEqual(
+            {command.name for command in bot.commands} - {"help"},
+            {"add_task", "add_tasks", "show_tasks", "search_tasks", "task_stats", "delete_task",
+             "complete_task", "pin_board", "perf", "export_tasks", "import_tasks"},
+        )
+        self.assertTrue(bot.get_command("perf").checks)
+        self.assertFalse(bot.get_command("add_task").checks)
+
+    def test_bots_are_independent(self):
+        first = create_bot(BotConfig(store="memory"))
+        second = create_bot(BotConfig(store="memory"))
+
+        self.assertIsNot(first.store, second.store)
+        self.assertIsNot(first.board_updates, second.board_updates)
+        self.assertEqual(len(first.get_command("perf").checks), 1)
+
+    def test_sharded_config(self):
+        from discord.ext import commands
+        bot = create_bot(BotConfig(store="memory", shard_count=4, shard_ids=[1, 3]))
+
+        self.assertIsInstance(bot, commands.AutoShardedBot)
+        self.assertEqual((bot.shard_count, bot.shard_ids), (4, [1, 3]))
+
+    def test_database_is_prepared_on_setup_hook(self):
+        with tempfile.TemporaryDirectory() as directory:
+            db_name = os.path.join(directory, "tasks.db")
+            bot = create_bot(BotConfig(store="sqlite", store_options={"db_name": db_name}))
+            self.addCleanup(bot.store.close)
+            self.assertFalse(os.path.exists(db_name))
+
+            with patch('bot.prepare_store', return_value="hazır") as mock_prepare:
+                asyncio.run(bot.setup_hook())
+
+            mock_prepare.assert_called_once_with("sqlite", options={"db_name": db_name})
+
+    def test_setup_hook_migrates_injected_store(self):
+        import database
+        from storage import SqliteTaskStore
+
+        self.addCleanup(database.configure_storage, database.get_storage_profile())
+        with tempfile.TemporaryDirectory() as directory:
+            default_db = os.path.join(directory, "tasks.db")
+            db_name = os.path.join(directory, "x.db")
+            store = SqliteTaskStore(db_name=db_name)
+            self.addCleanup(store.close)
+            bot = create_bot(BotConfig(store="sqlite", store_options={}), store=store)
+
+            with patch('database.DEFAULT_DB_NAME', default_db), patch.dict(os.environ, {"TASK_DB_JOURNAL_MODE": "WAL"}):
+                asyncio.run(bot.setup_hook())
+                store.close()
+
+            with closing(sqlite3.connect(db_name)) as conn:
+                self.assertEqual(get_schema_version(conn), MIGRATIONS[-1].version)
+
+            self.assertFalse(os.path.exists(default_db))
+
+class TestLoadConfig(unittest.TestCase):
+    def test_defaults(self):
+        self.assertEqual(load_config({}), BotConfig(store_options={}))
+
+    def test_environment(self):
+        config = load_config({
+            "DISCORD_TOKEN": "t", "TASK_SCOPE": "channel", "TASK_STORE": "remote",
+            "TASK_STORAGE_SOCKET": "s.sock", "SHARD_COUNT": "4", "SHARD_IDS": "0,2",
+        })
+
+        self.assertEqual(config, BotConfig("t", "channel", "remote", {"path": "s.sock"}, 4, [0, 2]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,13 @@
 import unittest
 import os
 import sys
+import sqlite3
+from unittest.mock import patch
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from database import init_db, add_task_db, complete_task_db, get_task_by_id_db, clear_tasks_table
+import database
+
+from database import init_db, add_task_db, add_tasks_db, complete_task_db, complete_tasks_db, complete_task_outcome_db, TaskOutcome, get_task_by_id_db, clear_tasks_table, close_pool
 
 class TestCompleteTask(unittest.TestCase):
     TEST_DB_NAME = "test_complete_tasks.db"
@@ -16,6 +20,7 @@ class TestCompleteTask(unittest.TestCase):
 
     @classmethod
     def tearDownClass(cls):
+        close_pool(cls.TEST_DB_NAME)
         if os.path.exists(cls.TEST_DB_NAME):
             os.remove(cls.TEST_DB_NAME)
 
@@ -125,6 +130,58 @@ class TestCompleteTask(unittest.TestCase):
         result = complete_task_db(new_task_id, db_name=self.TEST_DB_NAME)
         self.assertTrue(result)
 
+    def test_complete_tasks_batch(self):
+        add_tasks_db([f"Task {i}" for i in range(2, 11)], db_name=self.TEST_DB_NAME)
+        complete_task_db(3, db_name=self.TEST_DB_NAME)
+        
+        result = complete_tasks_db([1, 3, 5, 6, 7, 8, 42], db_name=self.TEST_DB_NAME)
+        
+        self.assertEqual(result.succeeded, [1, 5, 6, 7, 8])
+        self.assertEqual(result.already_completed, [3])
+        self.assertEqual(result.missing, [42])
+        for task_id in [1, 3, 5, 6, 7, 8]:
+            self.assertEqual(get_task_by_id_db(task_id, db_name=self.TEST_DB_NAME)[2], 1)
+        self.assertEqual(get_task_by_id_db(4, db_name=self.TEST_DB_NAME)[2], 0)
+
+    def test_complete_tasks_batch_more_ids_than_sql_params(self):
+        add_tasks_db([f"Task {i}" for i in range(2000)], db_name=self.TEST_DB_NAME)
+        
+        result = complete_tasks_db(range(1, 4002, 2), db_name=self.TEST_DB_NAME)
+        
+        self.assertEqual(len(result.succeeded), 1001)
+        self.assertEqual(len(result.missing), 1000)
+
+    def test_complete_task_outcomes(self):
+        self.assertIs(complete_task_outcome_db(self.incomplete_task_id, db_name=self.TEST_DB_NAME), TaskOutcome.COMPLETED)
+        self.assertIs(complete_task_outcome_db(self.incomplete_task_id, db_name=self.TEST_DB_NAME), TaskOutcome.ALREADY_COMPLETED)
+        self.assertIs(complete_task_outcome_db(999, db_name=self.TEST_DB_NAME), TaskOutcome.NOT_FOUND)
+
+    def test_complete_tasks_batch_without_returning_support(self):
+        add_tasks_db(["Task 2", "Task 3"], db_name=self.TEST_DB_NAME)
+        complete_task_db(2, db_name=self.TEST_DB_NAME)
+        
+        with patch('database.SUPPORTS_RETURNING', False):
+            result = complete_tasks_db([1, 2, 3, 4], db_name=self.TEST_DB_NAME)
+        
+        self.assertEqual(result.succeeded, [1, 3])
+        self.assertEqual(result.already_completed, [2])
+        self.assertEqual(result.missing, [4])
+
+    def test_complete_tasks_fallback_selects_inside_write_transaction(self):
+        # SELECT ile UPDATE arasında başka bir yazıcı araya girememeli.
+        conn = sqlite3.connect(self.TEST_DB_NAME)
+        self.addCleanup(conn.close)
+        statements = []
+        conn.set_trace_callback(statements.append)
+
+        with patch('database.SUPPORTS_RETURNING', False):
+            result = database._complete_tasks(conn, [self.incomplete_task_id, 999])
+        conn.commit()
+
+        self.assertEqual(result.succeeded, [self.incomplete_task_id])
+        self.assertEqual(statements[0], "BEGIN IMMEDIATE")
+        self.assertTrue(statements[1].startswith("SELECT id FROM tasks"))
+
     def test_complete_task_with_print(self):
         print("Testing complete_task() function.")
         print("Database connection is initialized.")
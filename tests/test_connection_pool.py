@@ -0,0 +1,84 @@
+import unittest
+import os
+import sys
+import threading
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import (
+    init_db, add_task_db, get_tasks_db, clear_tasks_table,
+    get_pool, close_pool, ConnectionPool, PoolClosedError,
+)
+
+class TestConnectionPool(unittest.TestCase):
+    TEST_DB_NAME = "test_connection_pool.db"
+
+    @classmethod
+    def setUpClass(cls):
+        if os.path.exists(cls.TEST_DB_NAME):
+            os.remove(cls.TEST_DB_NAME)
+        init_db(db_name=cls.TEST_DB_NAME)
+
+    @classmethod
+    def tearDownClass(cls):
+        close_pool(cls.TEST_DB_NAME)
+        if os.path.exists(cls.TEST_DB_NAME):
+            os.remove(cls.TEST_DB_NAME)
+
+    def setUp(self):
+        clear_tasks_table(db_name=self.TEST_DB_NAME)
+
+    def test_same_pool_for_same_name(self):
+        self.assertIs(get_pool(self.TEST_DB_NAME), get_pool(self.TEST_DB_NAME))
+
+    def test_connection_is_reused(self):
+        pool = get_pool(self.TEST_DB_NAME)
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+        self.assertIs(first, second)
+
+    def test_uncommitted_work_is_rolled_back_on_release(self):
+        pool = get_pool(self.TEST_DB_NAME)
+        with pool.connection() as conn:
+            conn.execute("INSERT INTO tasks (description) VALUES ('uncommitted')")
+        self.assertEqual(get_tasks_db(db_name=self.TEST_DB_NAME), [])
+
+    def test_concurrent_adds_from_threads(self):
+        def worker(n):
+            for i in range(25):
+                add_task_db(f"Task {n}-{i}", db_name=self.TEST_DB_NAME)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        tasks = get_tasks_db(db_name=self.TEST_DB_NAME)
+        self.assertEqual(len(tasks), 200)
+        self.assertEqual(len({task[0] for task in tasks}), 200)
+
+    def test_pool_size_is_bounded(self):
+        pool = ConnectionPool(self.TEST_DB_NAME, max_size=1, timeout=0.05)
+        conn = pool.acquire()
+        try:
+            with self.assertRaises(TimeoutError):
+                pool.acquire()
+        finally:
+            pool.release(conn)
+            pool.close()
+
+    def test_closed_pool_rejects_acquire(self):
+        pool = ConnectionPool(self.TEST_DB_NAME)
+        pool.close()
+        with self.assertRaises(PoolClosedError):
+            pool.acquire()
+
+    def test_close_pool_creates_fresh_pool(self):
+        old_pool = get_pool(self.TEST_DB_NAME)
+        close_pool(self.TEST_DB_NAME)
+        self.assertIsNot(get_pool(self.TEST_DB_NAME), old_pool)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,13 @@
 import unittest
 import os
 import sys
+import sqlite3
+from unittest.mock import patch
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from database import init_db, add_task_db, delete_task_db, get_tasks_db, clear_tasks_table
+import database
+
+from database import init_db, add_task_db, add_tasks_db, delete_task_db, delete_tasks_db, get_tasks_db, clear_tasks_table, close_pool
 
 class TestDeleteTask(unittest.TestCase):
     TEST_DB_NAME = "test_delete_tasks.db"
@@ -16,6 +20,7 @@ class TestDeleteTask(unittest.TestCase):
 
     @classmethod
     def tearDownClass(cls):
+        close_pool(cls.TEST_DB_NAME)
         if os.path.exists(cls.TEST_DB_NAME):
             os.remove(cls.TEST_DB_NAME)
 
@@ -138,6 +143,42 @@ class TestDeleteTask(unittest.TestCase):
         remaining_ids = [task[0] for task in tasks_after_delete]
         self.assertIn(other_task_id, remaining_ids)
 
+    def test_delete_tasks_batch(self):
+        add_tasks_db([f"Task {i}" for i in range(8)], db_name=self.TEST_DB_NAME)
+        
+        result = delete_tasks_db([1, 4, 5, 6, 99], db_name=self.TEST_DB_NAME)
+        
+        self.assertEqual(result.succeeded, [1, 4, 5, 6])
+        self.assertEqual(result.missing, [99])
+        remaining_ids = [task[0] for task in get_tasks_db(db_name=self.TEST_DB_NAME)]
+        self.assertEqual(remaining_ids, [2, 3, 7, 8, 9, 10])
+
+    def test_delete_tasks_batch_without_returning_support(self):
+        with patch('database.SUPPORTS_RETURNING', False):
+            result = delete_tasks_db([self.task_id_to_delete, 99], db_name=self.TEST_DB_NAME)
+        
+        self.assertEqual(result.succeeded, [self.task_id_to_delete])
+        self.assertEqual(result.missing, [99])
+
+    def test_delete_tasks_fallback_selects_inside_write_transaction(self):
+        conn = sqlite3.connect(self.TEST_DB_NAME)
+        self.addCleanup(conn.close)
+        statements = []
+        conn.set_trace_callback(statements.append)
+
+        with patch('database.SUPPORTS_RETURNING', False):
+            result = database._delete_tasks(conn, [self.task_id_to_delete])
+            # İşlem açıkken başka bir bağlantı yazamaz.
+            other = sqlite3.connect(self.TEST_DB_NAME, timeout=0)
+            self.addCleanup(other.close)
+            with self.assertRaises(sqlite3.OperationalError):
+                other.execute("INSERT INTO tasks (description) VALUES ('araya giren')")
+        conn.commit()
+
+        self.assertEqual(result.succeeded, [self.task_id_to_delete])
+        self.assertEqual(statements[0], "BEGIN IMMEDIATE")
+        self.assertTrue(statements[1].startswith("SELECT id FROM tasks"))
+
     def test_delete_task_with_print(self):
         print("Testing delete_task() function.")
         print("Database connection is initialized.")
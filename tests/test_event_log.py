@@ -0,0 +1,199 @@
+import unittest
+import os
+import sys
+import asyncio
+import sqlite3
+import tempfile
+import threading
+from concurrent.futures import Future
+from unittest.mock import patch
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import init_db, add_tasks_db, complete_task_db, set_board_db, close_pool, TaskCounts, TaskOutcome
+from eventlog import RECORD_HEADER, encode_record, iter_records
+from eventlog_store import EventLogTaskStore, _snapshot_records, convert_sqlite
+
+class TestEventLogTaskStore(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def open_store(self, **options):
+        store = EventLogTaskStore(self.directory, **options)
+        self.addCleanup(store.close)
+        return store
+
+    def log_records(self):
+        with open(os.path.join(self.directory, "tasks.log"), "rb") as f:
+            return [record for record, _ in iter_records(f)]
+
+    def test_records_are_framed_with_length_and_crc(self):
+        data = encode_record([1, "TaskAdded", 1, "Süt al", None, None])
+        length, _ = RECORD_HEADER.unpack(data[:RECORD_HEADER.size])
+        self.assertEqual(length, len(data) - RECORD_HEADER.size)
+
+    def test_replays_log_after_restart(self):
+        async def write(store):
+            first, second, third = await store.add_tasks(["A", "B", "C"], guild_id=1)
+            await store.complete_task(first, guild_id=1)
+            await store.delete_task(second, guild_id=1)
+            await store.set_board(10, 100, guild_id=1)
+
+        store = self.open_store()
+        asyncio.run(write(store))
+        # Anlık görüntü almadan kapanmış gibi: yalnızca günlük kalır.
+        store._since_snapshot = 0
+        store.close()
+        self.assertEqual([record[1] for record in self.log_records()],
+                         ["TaskAdded"] * 3 + ["TaskCompleted", "TaskDeleted", "BoardSet"])
+        
+        reopened = self.open_store()
+        self.assertEqual(asyncio.run(reopened.get_tasks(guild_id=1)), [(1, "A", 1), (3, "C", 0)])
+        self.assertEqual(asyncio.run(reopened.get_task_counts(guild_id=1)), TaskCounts(2, 1, 1))
+        self.assertEqual(asyncio.run(reopened.get_boards(guild_id=1)), [(10, 100)])
+        # Silinen ID yeniden verilmez.
+        self.assertEqual(asyncio.run(reopened.add_task("D", guild_id=1)), 4)
+
+    def test_snapshot_compacts_log(self):
+        store = self.open_store(snapshot_every=5)
+        asyncio.run(store.add_tasks([f"Görev {i}" for i in range(7)], guild_id=1))
+        asyncio.run(store.delete_task(1, guild_id=1))
+        store.snapshot().result()
+        self.assertEqual(self.log_records(), [])
+        asyncio.run(store.complete_task(2, guild_id=1))
+        store._since_snapshot = 0
+        store.close()
+        
+        self.assertEqual(len(self.log_records()), 1)
+        reopened = self.open_store()
+        self.assertEqual(asyncio.run(reopened.get_task_counts(guild_id=1)), TaskCounts(6, 5, 1))
+        self.assertEqual(asyncio.run(reopened.add_task("Yeni", guild_id=1)), 8)
+
+    def test_close_writes_snapshot(self):
+        store = self.open_store()
+        asyncio.run(store.add_task("Kalıcı", guild_id=1))
+        store.close()
+        
+        self.assertEqual(self.log_records(), [])
+        reopened = self.open_store()
+        self.assertEqual(asyncio.run(reopened.get_tasks(guild_id=1)), [(1, "Kalıcı", 0)])
+
+    def test_torn_tail_is_discarded(self):
+        store = self.open_store()
+        asyncio.run(store.add_tasks(["A", "B"], guild_id=1))
+        store._since_snapshot = 0
+        store.close()
+        log_path = os.path.join(self.directory, "tasks.log")
+        intact_size = os.path.getsize(log_path)
+        with open(log_path, "ab") as f:
+            f.write(encode_record([3, "TaskAdded", 3, "yarım", 1, None])[:-2])
+        
+        with patch("builtins.print"):
+            reopened = self.open_store()
+        self.assertEqual([task[1] for task in asyncio.run(reopened.get_tasks(guild_id=1))], ["A", "B"])
+        self.assertEqual(os.path.getsize(log_path), intact_size)
+
+    def test_concurrent_writes_share_fsyncs(self):
+        store = self.open_store(max_latency=0.01)
+
+        async def scenario():
+            return await asyncio.gather(*(store.add_task(f"Görev {i}", guild_id=1) for i in range(50)))
+
+        self.assertEqual(sorted(asyncio.run(scenario())), list(range(1, 51)))
+        self.assertEqual(len(self.log_records()), 50)
+
+    def test_failed_append_leaves_state_unchanged(self):
+        store = self.open_store()
+        task_id = asyncio.run(store.add_task("Süt al", guild_id=1))
+        failed = Future()
+        failed.set_exception(OSError("disk dolu"))
+
+        with patch.object(store._log, 'append', return_value=failed):
+            with self.assertRaises(OSError):
+                asyncio.run(store.complete_task(task_id, guild_id=1))
+            with self.assertRaises(OSError):
+                asyncio.run(store.delete_task(task_id, guild_id=1))
+            with self.assertRaises(OSError):
+                asyncio.run(store.add_task("Ekmek al", guild_id=1))
+
+        self.assertEqual(asyncio.run(store.get_tasks(guild_id=1)), [(task_id, "Süt al", 0)])
+        self.assertEqual(asyncio.run(store.complete_task(task_id, guild_id=1)), TaskOutcome.COMPLETED)
+
+    def test_concurrent_requests_see_pending_events(self):
+        store = self.open_store(max_latency=0.01)
+        task_ids = asyncio.run(store.add_tasks(["A", "B"], guild_id=1))
+
+        async def scenario():
+            return await asyncio.gather(
+                store.complete_task(task_ids[0], guild_id=1),
+                store.complete_task(task_ids[0], guild_id=1),
+                store.delete_task(task_ids[1], guild_id=1),
+                store.complete_task(task_ids[1], guild_id=1),
+            )
+
+        self.assertEqual(asyncio.run(scenario()),
+                         [TaskOutcome.COMPLETED, TaskOutcome.ALREADY_COMPLETED, True, TaskOutcome.NOT_FOUND])
+        self.assertEqual(asyncio.run(store.get_task_counts(guild_id=1)), TaskCounts(1, 0, 1))
+
+    def test_snapshot_records_are_built_in_writer_thread(self):
+        threads = []
+
+        def records(*args):
+            threads.append(threading.current_thread().name)
+            yield from _snapshot_records(*args)
+
+        store = self.open_store(snapshot_every=5, max_latency=0.01)
+        with patch('eventlog_store._snapshot_records', side_effect=records):
+            async def scenario():
+                await asyncio.gather(*(store.add_task(f"Görev {i}", guild_id=1) for i in range(12)))
+
+            asyncio.run(scenario())
+            store.close()
+
+        self.assertTrue(threads)
+        self.assertNotIn(threading.current_thread().name, threads)
+        reopened = self.open_store()
+        self.assertEqual(asyncio.run(reopened.get_task_counts(guild_id=1)), TaskCounts(12, 12, 0))
+
+class TestConvertSqlite(unittest.TestCase):
+    TEST_DB_NAME = "test_event_log.db"
+
+    def setUp(self):
+        if os.path.exists(self.TEST_DB_NAME):
+            os.remove(self.TEST_DB_NAME)
+        init_db(db_name=self.TEST_DB_NAME)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def tearDown(self):
+        close_pool(self.TEST_DB_NAME)
+        if os.path.exists(self.TEST_DB_NAME):
+            os.remove(self.TEST_DB_NAME)
+
+    def test_converts_tasks_and_boards(self):
+        ids = add_tasks_db(["Süt al", "Ekmek al", "Rapor"], db_name=self.TEST_DB_NAME, guild_id=1)
+        add_tasks_db(["Kanal görevi"], db_name=self.TEST_DB_NAME, guild_id=1, channel_id=5)
+        complete_task_db(ids[0], db_name=self.TEST_DB_NAME, guild_id=1)
+        set_board_db(10, 100, db_name=self.TEST_DB_NAME, guild_id=1)
+        close_pool(self.TEST_DB_NAME)
+        
+        self.assertEqual(convert_sqlite(self.TEST_DB_NAME, self.directory), 4)
+        store = EventLogTaskStore(self.directory)
+        self.addCleanup(store.close)
+        self.assertEqual(asyncio.run(store.get_tasks(guild_id=1, channel_id=5)), [(4, "Kanal görevi", 0)])
+        self.assertEqual(asyncio.run(store.get_task_counts(guild_id=1)), TaskCounts(4, 3, 1))
+        self.assertEqual(asyncio.run(store.get_boards(guild_id=1)), [(10, 100)])
+        self.assertEqual([row[0] for row in asyncio.run(store.search_tasks("rapor", guild_id=1))], [3])
+        
+        with self.assertRaises(FileExistsError):
+            convert_sqlite(self.TEST_DB_NAME, self.directory)
+
+    def test_missing_database_is_not_created(self):
+        with self.assertRaises(sqlite3.Error):
+            convert_sqlite("does_not_exist.db", self.directory)
+        self.assertFalse(os.path.exists("does_not_exist.db"))
+
+if __name__ == '__main__':
+    unittest.main()
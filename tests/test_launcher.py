@@ -0,0 +1,129 @@
+import unittest
+import os
+import sys
+import asyncio
+import json
+import subprocess
+import tempfile
+from unittest.mock import Mock
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fake_gateway import fake_guilds, guild_shard
+from launcher import assign_shards, worker_env
+from storage_service import FrameOutbox, FrameTooLargeError, encode_frame, read_frame
+import storage_service
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+class TestShardAssignment(unittest.TestCase):
+    def test_round_robin(self):
+        self.assertEqual(assign_shards(5, 2), [[0, 2, 4], [1, 3]])
+        self.assertEqual(assign_shards(3, 3), [[0], [1], [2]])
+
+    def test_every_shard_has_exactly_one_worker(self):
+        assignments = assign_shards(16, 3)
+        self.assertEqual(sorted(shard for shards in assignments for shard in shards), list(range(16)))
+
+    def test_invalid_counts(self):
+        with self.assertRaises(ValueError):
+            assign_shards(2, 3)
+        with self.assertRaises(ValueError):
+            assign_shards(4, 0)
+
+    def test_worker_env(self):
+        env = worker_env({"TASK_STORE": "sqlite", "PATH": "/bin"}, "s.sock", 4, [1, 3], 1)
+        self.assertEqual(env["TASK_STORE"], "remote")
+        self.assertEqual(env["TASK_STORAGE_SOCKET"], "s.sock")
+        self.assertEqual((env["SHARD_COUNT"], env["SHARD_IDS"], env["WORKER_ID"]), ("4", "1,3", "1"))
+        self.assertEqual(env["PATH"], "/bin")
+
+    def test_fake_guilds_cover_all_shards(self):
+        self.assertEqual([guild_shard(guild_id, 4) for guild_id in fake_guilds(8)], [1, 2, 3, 0, 1, 2, 3, 0])
+
+class TestFraming(unittest.TestCase):
+    def read(self, data):
+        async def scenario():
+            reader = asyncio.StreamReader()
+            reader.feed_data(data)
+            reader.feed_eof()
+            return await read_frame(reader)
+
+        return asyncio.run(scenario())
+
+    def test_round_trip(self):
+        message = [[1, "add_task", ["Çiçek sula"], {"guild_id": 5, "channel_id": None}]]
+        self.assertEqual(self.read(encode_frame(message)), message)
+
+    def test_incomplete_frame(self):
+        with self.assertRaises(asyncio.IncompleteReadError):
+            self.read(encode_frame([1, 2, 3])[:-1])
+
+    def test_frame_size_limit(self):
+        with unittest.mock.patch.object(storage_service, "MAX_FRAME_SIZE", 8):
+            with self.assertRaises(FrameTooLargeError):
+                encode_frame(["uzun bir mesaj"])
+            with self.assertRaises(FrameTooLargeError):
+                self.read(storage_service.FRAME_HEADER.pack(9) + b"0" * 9)
+
+    def test_outbox_batches_messages_of_one_loop_turn(self):
+        writer = Mock()
+        writer.is_closing.return_value = False
+
+        async def scenario():
+            outbox = FrameOutbox(writer)
+            for call_id in range(3):
+                outbox.put([call_id, True, None])
+            await asyncio.sleep(0)
+            outbox.put([3, True, None])
+            await asyncio.sleep(0)
+
+        asyncio.run(scenario())
+        self.assertEqual([call.args[0] for call in writer.write.call_args_list], [
+            encode_frame([[0, True, None], [1, True, None], [2, True, None]]),
+            encode_frame([[3, True, None]]),
+        ])
+
+class TestLauncher(unittest.TestCase):
+    def run_launcher(self, *args, directory=None):
+        if directory is None:
+            directory = tempfile.TemporaryDirectory()
+            self.addCleanup(directory.cleanup)
+        return subprocess.run(
+            [sys.executable, os.path.join(ROOT, "launcher.py"), "--fake-gateway", *args],
+            cwd=directory.name, capture_output=True, text=True, timeout=120,
+        ), directory.name
+
+    def summaries(self, stdout):
+        return [json.loads(line) for line in stdout.splitlines() if line.startswith("{")]
+
+    def test_workers_share_one_storage_service(self):
+        result, directory = self.run_launcher("--workers", "2", "--shards", "3", "--store", "sqlite",
+                                              "--guilds", "6", "--tasks", "5")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        summaries = sorted(self.summaries(result.stdout), key=lambda summary: summary["worker"])
+        self.assertEqual([summary["shards"] for summary in summaries], [[0, 2], [1]])
+        self.assertEqual([summary["guilds"] for summary in summaries], [4, 2])
+        self.assertTrue(all(summary["errors"] == [] for summary in summaries))
+        # Tüm işçilerin görevleri servisin tek veritabanına yazıldı; soket temizlendi.
+        import sqlite3
+        conn = sqlite3.connect(os.path.join(directory, "tasks.db"))
+        self.addCleanup(conn.close)
+        self.assertEqual(conn.execute("SELECT COUNT(*), SUM(completed) FROM tasks").fetchone(), (30, 6))
+        self.assertFalse(os.path.exists(os.path.join(directory, "task-storage.sock")))
+
+    def test_repeated_runs_in_same_directory(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        for _ in range(2):
+            result, _ = self.run_launcher("--workers", "2", "--shards", "2", "--guilds", "2", "--tasks", "3",
+                                          directory=directory)
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertTrue(all(summary["errors"] == [] for summary in self.summaries(result.stdout)))
+
+    def test_invalid_worker_count_fails_without_starting(self):
+        result, directory = self.run_launcher("--workers", "3", "--shards", "2")
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("Parça sayısı", result.stderr)
+
+if __name__ == '__main__':
+    unittest.main()
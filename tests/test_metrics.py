@@ -0,0 +1,104 @@
+import unittest
+import os
+import sys
+import urllib.request
+import urllib.error
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from metrics import Histogram, MetricsRegistry, REGISTRY, format_report, normalize_sql, start_http_server
+from database import init_db, add_task_db, get_tasks_db, get_task_by_id_db, close_pool, task_cache
+
+class TestMetrics(unittest.TestCase):
+    TEST_DB_NAME = "test_metrics.db"
+
+    @classmethod
+    def setUpClass(cls):
+        if os.path.exists(cls.TEST_DB_NAME):
+            os.remove(cls.TEST_DB_NAME)
+        init_db(db_name=cls.TEST_DB_NAME)
+
+    @classmethod
+    def tearDownClass(cls):
+        close_pool(cls.TEST_DB_NAME)
+        if os.path.exists(cls.TEST_DB_NAME):
+            os.remove(cls.TEST_DB_NAME)
+
+    def test_histogram_quantiles(self):
+        histogram = Histogram(buckets=(0.01, 0.1, 1.0))
+        for _ in range(90):
+            histogram.observe(0.005)
+        for _ in range(10):
+            histogram.observe(0.5)
+        
+        self.assertLessEqual(histogram.quantile(0.5), 0.01)
+        self.assertGreater(histogram.quantile(0.99), 0.1)
+        histogram.observe(50)
+        self.assertEqual(histogram.quantile(1.0), 1.0)
+
+    def test_prometheus_text_format(self):
+        registry = MetricsRegistry()
+        registry.observe("latency_seconds", 0.002, command="add_task")
+        registry.increment("errors_total", command='a"b', error="ValueError")
+        registry.add_collector(lambda: [("cache_bytes", "gauge", {}, 10)])
+        
+        text = registry.render_prometheus()
+        
+        self.assertIn("# TYPE latency_seconds histogram", text)
+        self.assertIn('latency_seconds_bucket{command="add_task",le="0.0025"} 1', text)
+        self.assertIn('latency_seconds_bucket{command="add_task",le="+Inf"} 1', text)
+        self.assertIn('latency_seconds_count{command="add_task"} 1', text)
+        self.assertIn('errors_total{command="a\\"b",error="ValueError"} 1', text)
+        self.assertIn("# TYPE cache_bytes gauge\ncache_bytes 10", text)
+
+    def test_normalize_sql(self):
+        self.assertEqual(normalize_sql("SELECT id\n  FROM tasks WHERE id IN (?, ?,?)"),
+                         "SELECT id FROM tasks WHERE id IN (?…)")
+
+    def test_sql_statements_are_timed_and_counted(self):
+        add_task_db("Ölçülen görev", db_name=self.TEST_DB_NAME)
+        get_tasks_db(db_name=self.TEST_DB_NAME)
+        
+        statements = REGISTRY.histograms("sql_statement_duration_seconds", "statement")
+        kinds = {dict(labels)["kind"] for labels in REGISTRY.counters("sql_statements_total")}
+        
+        self.assertTrue(any(statement.startswith("INSERT INTO tasks") for statement in statements))
+        self.assertTrue({"INSERT", "TRIGGER", "COMMIT"} <= kinds)
+        self.assertIn("task_cache_hits_total", REGISTRY.collected())
+
+    def test_one_sample_per_statement(self):
+        task_id = add_task_db("Tek örnek", db_name=self.TEST_DB_NAME)
+        label = "SELECT id, description, completed FROM tasks WHERE id = ? AND guild_id IS ?"
+
+        def count():
+            histogram = REGISTRY.histograms("sql_statement_duration_seconds", "statement").get(label)
+            return histogram.count if histogram else 0
+
+        before = count()
+        for _ in range(10):
+            task_cache.invalidate(self.TEST_DB_NAME)
+            self.assertIsNotNone(get_task_by_id_db(task_id, db_name=self.TEST_DB_NAME))
+
+        self.assertEqual(count() - before, 10)
+
+    def test_report_and_http_endpoint(self):
+        registry = MetricsRegistry()
+        registry.observe("bot_command_duration_seconds", 0.02, command="show_tasks")
+        registry.increment("bot_command_errors_total", command="perf", error="MissingPermissions")
+        self.assertIn("show_tasks", format_report(registry))
+        self.assertIn("perf/MissingPermissions: 1", format_report(registry))
+        self.assertLess(len(format_report(REGISTRY)), 2000)
+        
+        server = start_http_server(0, registry=registry)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}"
+            with urllib.request.urlopen(url + "/metrics") as response:
+                self.assertIn("text/plain", response.headers["Content-Type"])
+                self.assertIn('bot_command_duration_seconds_count{command="show_tasks"} 1', response.read().decode())
+            with self.assertRaises(urllib.error.HTTPError):
+                urllib.request.urlopen(url + "/")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,200 @@
+import unittest
+import os
+import sys
+import sqlite3
+from unittest.mock import patch
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import database
+from database import (init_db, add_task_db, get_tasks_db, close_pool, adopt_legacy_tasks_db,
+                      complete_task_outcome_db, get_task_counts_db, TaskCounts, TaskOutcome)
+from storage import prepare_store
+from migrations import MIGRATIONS, Migration, SchemaVersionError, migrate, get_schema_version
+
+class TestMigrations(unittest.TestCase):
+    TEST_DB_NAME = "test_migrations.db"
+
+    def setUp(self):
+        if os.path.exists(self.TEST_DB_NAME):
+            os.remove(self.TEST_DB_NAME)
+        self.conn = sqlite3.connect(self.TEST_DB_NAME)
+
+    def tearDown(self):
+        self.conn.close()
+        close_pool(self.TEST_DB_NAME)
+        if os.path.exists(self.TEST_DB_NAME):
+            os.remove(self.TEST_DB_NAME)
+
+    def test_fresh_database_reaches_latest_version(self):
+        applied = migrate(self.conn)
+        
+        self.assertEqual(applied, [m.version for m in MIGRATIONS])
+        self.assertEqual(get_schema_version(self.conn), MIGRATIONS[-1].version)
+        indexes = {row[1] for row in self.conn.execute("PRAGMA index_list(tasks)")}
+        self.assertIn("idx_tasks_guild_completed", indexes)
+
+    def test_second_run_is_a_no_op(self):
+        migrate(self.conn)
+        self.assertEqual(migrate(self.conn), [])
+
+    def test_init_db_returns_applied_versions(self):
+        self.assertEqual(init_db(db_name=self.TEST_DB_NAME), [m.version for m in MIGRATIONS])
+        self.assertEqual(init_db(db_name=self.TEST_DB_NAME), [])
+        add_task_db("after migration", db_name=self.TEST_DB_NAME)
+        self.assertEqual(len(get_tasks_db(db_name=self.TEST_DB_NAME)), 1)
+
+    def test_database_created_before_versioning_is_upgraded(self):
+        self.conn.execute("""
+            CREATE TABLE tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, description TEXT NOT NULL, completed INTEGER DEFAULT 0,
+                guild_id INTEGER, channel_id INTEGER
+            )
+        """)
+        self.conn.execute("INSERT INTO tasks (description, guild_id) VALUES ('existing', 5)")
+        self.conn.commit()
+        
+        migrate(self.conn)
+        
+        self.assertEqual(get_schema_version(self.conn), MIGRATIONS[-1].version)
+        self.assertEqual(self.conn.execute("SELECT description, guild_id FROM tasks").fetchall(), [("existing", 5)])
+        self.assertEqual(self.conn.execute("SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH 'existing'").fetchall(), [(1,)])
+
+    def test_search_backfill_does_not_reindex_new_rows(self):
+        migrate(self.conn, MIGRATIONS[:3])
+        self.conn.executemany("INSERT INTO tasks (description) VALUES (?)", [(f"eski {i}",) for i in range(5)])
+        self.conn.commit()
+        
+        search_step = MIGRATIONS[3]
+        def backfill(conn, last_id, batch_size):
+            # Doldurma sürerken eklenen satırları tetikleyici dizinler.
+            conn.execute("INSERT INTO tasks (description) VALUES ('yeni eski')")
+            return search_step.backfill(conn, last_id, batch_size)
+        migrate(self.conn, MIGRATIONS[:3] + [search_step._replace(backfill=backfill)], batch_size=2)
+        
+        total = self.conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM tasks_fts WHERE tasks_fts MATCH 'eski'").fetchone()[0], total)
+        self.conn.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('integrity-check')")
+
+    def test_search_backfill_tolerates_changes_to_unindexed_rows(self):
+        migrate(self.conn, MIGRATIONS[:3])
+        self.conn.executemany("INSERT INTO tasks (description) VALUES (?)", [(f"eski {i}",) for i in range(6)])
+        self.conn.commit()
+
+        search_step = MIGRATIONS[3]
+        def backfill(conn, last_id, batch_size):
+            # Partiler arasında dizinlenmiş ve henüz dizinlenmemiş satırlar değişir.
+            if last_id == 2:
+                conn.execute("DELETE FROM tasks WHERE id IN (1, 4)")
+                conn.execute("UPDATE tasks SET description = 'yeni ' || description WHERE id IN (2, 5)")
+            return search_step.backfill(conn, last_id, batch_size)
+        migrate(self.conn, MIGRATIONS[:3] + [search_step._replace(backfill=backfill)], batch_size=2)
+
+        self.conn.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('integrity-check')")
+        matches = lambda query: [row[0] for row in self.conn.execute(
+            "SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ? ORDER BY rowid", (query,))]
+        self.assertEqual(matches("eski"), [2, 3, 5, 6])
+        self.assertEqual(matches("yeni"), [2, 5])
+        self.conn.execute("DELETE FROM tasks WHERE id = 5")
+        self.assertEqual(matches("yeni"), [2])
+        self.conn.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('integrity-check')")
+
+    def test_newer_schema_is_rejected(self):
+        self.conn.execute(f"PRAGMA user_version = {MIGRATIONS[-1].version + 1}")
+        with self.assertRaises(SchemaVersionError):
+            migrate(self.conn)
+
+    def test_failed_step_is_rolled_back(self):
+        def broken(conn):
+            conn.execute("CREATE TABLE half_done (id INTEGER)")
+            raise RuntimeError("boom")
+
+        steps = [Migration(1, "ok", lambda conn: conn.execute("CREATE TABLE done (id INTEGER)")),
+                 Migration(2, "broken", broken)]
+        with self.assertRaises(RuntimeError):
+            migrate(self.conn, steps)
+        
+        self.assertEqual(get_schema_version(self.conn), 1)
+        tables = {row[0] for row in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        self.assertIn("done", tables)
+        self.assertNotIn("half_done", tables)
+
+    def test_backfill_runs_in_batches_and_resumes(self):
+        self.conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, value INTEGER)")
+        self.conn.executemany("INSERT INTO items (id) VALUES (?)", [(i,) for i in range(1, 11)])
+        self.conn.commit()
+        batches = []
+        fail_after = [2]
+
+        def backfill(conn, last_id, batch_size):
+            if len(batches) == fail_after[0]:
+                raise RuntimeError("interrupted")
+            ids = [row[0] for row in conn.execute(
+                "SELECT id FROM items WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch_size))]
+            if not ids:
+                return None
+            conn.execute("UPDATE items SET value = id * 10 WHERE id BETWEEN ? AND ?", (ids[0], ids[-1]))
+            batches.append(ids)
+            return ids[-1]
+
+        steps = [Migration(1, "value column", None, backfill)]
+        with self.assertRaises(RuntimeError):
+            migrate(self.conn, steps, batch_size=3)
+        self.assertEqual(get_schema_version(self.conn), 0)
+        
+        fail_after[0] = None
+        self.assertEqual(migrate(self.conn, steps, batch_size=3), [1])
+        
+        self.assertEqual(batches, [[1, 2, 3], [4, 5, 6], [7, 8, 9], [10]])
+        self.assertEqual(get_schema_version(self.conn), 1)
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM items WHERE value = id * 10").fetchone()[0], 10)
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM schema_backfill").fetchone()[0], 0)
+
+class TestLegacyUpgrade(unittest.TestCase):
+    TEST_DB_NAME = "test_legacy_upgrade.db"
+
+    def setUp(self):
+        if os.path.exists(self.TEST_DB_NAME):
+            os.remove(self.TEST_DB_NAME)
+        # Sunucu ve kanal sütunlarından önceki init_db'nin oluşturduğu veritabanı.
+        conn = sqlite3.connect(self.TEST_DB_NAME)
+        conn.execute("""
+            CREATE TABLE tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, description TEXT NOT NULL, completed INTEGER DEFAULT 0
+            )
+        """)
+        conn.executemany("INSERT INTO tasks (description, completed) VALUES (?, ?)", [("eski", 0), ("bitti", 1)])
+        conn.commit()
+        conn.close()
+        self.addCleanup(self.cleanup)
+
+    def cleanup(self):
+        close_pool(self.TEST_DB_NAME)
+        if os.path.exists(self.TEST_DB_NAME):
+            os.remove(self.TEST_DB_NAME)
+
+    def test_legacy_tasks_are_unreachable_until_adopted(self):
+        init_db(db_name=self.TEST_DB_NAME)
+        add_task_db("DM görevi", db_name=self.TEST_DB_NAME, channel_id=9)
+        self.assertEqual(get_tasks_db(db_name=self.TEST_DB_NAME, guild_id=123), [])
+
+        self.assertEqual(adopt_legacy_tasks_db(123, db_name=self.TEST_DB_NAME), 2)
+        self.assertEqual(adopt_legacy_tasks_db(123, db_name=self.TEST_DB_NAME), 0)
+
+        self.assertEqual(get_tasks_db(db_name=self.TEST_DB_NAME, guild_id=123), [(1, "eski", 0), (2, "bitti", 1)])
+        self.assertEqual(get_task_counts_db(db_name=self.TEST_DB_NAME, guild_id=123), TaskCounts(2, 1, 1))
+        self.assertIs(complete_task_outcome_db(1, db_name=self.TEST_DB_NAME, guild_id=123), TaskOutcome.COMPLETED)
+        self.assertEqual(get_tasks_db(db_name=self.TEST_DB_NAME, channel_id=9), [(3, "DM görevi", 0)])
+        self.assertEqual(database.check_task_counts_db(db_name=self.TEST_DB_NAME), [])
+
+    def test_prepare_store_adopts_into_configured_channel(self):
+        self.addCleanup(database.configure_storage, database.get_storage_profile())
+        environ = {"TASK_DB_JOURNAL_MODE": "DELETE", "TASK_LEGACY_GUILD_ID": "123", "TASK_LEGACY_CHANNEL_ID": "45"}
+
+        with patch('database.DEFAULT_DB_NAME', self.TEST_DB_NAME):
+            status = prepare_store("sqlite", environ)
+
+        self.assertIn("2 eski görev 123 sunucusuna taşındı", status)
+        self.assertEqual(len(get_tasks_db(db_name=self.TEST_DB_NAME, guild_id=123, channel_id=45)), 2)
+
+if __name__ == '__main__':
+    unittest.main()
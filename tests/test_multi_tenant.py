@@ -0,0 +1,94 @@
+import unittest
+import os
+import sys
+import sqlite3
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import (
+    init_db, add_task_db, add_tasks_db, get_tasks_db, get_tasks_page_db, get_task_by_id_db,
+    delete_task_db, complete_task_outcome_db, complete_tasks_db, delete_tasks_db,
+    clear_tasks_table, close_pool, TaskOutcome,
+)
+
+GUILD_A = 1001
+GUILD_B = 2002
+
+class TestMultiTenant(unittest.TestCase):
+    TEST_DB_NAME = "test_multi_tenant.db"
+
+    @classmethod
+    def setUpClass(cls):
+        if os.path.exists(cls.TEST_DB_NAME):
+            os.remove(cls.TEST_DB_NAME)
+        init_db(db_name=cls.TEST_DB_NAME)
+
+    @classmethod
+    def tearDownClass(cls):
+        close_pool(cls.TEST_DB_NAME)
+        if os.path.exists(cls.TEST_DB_NAME):
+            os.remove(cls.TEST_DB_NAME)
+
+    def setUp(self):
+        clear_tasks_table(db_name=self.TEST_DB_NAME)
+        self.a1 = add_task_db("A task 1", db_name=self.TEST_DB_NAME, guild_id=GUILD_A, channel_id=1)
+        self.b1 = add_task_db("B task 1", db_name=self.TEST_DB_NAME, guild_id=GUILD_B, channel_id=3)
+        self.a2 = add_task_db("A task 2", db_name=self.TEST_DB_NAME, guild_id=GUILD_A, channel_id=2)
+
+    def test_listing_is_scoped_per_guild(self):
+        tasks_a = get_tasks_db(db_name=self.TEST_DB_NAME, guild_id=GUILD_A)
+        tasks_b = get_tasks_db(db_name=self.TEST_DB_NAME, guild_id=GUILD_B)
+        
+        self.assertEqual([task[0] for task in tasks_a], [self.a1, self.a2])
+        self.assertEqual([task[0] for task in tasks_b], [self.b1])
+        self.assertEqual(get_tasks_db(db_name=self.TEST_DB_NAME), [])
+
+    def test_listing_can_be_scoped_per_channel(self):
+        tasks = get_tasks_db(db_name=self.TEST_DB_NAME, guild_id=GUILD_A, channel_id=2)
+        self.assertEqual([task[0] for task in tasks], [self.a2])
+
+    def test_page_is_scoped(self):
+        page = get_tasks_page_db(0, 10, db_name=self.TEST_DB_NAME, guild_id=GUILD_A)
+        self.assertEqual([task[0] for task in page], [self.a1, self.a2])
+
+    def test_other_guild_cannot_see_or_modify_task(self):
+        self.assertIsNone(get_task_by_id_db(self.a1, db_name=self.TEST_DB_NAME, guild_id=GUILD_B))
+        self.assertFalse(delete_task_db(self.a1, db_name=self.TEST_DB_NAME, guild_id=GUILD_B))
+        self.assertIs(
+            complete_task_outcome_db(self.a1, db_name=self.TEST_DB_NAME, guild_id=GUILD_B),
+            TaskOutcome.NOT_FOUND,
+        )
+        self.assertEqual(get_task_by_id_db(self.a1, db_name=self.TEST_DB_NAME, guild_id=GUILD_A)[2], 0)
+
+    def test_batch_operations_are_scoped(self):
+        result = complete_tasks_db([self.a1, self.b1, self.a2], db_name=self.TEST_DB_NAME, guild_id=GUILD_A)
+        self.assertEqual(result.succeeded, [self.a1, self.a2])
+        self.assertEqual(result.missing, [self.b1])
+        
+        result = delete_tasks_db([self.a1, self.b1], db_name=self.TEST_DB_NAME, guild_id=GUILD_B)
+        self.assertEqual(result.succeeded, [self.b1])
+        self.assertEqual(result.missing, [self.a1])
+
+    def test_bulk_add_is_scoped(self):
+        add_tasks_db(["B task 2", "B task 3"], db_name=self.TEST_DB_NAME, guild_id=GUILD_B)
+        self.assertEqual(len(get_tasks_db(db_name=self.TEST_DB_NAME, guild_id=GUILD_B)), 3)
+
+    def test_init_db_upgrades_legacy_table(self):
+        legacy_db = "test_multi_tenant_legacy.db"
+        if os.path.exists(legacy_db):
+            os.remove(legacy_db)
+        conn = sqlite3.connect(legacy_db)
+        conn.execute("CREATE TABLE tasks (id INTEGER PRIMARY KEY AUTOINCREMENT, description TEXT NOT NULL, completed INTEGER DEFAULT 0)")
+        conn.execute("INSERT INTO tasks (description) VALUES ('legacy')")
+        conn.commit()
+        conn.close()
+        try:
+            init_db(db_name=legacy_db)
+            self.assertEqual(get_tasks_db(db_name=legacy_db), [(1, "legacy", 0)])
+            add_task_db("scoped", db_name=legacy_db, guild_id=GUILD_A)
+            self.assertEqual(len(get_tasks_db(db_name=legacy_db, guild_id=GUILD_A)), 1)
+        finally:
+            close_pool(legacy_db)
+            os.remove(legacy_db)
+
+if __name__ == '__main__':
+    unittest.main()
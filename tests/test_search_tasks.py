@@ -0,0 +1,72 @@
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import (
+    init_db, add_task_db, add_tasks_db, delete_task_db, complete_task_db, search_tasks_db,
+    build_search_query, clear_tasks_table, close_pool,
+)
+
+class TestSearchTasks(unittest.TestCase):
+    TEST_DB_NAME = "test_search_tasks.db"
+
+    @classmethod
+    def setUpClass(cls):
+        if os.path.exists(cls.TEST_DB_NAME):
+            os.remove(cls.TEST_DB_NAME)
+        init_db(db_name=cls.TEST_DB_NAME)
+
+    @classmethod
+    def tearDownClass(cls):
+        close_pool(cls.TEST_DB_NAME)
+        if os.path.exists(cls.TEST_DB_NAME):
+            os.remove(cls.TEST_DB_NAME)
+
+    def setUp(self):
+        clear_tasks_table(db_name=self.TEST_DB_NAME)
+
+    def search(self, query, **kwargs):
+        return [row[0] for row in search_tasks_db(query, db_name=self.TEST_DB_NAME, **kwargs)]
+
+    def test_build_search_query(self):
+        self.assertEqual(build_search_query('rapor*  "haftalık toplantı" OR'), '"rapor"* "haftalık toplantı" "OR"')
+        self.assertEqual(build_search_query('a"b'), '"ab"')
+        with self.assertRaises(ValueError):
+            build_search_query(' "" * ')
+
+    def test_word_prefix_and_phrase_queries(self):
+        add_tasks_db(["Haftalık rapor yaz", "Raporları gözden geçir", "Toplantı rapor notları", "Alışveriş"],
+                     db_name=self.TEST_DB_NAME)
+        
+        self.assertEqual(sorted(self.search("rapor")), [1, 3])
+        self.assertEqual(sorted(self.search("rapor*")), [1, 2, 3])
+        self.assertEqual(self.search('"rapor yaz"'), [1])
+        self.assertEqual(self.search("alışveris"), [4])
+        self.assertEqual(self.search("yok"), [])
+
+    def test_results_are_ranked(self):
+        add_tasks_db(["kedi köpek kuş balık hamster", "kedi kedi kedi"], db_name=self.TEST_DB_NAME)
+        self.assertEqual(self.search("kedi"), [2, 1])
+
+    def test_index_follows_writes(self):
+        task_id = add_task_db("Faturayı öde", db_name=self.TEST_DB_NAME)
+        complete_task_db(task_id, db_name=self.TEST_DB_NAME)
+        self.assertEqual(search_tasks_db("fatura*", db_name=self.TEST_DB_NAME), [(task_id, "Faturayı öde", 1)])
+        
+        delete_task_db(task_id, db_name=self.TEST_DB_NAME)
+        self.assertEqual(self.search("fatura*"), [])
+
+    def test_search_is_scoped_and_paginated(self):
+        add_tasks_db([f"ortak görev {i}" for i in range(5)], guild_id=1, db_name=self.TEST_DB_NAME)
+        add_task_db("ortak görev", guild_id=2, db_name=self.TEST_DB_NAME)
+        
+        first = self.search("ortak", guild_id=1, limit=3)
+        rest = self.search("ortak", guild_id=1, offset=3, limit=3)
+        
+        self.assertEqual(len(first), 3)
+        self.assertEqual(sorted(first + rest), [1, 2, 3, 4, 5])
+        self.assertEqual(self.search("ortak", guild_id=2), [6])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+import unittest
+import os
+import sys
+import asyncio
+import tempfile
+import threading
+from concurrent.futures import wait
+from unittest.mock import patch
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import database
+from database import TaskCounts
+from sharded_store import ShardedTaskStore, shard_name
+from storage import SqliteTaskStore
+
+class TestShardName(unittest.TestCase):
+    def test_guild_mode(self):
+        self.assertEqual(shard_name(42), "guild_42")
+        self.assertEqual(shard_name(None), "guild_dm")
+
+    def test_hash_mode_is_stable_and_bounded(self):
+        names = {shard_name(guild_id, "hash", 4) for guild_id in range(1000)}
+        self.assertEqual(names, {"shard_000", "shard_001", "shard_002", "shard_003"})
+        self.assertEqual(shard_name(123, "hash", 4), shard_name(123, "hash", 4))
+        with self.assertRaises(ValueError):
+            shard_name(1, "range")
+
+class TestShardedTaskStore(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def open_store(self, **options):
+        store = ShardedTaskStore(self.directory, **options)
+        self.addCleanup(store.close)
+        return store
+
+    def test_each_guild_gets_its_own_file(self):
+        store = self.open_store()
+
+        async def scenario():
+            await store.add_task("Birinci", guild_id=1)
+            await store.add_task("İkinci", guild_id=2)
+            return await store.get_tasks(guild_id=1), await store.get_tasks(guild_id=2)
+
+        first, second = asyncio.run(scenario())
+        self.assertEqual(first, [(1, "Birinci", 0)])
+        # Her parçanın ID sayacı ayrıdır.
+        self.assertEqual(second, [(1, "İkinci", 0)])
+        self.assertEqual(sorted(name for name in os.listdir(self.directory) if name.endswith(".db")),
+                         ["guild_1.db", "guild_2.db"])
+
+    def test_hash_mode_shares_files_between_guilds(self):
+        store = self.open_store(mode="hash", buckets=2)
+
+        async def scenario():
+            for guild_id in range(10):
+                await store.add_task(f"Sunucu {guild_id}", guild_id=guild_id)
+            return [await store.get_task_counts(guild_id=guild_id) for guild_id in range(10)]
+
+        self.assertEqual(asyncio.run(scenario()), [TaskCounts(1, 1, 0)] * 10)
+        self.assertEqual(len([name for name in os.listdir(self.directory) if name.endswith(".db")]), 2)
+
+    def test_lru_closes_least_recently_used_shard(self):
+        store = self.open_store(max_open_shards=2)
+
+        async def scenario():
+            await store.add_task("A", guild_id=1)
+            await store.add_task("B", guild_id=2)
+            await store.get_tasks(guild_id=1)
+            await store.add_task("C", guild_id=3)
+            return store.open_shards()
+
+        open_shards = asyncio.run(scenario())
+        self.assertEqual(open_shards, [store.shard_path(1), store.shard_path(3)])
+        wait(list(store._closing.values()))
+        self.assertNotIn(store.shard_path(2), database._pools)
+        # Kapatılan parça yeniden açılır ve verisi korunur.
+        self.assertEqual(asyncio.run(store.get_tasks(guild_id=2)), [(1, "B", 0)])
+
+    def test_evicted_shard_is_closed_off_the_event_loop(self):
+        store = self.open_store(max_open_shards=1)
+        threads = []
+        original = SqliteTaskStore.close
+
+        def close(shard):
+            threads.append(threading.current_thread().name)
+            original(shard)
+
+        async def scenario():
+            await store.add_task("A", guild_id=1)
+            await store.add_task("B", guild_id=2)
+            # Kapanmakta olan parça yeniden açılınca kapanışın bitmesi beklenir.
+            return await store.get_tasks(guild_id=1)
+
+        with patch.object(SqliteTaskStore, 'close', close):
+            self.assertEqual(asyncio.run(scenario()), [(1, "A", 0)])
+            wait(list(store._closing.values()))
+        self.assertEqual(len(threads), 2)
+        self.assertTrue(all(name.startswith("task-shard") for name in threads))
+
+    def test_open_shards_get_a_checkpointer(self):
+        self.addCleanup(database.configure_storage, database.get_storage_profile())
+        database.configure_storage(database.get_storage_profile()._replace(journal_mode="WAL"))
+        store = self.open_store(max_open_shards=1)
+
+        async def scenario():
+            await store.add_task("A", guild_id=1)
+            await store.add_task("B", guild_id=2)
+
+        asyncio.run(scenario())
+        wait(list(store._closing.values()))
+        self.assertIn(store.shard_path(2), database._checkpointers)
+        self.assertNotIn(store.shard_path(1), database._checkpointers)
+
+    def test_busy_shard_is_not_evicted(self):
+        store = self.open_store(max_open_shards=1)
+
+        async def scenario():
+            gate = asyncio.Event()
+            shard = store._open(1).store
+            original = shard.get_tasks
+
+            async def slow_get_tasks(**kwargs):
+                await gate.wait()
+                return await original(**kwargs)
+
+            shard.get_tasks = slow_get_tasks
+            slow = asyncio.ensure_future(store.get_tasks(guild_id=1))
+            await asyncio.sleep(0)
+            await store.add_task("Diğer", guild_id=2)
+            # Sınır aşıldı ama meşgul olan 1. parça değil, boştaki 2. parça kapatıldı.
+            during = store.open_shards()
+            gate.set()
+            return during, await slow
+
+        during, tasks = asyncio.run(scenario())
+        self.assertEqual(during, [store.shard_path(1)])
+        self.assertEqual(tasks, [])
+
+    def test_boards_are_routed_by_guild(self):
+        store = self.open_store()
+
+        async def scenario():
+            await store.set_board(10, 100, guild_id=1)
+            missing = await store.delete_board(10, guild_id=2)
+            removed = await store.delete_board(10, guild_id=1)
+            return missing, removed
+
+        self.assertEqual(asyncio.run(scenario()), (False, True))
+
+if __name__ == '__main__':
+    unittest.main()
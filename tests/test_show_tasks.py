@@ -1,9 +1,10 @@
 import unittest
 import os
 import sys
+from unittest.mock import patch
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from database import init_db, add_task_db, get_tasks_db, complete_task_db, clear_tasks_table
+from database import init_db, add_task_db, add_tasks_db, get_tasks_db, get_tasks_page_db, complete_task_db, clear_tasks_table, close_pool
 
 class TestShowTasks(unittest.TestCase):
     TEST_DB_NAME = "test_show_tasks.db"
@@ -16,6 +17,7 @@ class TestShowTasks(unittest.TestCase):
 
     @classmethod
     def tearDownClass(cls):
+        close_pool(cls.TEST_DB_NAME)
         if os.path.exists(cls.TEST_DB_NAME):
             os.remove(cls.TEST_DB_NAME)
 
@@ -192,6 +194,65 @@ class TestShowTasks(unittest.TestCase):
         self.assertIsInstance(task[1], str)
         self.assertIsInstance(task[2], int)
 
+    def test_show_tasks_page(self):
+        add_tasks_db([f"Task {i}" for i in range(1, 11)], db_name=self.TEST_DB_NAME)
+        
+        first_page = get_tasks_page_db(0, 4, db_name=self.TEST_DB_NAME)
+        second_page = get_tasks_page_db(first_page[-1][0], 4, db_name=self.TEST_DB_NAME)
+        last_page = get_tasks_page_db(8, 4, db_name=self.TEST_DB_NAME)
+        
+        self.assertEqual([task[0] for task in first_page], [1, 2, 3, 4])
+        self.assertEqual([task[0] for task in second_page], [5, 6, 7, 8])
+        self.assertEqual([task[0] for task in last_page], [9, 10])
+        self.assertEqual(get_tasks_page_db(10, 4, db_name=self.TEST_DB_NAME), [])
+
+    def test_show_tasks_page_skips_deleted_rows(self):
+        from database import delete_task_db
+        add_tasks_db([f"Task {i}" for i in range(1, 6)], db_name=self.TEST_DB_NAME)
+        delete_task_db(3, db_name=self.TEST_DB_NAME)
+        
+        page = get_tasks_page_db(2, 2, db_name=self.TEST_DB_NAME)
+        
+        self.assertEqual([task[0] for task in page], [4, 5])
+
+    def test_status_filters(self):
+        from database import task_cache
+        add_tasks_db([f"Task {i}" for i in range(1, 7)], db_name=self.TEST_DB_NAME)
+        for task_id in (2, 4):
+            complete_task_db(task_id, db_name=self.TEST_DB_NAME)
+        
+        # Önbellekten ve doğrudan SQL'den aynı sonuç gelmeli; sınır 0 iken
+        # kiracı önbelleğe sığmaz ve sorgular `completed = ...` koşuluyla SQL'e gider.
+        for max_tenant_rows in (task_cache.max_tenant_rows, 0):
+            with self.subTest(max_tenant_rows=max_tenant_rows), \
+                 patch.object(task_cache, 'max_tenant_rows', max_tenant_rows):
+                task_cache.invalidate(self.TEST_DB_NAME)
+                tenants = task_cache.stats()["tenants"]
+                self.assertEqual([t[0] for t in get_tasks_db(db_name=self.TEST_DB_NAME, status="open")], [1, 3, 5, 6])
+                self.assertEqual([t[0] for t in get_tasks_db(db_name=self.TEST_DB_NAME, status="done")], [2, 4])
+                self.assertEqual([t[0] for t in get_tasks_page_db(1, 2, db_name=self.TEST_DB_NAME, status="open")], [3, 5])
+                self.assertEqual([t[0] for t in get_tasks_page_db(0, 5, db_name=self.TEST_DB_NAME, status="done")], [2, 4])
+                self.assertEqual(len(get_tasks_db(db_name=self.TEST_DB_NAME, status="all")), 6)
+                self.assertEqual(task_cache.stats()["tenants"] - tenants, 1 if max_tenant_rows else 0)
+        task_cache.invalidate(self.TEST_DB_NAME)
+        with self.assertRaises(ValueError):
+            get_tasks_db(db_name=self.TEST_DB_NAME, status="later")
+
+    def test_open_task_queries_only_touch_open_rows(self):
+        from database import get_db_connection
+        conn = get_db_connection(self.TEST_DB_NAME)
+        try:
+            for scope, index in (("guild_id IS ?", "idx_tasks_guild_completed"),
+                                 ("guild_id IS ? AND channel_id = ?", "idx_tasks_open_channel")):
+                params = (1,) * (scope.count("?") + 1)
+                plan = " ".join(row[3] for row in conn.execute(
+                    f"EXPLAIN QUERY PLAN SELECT id, description, completed FROM tasks "
+                    f"WHERE {scope} AND completed = 0 AND id > ? ORDER BY id ASC LIMIT 20", params))
+                self.assertIn(index, plan)
+                self.assertNotIn("TEMP B-TREE", plan)
+        finally:
+            conn.close()
+
     def test_show_tasks_with_print(self):
         print("Testing show_tasks() function.")
         print("Database connection is initialized.")
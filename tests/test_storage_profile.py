@@ -0,0 +1,118 @@
+import unittest
+import os
+import sys
+import time
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from checkpointer import WalCheckpointer
+from dbconfig import DEFAULT_PROFILE, load_profile
+from database import (
+    init_db, add_task_db, get_db_connection, configure_storage, get_storage_profile,
+    enable_checkpointer, disable_checkpointer, close_pool,
+)
+
+class TestStorageProfile(unittest.TestCase):
+    TEST_DB_NAME = "test_storage_profile.db"
+
+    def setUp(self):
+        if os.path.exists(self.TEST_DB_NAME):
+            os.remove(self.TEST_DB_NAME)
+        init_db(db_name=self.TEST_DB_NAME)
+
+    def tearDown(self):
+        configure_storage(DEFAULT_PROFILE)
+        disable_checkpointer(self.TEST_DB_NAME)
+        close_pool(self.TEST_DB_NAME)
+        if os.path.exists(self.TEST_DB_NAME):
+            os.remove(self.TEST_DB_NAME)
+
+    def test_load_profile_from_file_and_env(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".ini", delete=False, encoding="utf-8") as f:
+            f.write("[storage]\nsynchronous = full\ncache_size = -2000\n")
+        try:
+            profile = load_profile(environ={"TASK_DB_CONFIG": f.name, "TASK_DB_CACHE_SIZE": "-4000"})
+        finally:
+            os.remove(f.name)
+        
+        self.assertEqual(profile.synchronous, "FULL")
+        self.assertEqual(profile.cache_size, -4000)
+        self.assertEqual(profile.journal_mode, DEFAULT_PROFILE.journal_mode)
+        self.assertEqual(load_profile(environ={}), DEFAULT_PROFILE)
+        # Varsayılanlarda arka plan checkpoint'i commit eden thread'den önce davranır.
+        self.assertGreater(DEFAULT_PROFILE.wal_autocheckpoint, DEFAULT_PROFILE.checkpoint_pages)
+        with self.assertRaises(ValueError):
+            load_profile(environ={"TASK_DB_JOURNAL_MODE": "wal; DROP TABLE tasks"})
+        for field in ("TASK_DB_CHECKPOINT_INTERVAL", "TASK_DB_CHECKPOINT_PAGES"):
+            for value in ("0", "-1"):
+                with self.subTest(field=field, value=value), self.assertRaises(ValueError):
+                    load_profile(environ={field: value})
+
+    def test_connections_use_profile(self):
+        conn = get_db_connection(self.TEST_DB_NAME)
+        try:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)
+            self.assertEqual(conn.execute("PRAGMA temp_store").fetchone()[0], 2)
+            self.assertEqual(conn.execute("PRAGMA busy_timeout").fetchone()[0], DEFAULT_PROFILE.busy_timeout)
+            self.assertEqual(conn.execute("PRAGMA cache_size").fetchone()[0], DEFAULT_PROFILE.cache_size)
+        finally:
+            conn.close()
+
+    def test_readers_do_not_wait_for_an_open_write(self):
+        add_task_db("committed", db_name=self.TEST_DB_NAME)
+        writer = get_db_connection(self.TEST_DB_NAME)
+        reader = get_db_connection(self.TEST_DB_NAME)
+        try:
+            writer.execute("BEGIN IMMEDIATE")
+            writer.execute("INSERT INTO tasks (description) VALUES ('pending')")
+            start = time.monotonic()
+            rows = reader.execute("SELECT description FROM tasks").fetchall()
+            self.assertLess(time.monotonic() - start, 0.5)
+            self.assertEqual(rows, [("committed",)])
+            writer.rollback()
+        finally:
+            writer.close()
+            reader.close()
+
+    def test_background_checkpoint(self):
+        configure_storage(get_storage_profile()._replace(checkpoint_interval=0.05))
+        checkpointer = enable_checkpointer(self.TEST_DB_NAME, poll_interval=0.01)
+        add_task_db("to checkpoint", db_name=self.TEST_DB_NAME)
+        
+        deadline = time.monotonic() + 2
+        while not checkpointer.checkpoints and time.monotonic() < deadline:
+            time.sleep(0.01)
+        
+        self.assertGreaterEqual(checkpointer.checkpoints, 1)
+        self.assertIs(enable_checkpointer(self.TEST_DB_NAME), checkpointer)
+
+    def test_interval_is_honoured_after_a_large_wal(self):
+        # PASSIVE checkpoint WAL dosyasını küçültmez; eşik dosya boyutuna değil
+        # son checkpoint'ten beri yazılan çerçevelere bakmalı.
+        configure_storage(get_storage_profile()._replace(wal_autocheckpoint=0))
+        writer = get_db_connection(self.TEST_DB_NAME)
+        self.addCleanup(writer.close)
+        writer.executemany("INSERT INTO tasks (description) VALUES (?)", [("x" * 1000,) for _ in range(4000)])
+        writer.commit()
+        writer.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        self.assertGreater(os.path.getsize(self.TEST_DB_NAME + "-wal"), 4 * 1024 * 1024)
+
+        checkpointer = WalCheckpointer(lambda: get_db_connection(self.TEST_DB_NAME), self.TEST_DB_NAME + "-wal",
+                                       interval=3600, max_pages=200, poll_interval=0.01)
+        self.addCleanup(checkpointer.close)
+        for number in range(5):
+            writer.execute("INSERT INTO tasks (description) VALUES (?)", (f"küçük {number}",))
+            writer.commit()
+            time.sleep(0.05)
+        self.assertEqual(checkpointer.checkpoints, 0)
+
+        writer.executemany("INSERT INTO tasks (description) VALUES (?)", [("y" * 1000,) for _ in range(2000)])
+        writer.commit()
+        deadline = time.monotonic() + 2
+        while not checkpointer.checkpoints and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(checkpointer.checkpoints, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+import unittest
+import os
+import sys
+import asyncio
+from unittest.mock import Mock, AsyncMock, patch
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from board import Debouncer
+from bot import BotConfig
+from database import (
+    init_db, set_board_db, get_boards_db, delete_board_db, close_pool, TaskCounts,
+)
+from memory_store import MemoryTaskStore
+from rendering import MESSAGE_LIMIT, render_board
+
+class TestDebouncer(unittest.TestCase):
+    def test_burst_is_coalesced_into_one_flush(self):
+        flushed = []
+
+        async def flush(key):
+            flushed.append(key)
+
+        async def scenario():
+            debouncer = Debouncer(flush, delay=0.02)
+            for _ in range(50):
+                debouncer.schedule("a")
+            debouncer.schedule("b")
+            await debouncer.wait()
+
+        asyncio.run(scenario())
+        self.assertEqual(sorted(flushed), ["a", "b"])
+
+    def test_change_during_flush_triggers_another_flush(self):
+        flushed = []
+
+        async def scenario():
+            debouncer = Debouncer(None, delay=0.01)
+
+            async def flush(key):
+                flushed.append(key)
+                if len(flushed) == 1:
+                    debouncer.schedule(key)
+                    raise RuntimeError("Discord hatası")
+
+            debouncer._flush = flush
+            debouncer.schedule("a")
+            await debouncer.wait()
+
+        asyncio.run(scenario())
+        self.assertEqual(flushed, ["a", "a"])
+
+class TestBoardRendering(unittest.TestCase):
+    def test_board_lists_open_tasks_and_counts(self):
+        text = render_board([(1, "Yaz", 0), (3, "Oku", 0)], TaskCounts(5, 3, 2))
+        
+        self.assertTrue(text.startswith("📌 **Görev Panosu**"))
+        self.assertIn("1: Yaz ❌\n3: Oku ❌\n… ve 1 açık görev daha\n", text)
+        self.assertTrue(text.endswith("Toplam: 5 • ❌ Açık: 3 • ✅ Tamamlanan: 2"))
+
+    def test_board_fits_message_limit(self):
+        tasks = [(i, "A" * 300, 0) for i in range(30)]
+        text = render_board(tasks, TaskCounts(1000, 1000, 0))
+        self.assertLessEqual(len(text), MESSAGE_LIMIT)
+        self.assertIn("açık görev daha", text)
+        self.assertIn("Açık görev yok", render_board([], TaskCounts(0, 0, 0)))
+
+class TestBoardStorage(unittest.TestCase):
+    TEST_DB_NAME = "test_task_board.db"
+
+    @classmethod
+    def setUpClass(cls):
+        if os.path.exists(cls.TEST_DB_NAME):
+            os.remove(cls.TEST_DB_NAME)
+        init_db(db_name=cls.TEST_DB_NAME)
+
+    @classmethod
+    def tearDownClass(cls):
+        close_pool(cls.TEST_DB_NAME)
+        if os.path.exists(cls.TEST_DB_NAME):
+            os.remove(cls.TEST_DB_NAME)
+
+    def test_boards_are_stored_per_channel_and_scope(self):
+        self.assertIsNone(set_board_db(10, 100, db_name=self.TEST_DB_NAME, guild_id=1))
+        set_board_db(11, 110, db_name=self.TEST_DB_NAME, guild_id=1)
+        set_board_db(12, 120, db_name=self.TEST_DB_NAME, guild_id=1, channel_id=12)
+        self.assertEqual(set_board_db(10, 101, db_name=self.TEST_DB_NAME, guild_id=1), 100)
+        
+        self.assertEqual(sorted(get_boards_db(db_name=self.TEST_DB_NAME, guild_id=1)), [(10, 101), (11, 110)])
+        self.assertEqual(get_boards_db(db_name=self.TEST_DB_NAME, guild_id=1, channel_id=12), [(12, 120)])
+        
+        self.assertTrue(delete_board_db(11, db_name=self.TEST_DB_NAME))
+        self.assertFalse(delete_board_db(11, db_name=self.TEST_DB_NAME))
+        self.assertEqual(get_boards_db(db_name=self.TEST_DB_NAME, guild_id=1), [(10, 101)])
+
+class TestBoardCommands(unittest.TestCase):
+    def setUp(self):
+        self.store = MemoryTaskStore()
+        self.mock_ctx = Mock()
+        self.mock_ctx.bot.store = self.store
+        self.mock_ctx.bot.config = BotConfig()
+        self.mock_ctx.send = AsyncMock()
+        self.mock_ctx.guild.id = 42
+        self.mock_ctx.channel.id = 7
+        self.scope = {"guild_id": 42, "channel_id": None}
+
+    def test_pin_board_posts_pins_and_records_message(self):
+        from bot import pin_board
+        message = Mock(id=500)
+        message.pin = AsyncMock()
+        self.mock_ctx.send.return_value = message
+        old_message = Mock()
+        old_message.unpin = AsyncMock()
+        self.mock_ctx.channel.get_partial_message.return_value = old_message
+        
+        with patch('bot.render_board_text', new_callable=AsyncMock, return_value="pano"), \
+             patch.object(self.store, 'set_board', new_callable=AsyncMock, return_value=400) as mock_set_board:
+            asyncio.run(pin_board(self.mock_ctx))
+        
+        self.mock_ctx.send.assert_called_once_with("pano")
+        mock_set_board.assert_called_once_with(7, 500, **self.scope)
+        message.pin.assert_awaited_once()
+        self.mock_ctx.channel.get_partial_message.assert_called_once_with(400)
+        old_message.unpin.assert_awaited_once()
+
+    def test_pin_board_off(self):
+        from bot import pin_board
+        
+        with patch.object(self.store, 'delete_board', new_callable=AsyncMock, return_value=True) as mock_delete_board:
+            asyncio.run(pin_board(self.mock_ctx, "off"))
+        
+        mock_delete_board.assert_called_once_with(7, guild_id=42)
+        self.mock_ctx.send.assert_called_once_with("📌 Görev panosu kaldırıldı; artık güncellenmeyecek.")
+
+    def test_refresh_edits_boards_and_forgets_deleted_messages(self):
+        import discord
+        from bot import refresh_boards
+        live, gone = Mock(), Mock()
+        live.edit = AsyncMock()
+        gone.edit = AsyncMock(side_effect=discord.NotFound(Mock(status=404), "Unknown Message"))
+        channel = Mock()
+        channel.get_partial_message.side_effect = lambda message_id: live if message_id == 100 else gone
+        
+        with patch.object(self.store, 'get_boards', new_callable=AsyncMock, return_value=[(10, 100), (11, 110)]), \
+             patch('bot.render_board_text', new_callable=AsyncMock, return_value="pano") as mock_render, \
+             patch.object(self.store, 'delete_board', new_callable=AsyncMock) as mock_delete_board, \
+             patch.object(self.mock_ctx.bot, 'get_channel', return_value=channel):
+            asyncio.run(refresh_boards(self.mock_ctx.bot, (42, None)))
+        
+        mock_render.assert_awaited_once_with(self.store, self.scope)
+        live.edit.assert_awaited_once_with(content="pano")
+        mock_delete_board.assert_called_once_with(11, guild_id=42)
+
+    def test_board_text_reflects_store(self):
+        from bot import render_board_text
+        
+        async def scenario():
+            first = await self.store.add_task("Süt al", **self.scope)
+            await self.store.add_task("Ekmek al", **self.scope)
+            await self.store.complete_task(first, **self.scope)
+            return await render_board_text(self.store, self.scope)
+        
+        text = asyncio.run(scenario())
+        self.assertIn("Ekmek al", text)
+        self.assertNotIn("Süt al", text)
+        self.assertIn("Toplam: 2", text)
+
+    def test_mutations_schedule_board_update(self):
+        from bot import add_task
+        
+        with patch.object(self.store, 'add_task', new_callable=AsyncMock, return_value=1):
+            asyncio.run(add_task(self.mock_ctx, description="Yeni"))
+        
+        self.mock_ctx.bot.board_updates.schedule.assert_called_once_with((42, None))
+
+if __name__ == '__main__':
+    unittest.main()
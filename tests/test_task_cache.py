@@ -0,0 +1,280 @@
+import unittest
+import os
+import sys
+from unittest.mock import patch
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import database
+from cache import TaskCache, ROW_OVERHEAD_BYTES
+from rendering import RenderedTaskList
+from database import (
+    init_db, add_task_db, add_tasks_db, get_tasks_db, get_tasks_page_db, get_task_by_id_db,
+    complete_task_db, complete_tasks_db, delete_task_db, clear_tasks_table, close_pool,
+    render_tasks_page_db,
+    task_cache, enable_write_coordinator, disable_write_coordinator,
+)
+
+def loader_for(rows, calls=None):
+    def load(limit):
+        if calls is not None:
+            calls.append(limit)
+        return rows[:limit]
+    return load
+
+class TestTaskCache(unittest.TestCase):
+    KEY = ("db", 1, None)
+
+    def test_hit_and_miss_counters(self):
+        cache = TaskCache()
+        calls = []
+        rows = [(1, "a", 0), (2, "b", 1)]
+        
+        self.assertEqual(cache.get_tasks(self.KEY, loader_for(rows, calls)), rows)
+        self.assertEqual(cache.get_tasks(self.KEY, loader_for(rows, calls)), rows)
+        
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_page_served_from_cache(self):
+        cache = TaskCache()
+        rows = [(i, f"t{i}", 0) for i in range(1, 11)]
+        cache.get_tasks(self.KEY, loader_for(rows))
+        
+        page = cache.get_page(self.KEY, 4, 3, loader_for([]))
+        
+        self.assertEqual([row[0] for row in page], [5, 6, 7])
+
+    def test_lru_eviction_respects_memory_cap(self):
+        cache = TaskCache(max_bytes=2 * (ROW_OVERHEAD_BYTES + 1))
+        cache.get_tasks(("db", 1, None), loader_for([(1, "a", 0)]))
+        cache.get_tasks(("db", 2, None), loader_for([(2, "b", 0)]))
+        cache.get_tasks(("db", 1, None), loader_for([]))
+        cache.get_tasks(("db", 3, None), loader_for([(3, "c", 0)]))
+        
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertEqual(cache.get_task(("db", 2, None), 2), (False, None))
+        self.assertEqual(cache.get_task(("db", 1, None), 1), (True, (1, "a", 0)))
+
+    def test_large_tenant_is_not_cached(self):
+        cache = TaskCache(max_tenant_rows=5)
+        rows = [(i, "x", 0) for i in range(10)]
+        
+        self.assertIsNone(cache.get_tasks(self.KEY, loader_for(rows)))
+        self.assertEqual(cache.stats()["tenants"], 0)
+
+    def test_oversized_tenant_is_loaded_once(self):
+        cache = TaskCache(max_tenant_rows=5)
+        calls = []
+        rows = [(i, "x", 0) for i in range(1, 8)]
+        
+        for _ in range(3):
+            self.assertIsNone(cache.get_tasks(self.KEY, loader_for(rows, calls)))
+            self.assertIsNone(cache.render_page(self.KEY, 0, 3, loader_for(rows, calls)))
+        cache.add("db", 1, None, [(8, "y", 0)])
+        cache.mark_completed("db", 1, [1])
+        cache.get_page(self.KEY, 0, 3, loader_for(rows, calls))
+        
+        self.assertEqual(len(calls), 1)
+        
+        # Silmeler bilinen alt sınırı düşürür; sınıra inen kiracı yeniden yüklenir.
+        cache.remove("db", 1, [1])
+        cache.get_page(self.KEY, 0, 3, loader_for(rows, calls))
+        cache.remove("db", 1, [2])
+        self.assertEqual(cache.get_page(self.KEY, 0, 3, loader_for(rows[2:], calls)), rows[2:5])
+        self.assertEqual(len(calls), 3)
+
+    def test_invalidate_forgets_oversized_tenants(self):
+        cache = TaskCache(max_tenant_rows=1)
+        calls = []
+        cache.get_tasks(self.KEY, loader_for([(1, "a", 0), (2, "b", 0)], calls))
+        cache.invalidate("db")
+        
+        self.assertEqual(cache.get_tasks(self.KEY, loader_for([(1, "a", 0)], calls)), [(1, "a", 0)])
+        self.assertEqual(len(calls), 2)
+
+    def test_writes_update_entries_in_place(self):
+        cache = TaskCache()
+        cache.get_tasks(("db", 1, None), loader_for([(1, "a", 0), (2, "b", 0)]))
+        cache.get_tasks(("db", 1, 7), loader_for([(2, "b", 0)]))
+        
+        cache.add("db", 1, 7, [(3, "c", 0)])
+        cache.add("db", 1, None, [(4, "d", 0)])
+        cache.mark_completed("db", 1, [2])
+        cache.remove("db", 1, [1])
+        
+        self.assertEqual(cache.get_tasks(("db", 1, None), None), [(2, "b", 1), (3, "c", 0), (4, "d", 0)])
+        self.assertEqual(cache.get_tasks(("db", 1, 7), None), [(2, "b", 1), (3, "c", 0)])
+
+    def test_load_racing_with_write_is_not_stored(self):
+        cache = TaskCache()
+        
+        def racing_loader(limit):
+            cache.add("db", 1, None, [(2, "new", 0)])
+            return [(1, "old", 0)]
+        
+        cache.get_tasks(self.KEY, racing_loader)
+        
+        self.assertEqual(cache.stats()["tenants"], 0)
+
+    def test_rendered_pages_rebuilt_only_when_touched(self):
+        cache = TaskCache()
+        rows = [(i, f"t{i}", 0) for i in range(1, 7)]
+        cache.get_tasks(self.KEY, loader_for(rows))
+        first = cache.render_page(self.KEY, 0, 3, loader_for([]))
+        second = cache.render_page(self.KEY, 3, 3, loader_for([]))
+        
+        cache.mark_completed("db", 1, [5])
+        
+        self.assertIs(cache.render_page(self.KEY, 0, 3, loader_for([])), first)
+        rebuilt = cache.render_page(self.KEY, 3, 3, loader_for([]))
+        self.assertIsNot(rebuilt, second)
+        self.assertIn("5: t5 ✅", rebuilt.text)
+        
+        cache.add("db", 1, None, [(7, "t7", 0)])
+        
+        self.assertIs(cache.render_page(self.KEY, 0, 3, loader_for([])), first)
+        self.assertTrue(cache.render_page(self.KEY, 3, 3, loader_for([])).has_more)
+
+    def test_rendered_text_counts_toward_memory_cap(self):
+        cache = TaskCache()
+        rows = [(i, f"t{i}", 0) for i in range(1, 7)]
+        cache.get_tasks(self.KEY, loader_for(rows))
+        rows_only = cache.stats()["bytes"]
+        
+        page = cache.render_page(self.KEY, 0, 3, loader_for([]))
+        rendered = cache.stats()["bytes"]
+        self.assertGreater(rendered, rows_only + len(page.text))
+        
+        cache.mark_completed("db", 1, [2])
+        self.assertLess(cache.stats()["bytes"], rendered)
+        cache.remove("db", 1, [1, 2, 3, 4, 5, 6])
+        self.assertEqual(cache.stats()["bytes"], 0)
+        
+        cache.max_bytes = rows_only
+        cache.get_tasks(self.KEY, loader_for(rows))
+        cache.invalidate("db")
+        cache.get_tasks(self.KEY, loader_for(rows))
+        cache.render_page(self.KEY, 0, 3, loader_for([]))
+        self.assertEqual(cache.stats()["tenants"], 0)
+        self.assertEqual(cache.stats()["bytes"], 0)
+
+    def test_rendered_pages_are_capped(self):
+        rows = [(i, f"t{i}", 0) for i in range(1, 101)]
+        view = RenderedTaskList(max_pages=3)
+        pages = [view.page(after_id, 1, lambda limit, after_id=after_id: rows[after_id:after_id + limit])
+                 for after_id in range(10)]
+        
+        self.assertEqual(len(view._pages), 3)
+        self.assertIs(view.page(9, 1, None), pages[9])
+        for task_id in range(1, 101):
+            view.task_changed(task_id)
+        self.assertEqual(view.size, 0)
+
+    def test_invalidate(self):
+        cache = TaskCache()
+        cache.get_tasks(self.KEY, loader_for([(1, "a", 0)]))
+        cache.invalidate("db")
+        self.assertEqual(cache.stats()["tenants"], 0)
+        self.assertEqual(cache.stats()["bytes"], 0)
+
+class TestDatabaseCacheIntegration(unittest.TestCase):
+    TEST_DB_NAME = "test_task_cache.db"
+
+    @classmethod
+    def setUpClass(cls):
+        if os.path.exists(cls.TEST_DB_NAME):
+            os.remove(cls.TEST_DB_NAME)
+        init_db(db_name=cls.TEST_DB_NAME)
+
+    @classmethod
+    def tearDownClass(cls):
+        close_pool(cls.TEST_DB_NAME)
+        if os.path.exists(cls.TEST_DB_NAME):
+            os.remove(cls.TEST_DB_NAME)
+
+    def setUp(self):
+        clear_tasks_table(db_name=self.TEST_DB_NAME)
+
+    def tearDown(self):
+        disable_write_coordinator(self.TEST_DB_NAME)
+
+    def _assert_cache_matches_disk(self):
+        cached = get_tasks_db(db_name=self.TEST_DB_NAME)
+        task_cache.invalidate(self.TEST_DB_NAME)
+        self.assertEqual(cached, get_tasks_db(db_name=self.TEST_DB_NAME))
+
+    def test_repeated_reads_are_hits(self):
+        add_task_db("Task", db_name=self.TEST_DB_NAME)
+        get_tasks_db(db_name=self.TEST_DB_NAME)
+        hits = task_cache.stats()["hits"]
+        
+        get_tasks_db(db_name=self.TEST_DB_NAME)
+        get_tasks_page_db(0, 10, db_name=self.TEST_DB_NAME)
+        get_task_by_id_db(1, db_name=self.TEST_DB_NAME)
+        
+        self.assertEqual(task_cache.stats()["hits"], hits + 3)
+
+    def test_mutations_keep_cache_consistent(self):
+        add_tasks_db(["A", "B", "C", "D"], db_name=self.TEST_DB_NAME)
+        get_tasks_db(db_name=self.TEST_DB_NAME)
+        
+        add_task_db("E", db_name=self.TEST_DB_NAME)
+        complete_task_db(2, db_name=self.TEST_DB_NAME)
+        complete_tasks_db([3, 4], db_name=self.TEST_DB_NAME)
+        delete_task_db(1, db_name=self.TEST_DB_NAME)
+        
+        self.assertEqual(get_task_by_id_db(2, db_name=self.TEST_DB_NAME), (2, "B", 1))
+        self.assertIsNone(get_task_by_id_db(1, db_name=self.TEST_DB_NAME))
+        self._assert_cache_matches_disk()
+
+    def test_group_commit_writes_update_cache(self):
+        get_tasks_db(db_name=self.TEST_DB_NAME)
+        enable_write_coordinator(self.TEST_DB_NAME)
+        
+        task_id = add_task_db("Grouped", db_name=self.TEST_DB_NAME)
+        complete_task_db(task_id, db_name=self.TEST_DB_NAME)
+        
+        self.assertEqual(get_tasks_db(db_name=self.TEST_DB_NAME), [(task_id, "Grouped", 1)])
+        self._assert_cache_matches_disk()
+
+    def test_rendered_page_matches_disk(self):
+        add_tasks_db(["A", "B", "C"], db_name=self.TEST_DB_NAME)
+        render_tasks_page_db(0, 2, db_name=self.TEST_DB_NAME)
+        
+        complete_task_db(1, db_name=self.TEST_DB_NAME)
+        delete_task_db(2, db_name=self.TEST_DB_NAME)
+        cached = render_tasks_page_db(0, 2, db_name=self.TEST_DB_NAME)
+        task_cache.invalidate(self.TEST_DB_NAME)
+        
+        self.assertEqual(cached, render_tasks_page_db(0, 2, db_name=self.TEST_DB_NAME))
+        self.assertEqual(cached.text, "📋 **Görev Listesi:**\n1: A ✅\n3: C ❌\n")
+        self.assertFalse(cached.has_more)
+
+    def test_oversized_tenant_pages_go_straight_to_sql(self):
+        add_tasks_db([f"Task {i}" for i in range(10)], db_name=self.TEST_DB_NAME)
+        loads = []
+        tenant_loader = database._tenant_loader
+        
+        def counting_loader(*args):
+            load = tenant_loader(*args)
+            return lambda limit: loads.append(limit) or load(limit)
+        
+        with patch.object(task_cache, 'max_tenant_rows', 5), \
+             patch('database._tenant_loader', side_effect=counting_loader):
+            pages = [render_tasks_page_db(0, 3, db_name=self.TEST_DB_NAME) for _ in range(3)]
+            page = get_tasks_page_db(3, 3, db_name=self.TEST_DB_NAME)
+        
+        self.assertEqual(loads, [6])
+        self.assertEqual(pages[0].text, pages[2].text)
+        self.assertTrue(pages[0].has_more)
+        self.assertEqual([row[0] for row in page], [4, 5, 6])
+
+    def test_clear_invalidates_cache(self):
+        add_task_db("Task", db_name=self.TEST_DB_NAME)
+        get_tasks_db(db_name=self.TEST_DB_NAME)
+        clear_tasks_table(db_name=self.TEST_DB_NAME)
+        self.assertEqual(get_tasks_db(db_name=self.TEST_DB_NAME), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import (
+    init_db, add_task_db, add_tasks_db, complete_task_db, complete_tasks_db, delete_task_db, delete_tasks_db,
+    get_task_counts_db, check_task_counts_db, rebuild_task_counts_db, get_db_connection,
+    clear_tasks_table, close_pool, TaskCounts,
+)
+
+class TestTaskCounts(unittest.TestCase):
+    TEST_DB_NAME = "test_task_counts.db"
+
+    @classmethod
+    def setUpClass(cls):
+        if os.path.exists(cls.TEST_DB_NAME):
+            os.remove(cls.TEST_DB_NAME)
+        init_db(db_name=cls.TEST_DB_NAME)
+
+    @classmethod
+    def tearDownClass(cls):
+        close_pool(cls.TEST_DB_NAME)
+        if os.path.exists(cls.TEST_DB_NAME):
+            os.remove(cls.TEST_DB_NAME)
+
+    def setUp(self):
+        clear_tasks_table(db_name=self.TEST_DB_NAME)
+
+    def counts(self, **scope):
+        return get_task_counts_db(db_name=self.TEST_DB_NAME, **scope)
+
+    def test_empty_scope(self):
+        self.assertEqual(self.counts(), TaskCounts(0, 0, 0))
+        self.assertEqual(self.counts(guild_id=99), TaskCounts(0, 0, 0))
+
+    def test_counters_follow_writes(self):
+        add_tasks_db(["A", "B", "C", "D"], db_name=self.TEST_DB_NAME)
+        add_task_db("E", db_name=self.TEST_DB_NAME)
+        complete_task_db(1, db_name=self.TEST_DB_NAME)
+        complete_task_db(1, db_name=self.TEST_DB_NAME)
+        complete_tasks_db([2, 3], db_name=self.TEST_DB_NAME)
+        delete_task_db(1, db_name=self.TEST_DB_NAME)
+        delete_tasks_db([4, 99], db_name=self.TEST_DB_NAME)
+        
+        self.assertEqual(self.counts(), TaskCounts(3, 1, 2))
+        self.assertEqual(check_task_counts_db(db_name=self.TEST_DB_NAME), [])
+
+    def test_counters_are_scoped(self):
+        add_tasks_db(["A", "B"], guild_id=1, channel_id=10, db_name=self.TEST_DB_NAME)
+        add_task_db("C", guild_id=1, channel_id=11, db_name=self.TEST_DB_NAME)
+        add_task_db("D", guild_id=2, db_name=self.TEST_DB_NAME)
+        complete_task_db(3, guild_id=1, channel_id=11, db_name=self.TEST_DB_NAME)
+        
+        self.assertEqual(self.counts(guild_id=1), TaskCounts(3, 2, 1))
+        self.assertEqual(self.counts(guild_id=1, channel_id=10), TaskCounts(2, 2, 0))
+        self.assertEqual(self.counts(guild_id=2), TaskCounts(1, 1, 0))
+        self.assertEqual(self.counts(), TaskCounts(0, 0, 0))
+
+    def test_check_and_rebuild(self):
+        add_tasks_db(["A", "B"], guild_id=1, db_name=self.TEST_DB_NAME)
+        conn = get_db_connection(self.TEST_DB_NAME)
+        try:
+            conn.execute("UPDATE task_counts SET total = 7")
+            conn.execute("INSERT INTO task_counts (guild_key, channel_key, total, done) VALUES (5, -1, 1, 0)")
+            conn.commit()
+        finally:
+            conn.close()
+        
+        mismatches = check_task_counts_db(db_name=self.TEST_DB_NAME)
+        self.assertEqual(sorted(mismatches), [
+            (1, None, TaskCounts(7, 7, 0), TaskCounts(2, 2, 0)),
+            (5, None, TaskCounts(1, 1, 0), TaskCounts(0, 0, 0)),
+        ])
+        
+        rebuild_task_counts_db(db_name=self.TEST_DB_NAME)
+        
+        self.assertEqual(check_task_counts_db(db_name=self.TEST_DB_NAME), [])
+        self.assertEqual(self.counts(guild_id=1), TaskCounts(2, 2, 0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,198 @@
+import unittest
+import os
+import sys
+import asyncio
+import tempfile
+import threading
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import init_db, close_pool, TaskOutcome, TaskCounts
+from memory_store import MemoryTaskStore
+from storage import SqliteTaskStore, TaskStore, create_store
+from storage_service import StorageService
+
+class TaskStoreContract:
+    """Her arka ucun aynı davranışı göstermesi gereken senaryolar."""
+
+    def make_store(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.store = self.make_store()
+        self.addCleanup(self.store.close)
+
+    def run_async(self, coro):
+        return asyncio.run(coro)
+
+    def test_implements_protocol(self):
+        self.assertIsInstance(self.store, TaskStore)
+
+    def test_scopes_and_status_filters(self):
+        async def scenario():
+            first, second = await self.store.add_tasks(["Süt al", "Ekmek al"], guild_id=1, channel_id=10)
+            await self.store.add_task("Başka kanal", guild_id=1, channel_id=20)
+            await self.store.add_task("Başka sunucu", guild_id=2)
+            await self.store.complete_task(first, guild_id=1)
+            return (
+                await self.store.get_tasks(guild_id=1),
+                await self.store.get_tasks(guild_id=1, channel_id=10, status="open"),
+                await self.store.get_tasks(guild_id=1, status="done"),
+                await self.store.get_task_counts(guild_id=1),
+                await self.store.get_task_counts(guild_id=1, channel_id=10),
+                await self.store.get_task_by_id(second, guild_id=2),
+            )
+
+        tasks, open_tasks, done, counts, channel_counts, foreign = self.run_async(scenario())
+        self.assertEqual([task[1] for task in tasks], ["Süt al", "Ekmek al", "Başka kanal"])
+        self.assertEqual(open_tasks, [(2, "Ekmek al", 0)])
+        self.assertEqual(done, [(1, "Süt al", 1)])
+        self.assertEqual(counts, TaskCounts(3, 2, 1))
+        self.assertEqual(channel_counts, TaskCounts(2, 1, 1))
+        self.assertIsNone(foreign)
+
+    def test_pages_and_rendering(self):
+        async def scenario():
+            await self.store.add_tasks([f"Görev {i}" for i in range(1, 6)], guild_id=1)
+            return (
+                await self.store.get_tasks_page(2, 2, guild_id=1),
+                await self.store.render_tasks_page(3, 2, guild_id=1),
+            )
+
+        page, rendered = self.run_async(scenario())
+        self.assertEqual([task[0] for task in page], [3, 4])
+        self.assertEqual(rendered.count, 2)
+        self.assertFalse(rendered.has_more)
+        self.assertIn("5: Görev 5", rendered.text)
+
+    def test_add_tasks_with_completed_flags(self):
+        async def scenario():
+            ids = await self.store.add_tasks(["A", "B", "C"], guild_id=1, completed=[True, False, True])
+            return (
+                ids,
+                await self.store.get_tasks(guild_id=1),
+                await self.store.get_task_counts(guild_id=1),
+                await self.store.complete_task(ids[0], guild_id=1),
+            )
+
+        ids, tasks, counts, again = self.run_async(scenario())
+        self.assertEqual(tasks, [(ids[0], "A", 1), (ids[1], "B", 0), (ids[2], "C", 1)])
+        self.assertEqual(counts, TaskCounts(3, 1, 2))
+        self.assertIs(again, TaskOutcome.ALREADY_COMPLETED)
+
+    def test_batch_results(self):
+        async def scenario():
+            ids = await self.store.add_tasks(["A", "B", "C"], guild_id=1)
+            await self.store.complete_task(ids[0], guild_id=1)
+            completed = await self.store.complete_tasks([ids[2], ids[0], 99, ids[2]], guild_id=1)
+            deleted = await self.store.delete_tasks([ids[1], 99], guild_id=1)
+            again = await self.store.complete_task(ids[0], guild_id=1)
+            return completed, deleted, again
+
+        completed, deleted, again = self.run_async(scenario())
+        self.assertEqual(completed.succeeded, [3])
+        self.assertEqual(completed.already_completed, [1])
+        self.assertEqual(completed.missing, [99])
+        self.assertEqual(deleted.succeeded, [2])
+        self.assertEqual(deleted.missing, [99])
+        self.assertEqual(again, TaskOutcome.ALREADY_COMPLETED)
+
+    def test_search(self):
+        async def scenario():
+            await self.store.add_tasks(["Çiçek sula", "Rapor yaz", "Raporu gönder"], guild_id=1)
+            return (
+                await self.store.search_tasks("rapor*", guild_id=1),
+                await self.store.search_tasks("CICEK", guild_id=1),
+                await self.store.search_tasks("rapor", guild_id=2),
+            )
+
+        prefix, folded, foreign = self.run_async(scenario())
+        self.assertEqual(sorted(task[0] for task in prefix), [2, 3])
+        self.assertEqual([task[0] for task in folded], [1])
+        self.assertEqual(foreign, [])
+        with self.assertRaises(ValueError):
+            self.run_async(self.store.search_tasks("  ", guild_id=1))
+
+    def test_boards(self):
+        async def scenario():
+            first = await self.store.set_board(10, 100, guild_id=1)
+            previous = await self.store.set_board(10, 101, guild_id=1)
+            await self.store.set_board(11, 110, guild_id=1, channel_id=11)
+            boards = await self.store.get_boards(guild_id=1)
+            removed = await self.store.delete_board(10, guild_id=1)
+            return first, previous, boards, removed, await self.store.get_boards(guild_id=1)
+
+        first, previous, boards, removed, remaining = self.run_async(scenario())
+        self.assertIsNone(first)
+        self.assertEqual(previous, 100)
+        self.assertEqual(boards, [(10, 101)])
+        self.assertTrue(removed)
+        self.assertEqual(remaining, [])
+
+    def test_unknown_status_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.run_async(self.store.get_tasks(guild_id=1, status="later"))
+
+class TestMemoryTaskStore(TaskStoreContract, unittest.TestCase):
+    def make_store(self):
+        return create_store("memory")
+
+    def test_store_is_independent_per_instance(self):
+        other = MemoryTaskStore()
+        self.run_async(self.store.add_task("Yalnızca burada", guild_id=1))
+        self.assertEqual(self.run_async(other.get_tasks(guild_id=1)), [])
+
+class TestEventLogTaskStore(TaskStoreContract, unittest.TestCase):
+    def make_store(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        return create_store("eventlog", directory=directory.name)
+
+class TestShardedTaskStore(TaskStoreContract, unittest.TestCase):
+    def make_store(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        return create_store("sharded", directory=directory.name, max_open_shards=1)
+
+class TestRemoteTaskStore(TaskStoreContract, unittest.TestCase):
+    def make_store(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "storage.sock")
+        loop = asyncio.new_event_loop()
+        service = StorageService(MemoryTaskStore())
+        loop.run_until_complete(service.start(path))
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+
+        def stop():
+            asyncio.run_coroutine_threadsafe(service.close(), loop).result(5)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(5)
+            loop.close()
+
+        self.addCleanup(stop)
+        return create_store("remote", path=path)
+
+class TestSqliteTaskStore(TaskStoreContract, unittest.TestCase):
+    TEST_DB_NAME = "test_task_store.db"
+
+    def make_store(self):
+        if os.path.exists(self.TEST_DB_NAME):
+            os.remove(self.TEST_DB_NAME)
+        init_db(db_name=self.TEST_DB_NAME)
+        self.addCleanup(self.remove_db)
+        return create_store("sqlite", db_name=self.TEST_DB_NAME)
+
+    def remove_db(self):
+        close_pool(self.TEST_DB_NAME)
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.TEST_DB_NAME + suffix):
+                os.remove(self.TEST_DB_NAME + suffix)
+
+    def test_factory_rejects_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            create_store("redis")
+        self.assertIsInstance(self.store, SqliteTaskStore)
+
+if __name__ == '__main__':
+    unittest.main()
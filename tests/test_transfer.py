@@ -0,0 +1,231 @@
+import unittest
+import os
+import sys
+import asyncio
+import io
+import json
+import tempfile
+from unittest.mock import Mock, AsyncMock, patch
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import database
+from bot import BotConfig
+from memory_store import MemoryTaskStore
+from storage import SqliteTaskStore
+from transfer import ImportFormatError, ImportResult, export_tasks, format_for, import_tasks
+
+async def lines_of(data):
+    for line in io.BytesIO(data):
+        yield line
+
+class TestTransfer(unittest.TestCase):
+    def setUp(self):
+        self.store = MemoryTaskStore()
+        self.scope = {"guild_id": 1, "channel_id": None}
+
+        async def seed():
+            ids = await self.store.add_tasks(["Süt al", 'Satır\niki, "tırnak"', "Ekmek al"], **self.scope)
+            await self.store.complete_task(ids[0], **self.scope)
+            await self.store.add_task("Başka sunucu", guild_id=2)
+
+        asyncio.run(seed())
+
+    def export(self, fmt, **options):
+        f = io.BytesIO()
+        count = asyncio.run(export_tasks(self.store, f, fmt, **options, **self.scope))
+        return count, f.getvalue()
+
+    def test_csv_export(self):
+        count, data = self.export("csv", page_size=2)
+
+        self.assertEqual(count, 3)
+        self.assertEqual(data.decode("utf-8"), 'id,description,completed\r\n1,Süt al,1\r\n'
+                                               '2,"Satır\niki, ""tırnak""",0\r\n3,Ekmek al,0\r\n')
+
+    def test_jsonl_export_with_status(self):
+        count, data = self.export("jsonl", status="open")
+
+        self.assertEqual(count, 2)
+        self.assertEqual([json.loads(line) for line in data.splitlines()], [
+            {"id": 2, "description": 'Satır\niki, "tırnak"', "completed": False},
+            {"id": 3, "description": "Ekmek al", "completed": False},
+        ])
+
+    def test_export_reads_pages_not_whole_scope(self):
+        with patch.object(self.store, 'get_tasks', side_effect=AssertionError("tüm kapsam okundu")):
+            count, _ = self.export("csv", page_size=1)
+        self.assertEqual(count, 3)
+
+    def test_round_trip_into_other_scope(self):
+        for fmt in ("csv", "jsonl"):
+            with self.subTest(fmt=fmt):
+                target = MemoryTaskStore()
+                _, data = self.export(fmt)
+
+                result = asyncio.run(import_tasks(target, lines_of(data), fmt, guild_id=5))
+
+                self.assertEqual(result, ImportResult(3, 1, 0, None))
+                self.assertEqual(asyncio.run(target.get_tasks(guild_id=5)),
+                                 [(1, "Süt al", 1), (2, 'Satır\niki, "tırnak"', 0), (3, "Ekmek al", 0)])
+
+    def test_import_batches_and_reports_progress(self):
+        data = "".join(f"Görev {number}\n" for number in range(7)).encode("utf-8")
+        progress = AsyncMock()
+
+        with patch.object(self.store, 'add_tasks', wraps=self.store.add_tasks) as mock_add_tasks:
+            result = asyncio.run(import_tasks(self.store, lines_of(data), "csv", batch_size=3,
+                                              progress=progress, guild_id=9))
+
+        self.assertEqual(result.added, 7)
+        self.assertEqual([len(call.args[0]) for call in mock_add_tasks.call_args_list], [3, 3, 1])
+        self.assertEqual([call.args[0] for call in progress.await_args_list], [3, 6, 7])
+
+    def test_import_writes_completed_flag_with_batch(self):
+        data = b"description,completed\nA,1\nB,0\nC,evet\n"
+
+        with patch.object(self.store, 'complete_tasks', side_effect=AssertionError("ayrı tamamlama")):
+            result = asyncio.run(import_tasks(self.store, lines_of(data), "csv", guild_id=9))
+
+        self.assertEqual(result, ImportResult(3, 2, 0, None))
+        self.assertEqual(asyncio.run(self.store.get_tasks(guild_id=9)), [(5, "A", 1), (6, "B", 0), (7, "C", 1)])
+
+    def test_import_skips_bad_records(self):
+        csv_data = '\ufeffdescription,completed\nİyi,evet\n,1\n"yarım\n'.encode("utf-8")
+        jsonl_data = b'{"description": "Bir"}\n\n{bozuk\n"D\xc3\xbcz metin"\n{"title": "yok"}\n'
+
+        csv_result = asyncio.run(import_tasks(self.store, lines_of(csv_data), "csv", guild_id=7))
+        jsonl_result = asyncio.run(import_tasks(self.store, lines_of(jsonl_data), "jsonl", guild_id=8))
+
+        self.assertEqual(csv_result, ImportResult(1, 1, 2, 3))
+        self.assertEqual(jsonl_result, ImportResult(2, 0, 2, 3))
+        self.assertEqual(asyncio.run(self.store.get_tasks(guild_id=8)), [(6, "Bir", 0), (7, "Düz metin", 0)])
+
+    def test_csv_stray_quote_in_unquoted_field(self):
+        rows = ['Buy 27" monitor,0\n'] + [f"Görev {number},0\n" for number in range(1000)]
+        data = ("description,completed\n" + "".join(rows)).encode("utf-8")
+
+        result = asyncio.run(import_tasks(self.store, lines_of(data), "csv", guild_id=9))
+
+        self.assertEqual(result, ImportResult(1001, 0, 0, None))
+        first, *_, last = asyncio.run(self.store.get_tasks(guild_id=9))
+        self.assertEqual((first[1], last[1]), ('Buy 27" monitor', "Görev 999"))
+
+    def test_csv_unterminated_quote_is_capped(self):
+        data = ('"yarım\n' + "dolgu\n" * 20 + "Sonraki,0\n").encode("utf-8")
+
+        with patch('transfer.MAX_CSV_RECORD_LENGTH', 50):
+            result = asyncio.run(import_tasks(self.store, lines_of(data), "csv", guild_id=9))
+
+        self.assertEqual(result, ImportResult(13, 0, 1, 1))
+        self.assertEqual(asyncio.run(self.store.get_tasks(guild_id=9))[-1][1], "Sonraki")
+
+    def test_format_for(self):
+        self.assertEqual(format_for("gorevler.CSV"), "csv")
+        self.assertEqual(format_for("yedek.jsonl"), "jsonl")
+        with self.assertRaises(ImportFormatError):
+            format_for("tablo.xlsx")
+
+    def test_sqlite_round_trip(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        db_name = os.path.join(directory.name, "tasks.db")
+        database.init_db(db_name)
+        self.addCleanup(database.close_pool, db_name)
+        store = SqliteTaskStore(db_name=db_name)
+        self.addCleanup(store.close)
+        _, data = self.export("jsonl")
+
+        result = asyncio.run(import_tasks(store, lines_of(data), "jsonl", batch_size=2, **self.scope))
+        f = io.BytesIO()
+        asyncio.run(export_tasks(store, f, "jsonl", **self.scope))
+
+        self.assertEqual(result.added, 3)
+        self.assertEqual(f.getvalue(), data)
+
+class TestTransferCommands(unittest.TestCase):
+    def setUp(self):
+        self.store = MemoryTaskStore()
+        self.mock_ctx = Mock()
+        self.mock_ctx.bot.store = self.store
+        self.mock_ctx.bot.config = BotConfig()
+        self.mock_ctx.send = AsyncMock()
+        self.mock_ctx.guild.id = 42
+        self.mock_ctx.guild.filesize_limit = 10 * 1024 * 1024
+        self.mock_ctx.channel.id = 7
+        self.mock_ctx.message.attachments = []
+
+    def test_export_sends_attachment(self):
+        from bot import export_tasks as export_command
+        asyncio.run(self.store.add_task("Süt al", guild_id=42))
+        sent = {}
+
+        async def send(content, file=None):
+            sent["content"], sent["filename"], sent["data"] = content, file.filename, file.fp.read()
+
+        self.mock_ctx.send.side_effect = send
+        asyncio.run(export_command(self.mock_ctx, "JSONL"))
+
+        self.assertEqual(sent["content"], "📤 1 görev dışa aktarıldı.")
+        self.assertEqual(sent["filename"], "tasks.jsonl")
+        self.assertEqual(json.loads(sent["data"]), {"id": 1, "description": "Süt al", "completed": False})
+
+    def test_export_rejects_oversized_file_and_bad_arguments(self):
+        from bot import export_tasks as export_command
+        asyncio.run(self.store.add_task("Süt al", guild_id=42))
+        self.mock_ctx.guild.filesize_limit = 10
+
+        asyncio.run(export_command(self.mock_ctx))
+        asyncio.run(export_command(self.mock_ctx, "xml"))
+
+        self.assertTrue(self.mock_ctx.send.call_args_list[0].args[0].startswith("⚠️ Dosya Discord'un ek sınırını"))
+        self.assertTrue(self.mock_ctx.send.call_args_list[1].args[0].startswith("Lütfen geçerli bir biçim"))
+
+    def test_import_streams_attachment_and_reports_result(self):
+        from bot import import_tasks as import_command
+        self.mock_ctx.message.attachments = [Mock(filename="yedek.csv", size=100)]
+        status_message = Mock()
+        status_message.edit = AsyncMock()
+        self.mock_ctx.send.return_value = status_message
+
+        with patch('bot.iter_attachment_lines', return_value=lines_of(b"description,completed\nA,1\nB,0\n")), \
+             patch('bot.IMPORT_PROGRESS_INTERVAL', 0):
+            asyncio.run(import_command(self.mock_ctx))
+
+        self.mock_ctx.send.assert_called_once_with("⏳ `yedek.csv` içe aktarılıyor…")
+        self.assertEqual([call.kwargs["content"] for call in status_message.edit.await_args_list], [
+            "⏳ 2 görev içe aktarıldı…",
+            "✅ 2 görev içe aktarıldı.\n✔️ 1 görev tamamlanmış olarak işaretlendi.",
+        ])
+        self.assertEqual(asyncio.run(self.store.get_tasks(guild_id=42)), [(1, "A", 1), (2, "B", 0)])
+        self.mock_ctx.bot.board_updates.schedule.assert_called_once_with((42, None))
+
+    def test_import_reports_partial_failure(self):
+        from bot import import_tasks as import_command
+        self.mock_ctx.message.attachments = [Mock(filename="yedek.jsonl", size=100)]
+        status_message = Mock()
+        status_message.edit = AsyncMock()
+        self.mock_ctx.send.return_value = status_message
+
+        async def broken():
+            yield b'"A"\n'
+            raise ConnectionError("bağlantı koptu")
+
+        with patch('bot.iter_attachment_lines', return_value=broken()):
+            asyncio.run(import_command(self.mock_ctx))
+
+        status_message.edit.assert_awaited_once_with(content="⚠️ İçe aktarma yarıda kaldı (0 görev eklendi): bağlantı koptu")
+
+    def test_import_requires_supported_attachment(self):
+        from bot import import_tasks as import_command
+
+        asyncio.run(import_command(self.mock_ctx))
+        self.mock_ctx.message.attachments = [Mock(filename="tablo.xlsx", size=100)]
+        asyncio.run(import_command(self.mock_ctx))
+
+        self.assertEqual([call.args[0] for call in self.mock_ctx.send.call_args_list], [
+            "Lütfen bir `.csv` ya da `.jsonl` dosyası ekleyin. Kullanım: `!import_tasks` + dosya",
+            "⚠️ `tablo.xlsx` desteklenmiyor; `.csv` ya da `.jsonl` dosyası ekleyin.",
+        ])
+
+if __name__ == '__main__':
+    unittest.main()
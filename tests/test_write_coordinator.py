@@ -0,0 +1,121 @@
+import unittest
+import os
+import sys
+import asyncio
+import sqlite3
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import (
+    init_db, add_task_db, get_tasks_db, complete_task_db, delete_task_db, clear_tasks_table,
+    close_pool, enable_write_coordinator, disable_write_coordinator, get_write_coordinator,
+    get_db_connection,
+)
+from storage import AsyncTaskStore
+from writer import WriteCoordinator, WriterClosedError
+
+class TestWriteCoordinator(unittest.TestCase):
+    TEST_DB_NAME = "test_write_coordinator.db"
+
+    @classmethod
+    def setUpClass(cls):
+        if os.path.exists(cls.TEST_DB_NAME):
+            os.remove(cls.TEST_DB_NAME)
+        init_db(db_name=cls.TEST_DB_NAME)
+
+    @classmethod
+    def tearDownClass(cls):
+        disable_write_coordinator(cls.TEST_DB_NAME)
+        close_pool(cls.TEST_DB_NAME)
+        if os.path.exists(cls.TEST_DB_NAME):
+            os.remove(cls.TEST_DB_NAME)
+
+    def setUp(self):
+        clear_tasks_table(db_name=self.TEST_DB_NAME)
+
+    def tearDown(self):
+        disable_write_coordinator(self.TEST_DB_NAME)
+
+    def _insert(self, conn, description):
+        return conn.execute("INSERT INTO tasks (description) VALUES (?)", (description,)).lastrowid
+
+    def test_database_functions_route_through_coordinator(self):
+        enable_write_coordinator(self.TEST_DB_NAME)
+        self.assertIsNotNone(get_write_coordinator(self.TEST_DB_NAME))
+
+        task_id = add_task_db("Grouped task", db_name=self.TEST_DB_NAME)
+        self.assertTrue(complete_task_db(task_id, db_name=self.TEST_DB_NAME))
+        self.assertFalse(complete_task_db(task_id, db_name=self.TEST_DB_NAME))
+        self.assertEqual(get_tasks_db(db_name=self.TEST_DB_NAME), [(task_id, "Grouped task", 1)])
+        self.assertTrue(delete_task_db(task_id, db_name=self.TEST_DB_NAME))
+        self.assertFalse(delete_task_db(task_id, db_name=self.TEST_DB_NAME))
+
+    def test_burst_is_batched_and_each_caller_gets_its_own_result(self):
+        commits = []
+
+        def connect():
+            conn = get_db_connection(self.TEST_DB_NAME)
+            conn.set_trace_callback(lambda sql: commits.append(sql) if sql == "COMMIT" else None)
+            return conn
+
+        coordinator = WriteCoordinator(connect, max_batch_size=100, max_latency=0.2)
+        try:
+            futures = [coordinator.submit(self._insert, f"Task {i}") for i in range(50)]
+            ids = [future.result(timeout=5) for future in futures]
+        finally:
+            coordinator.close()
+
+        self.assertEqual(ids, list(range(1, 51)))
+        self.assertGreaterEqual(len(commits), 1)
+        self.assertLess(len(commits), 50)
+        self.assertEqual(len(get_tasks_db(db_name=self.TEST_DB_NAME)), 50)
+
+    def test_batch_size_limit(self):
+        coordinator = WriteCoordinator(lambda: get_db_connection(self.TEST_DB_NAME),
+                                       max_batch_size=1, max_latency=0.05)
+        try:
+            futures = [coordinator.submit(self._insert, f"Task {i}") for i in range(5)]
+            self.assertEqual([future.result(timeout=5) for future in futures], [1, 2, 3, 4, 5])
+        finally:
+            coordinator.close()
+
+    def test_failing_write_does_not_affect_others_in_batch(self):
+        def failing(conn):
+            conn.execute("INSERT INTO tasks (description) VALUES ('rolled back')")
+            raise sqlite3.IntegrityError("boom")
+
+        coordinator = WriteCoordinator(lambda: get_db_connection(self.TEST_DB_NAME), max_latency=0.1)
+        try:
+            first = coordinator.submit(self._insert, "kept 1")
+            bad = coordinator.submit(failing)
+            second = coordinator.submit(self._insert, "kept 2")
+            first.result(timeout=5)
+            second.result(timeout=5)
+            with self.assertRaises(sqlite3.IntegrityError):
+                bad.result(timeout=5)
+        finally:
+            coordinator.close()
+
+        descriptions = [task[1] for task in get_tasks_db(db_name=self.TEST_DB_NAME)]
+        self.assertEqual(descriptions, ["kept 1", "kept 2"])
+
+    def test_closed_coordinator_rejects_work(self):
+        coordinator = WriteCoordinator(lambda: get_db_connection(self.TEST_DB_NAME))
+        coordinator.close()
+        with self.assertRaises(WriterClosedError):
+            coordinator.submit(self._insert, "late")
+
+    def test_async_store_awaits_coordinator(self):
+        enable_write_coordinator(self.TEST_DB_NAME, max_latency=0.05)
+        store = AsyncTaskStore(db_name=self.TEST_DB_NAME, max_workers=1)
+
+        async def scenario():
+            return await asyncio.gather(*(store.add_task(f"Task {i}") for i in range(20)))
+
+        try:
+            ids = asyncio.run(scenario())
+        finally:
+            store.close()
+        self.assertEqual(sorted(ids), list(range(1, 21)))
+
+if __name__ == '__main__':
+    unittest.main()
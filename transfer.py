@@ -0,0 +1,229 @@
+"""
+Görevlerin CSV ya da JSONL dosyası olarak dışa ve içe aktarılması.
+
+Dışa aktarma görevleri anahtar tabanlı sayfalarla (bkz. get_tasks_page) okur
+ve satır satır yazar; bellekte en fazla bir sayfa tutulur. İçe aktarma
+dosyayı satır satır ayrıştırır ve görevleri `IMPORT_BATCH_SIZE`'lık
+add_tasks işlemleriyle ekler. Her iki yön de TaskStore arayüzünü
+kullandığı için tüm depolarla çalışır.
+
+    id,description,completed          {"id": 1, "description": "Süt al", "completed": false}
+    1,Süt al,0
+"""
+import csv
+import io
+import json
+from collections import namedtuple
+
+EXPORT_FORMATS = ("csv", "jsonl")
+EXPORT_PAGE_SIZE = 1_000
+IMPORT_BATCH_SIZE = 500
+CSV_HEADER = ("id", "description", "completed")
+# Tırnağı kapanmayan bir kaydın birleştirilebileceği en fazla karakter;
+# aşılırsa kayıt atlanır ve sonraki satırdan yeni kayıt başlar.
+MAX_CSV_RECORD_LENGTH = 100_000
+_TRUE_VALUES = {"1", "true", "yes", "evet", "x", "✅"}
+
+# `added` eklenen, `completed` bunlardan tamamlanmış olarak işaretlenen,
+# `skipped` okunamayan ya da açıklaması boş olan kayıt sayısıdır;
+# `first_error_line` atlanan ilk kaydın satır numarasıdır (yoksa None).
+ImportResult = namedtuple("ImportResult", "added completed skipped first_error_line")
+
+class ImportFormatError(ValueError):
+    """Dosya biçimi tanınmadığında fırlatılır."""
+
+def format_for(filename):
+    """Dosya uzantısından biçimi ("csv" ya da "jsonl") döner; tanınmazsa ImportFormatError fırlatır."""
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if extension in ("csv", "txt"):
+        return "csv"
+    if extension in ("jsonl", "ndjson", "json"):
+        return "jsonl"
+    raise ImportFormatError(f"Desteklenmeyen dosya türü: {filename} (.csv ya da .jsonl olmalı)")
+
+async def iter_tasks(store, status="all", page_size=EXPORT_PAGE_SIZE, guild_id=None, channel_id=None):
+    """Kapsamdaki görevleri ID sırasıyla, sayfa sayfa okuyarak tek tek üretir."""
+    after_id = 0
+    while True:
+        rows = await store.get_tasks_page(after_id, page_size, guild_id=guild_id, channel_id=channel_id,
+                                          status=status)
+        for row in rows:
+            yield row
+        if len(rows) < page_size:
+            return
+        after_id = rows[-1][0]
+
+async def export_tasks(store, f, fmt="csv", status="all", page_size=EXPORT_PAGE_SIZE,
+                       guild_id=None, channel_id=None):
+    """
+    Kapsamdaki görevleri ikili (binary) `f` dosyasına UTF-8 CSV ya da JSONL
+    olarak yazar ve yazılan görev sayısını döner. `f` kapatılmaz.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ImportFormatError(f"Geçersiz biçim: {fmt} (seçenekler: {', '.join(EXPORT_FORMATS)})")
+    text = io.TextIOWrapper(f, encoding="utf-8", newline="")
+    count = 0
+    try:
+        writer = csv.writer(text) if fmt == "csv" else None
+        if writer:
+            writer.writerow(CSV_HEADER)
+        async for task_id, description, completed in iter_tasks(store, status, page_size, guild_id, channel_id):
+            if writer:
+                writer.writerow((task_id, description, int(bool(completed))))
+            else:
+                text.write(json.dumps({"id": task_id, "description": description, "completed": bool(completed)},
+                                      ensure_ascii=False) + "\n")
+            count += 1
+        text.flush()
+    finally:
+        # Sarmalayıcı kapanırken alttaki dosyayı da kapatmasın.
+        text.detach()
+    return count
+
+async def _decoded_lines(lines):
+    first = True
+    async for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+        if first and line.startswith("\ufeff"):
+            line = line[1:]
+        first = False
+        yield line
+
+def _is_true(value):
+    return str(value).strip().lower() in _TRUE_VALUES
+
+def _ends_in_quotes(line, in_quotes):
+    """
+    Satır sonunda tırnaklı bir alanın içinde kalınıp kalınmadığını döner.
+    csv modülünün varsayılan lehçesi gibi tırnak yalnızca alanın başında
+    tırnaklı alan açar; alan ortasındaki tırnak (`27" monitör`) düz karakterdir.
+    """
+    if not in_quotes and '"' not in line:
+        return False
+    field_start, index = not in_quotes, 0
+    while index < len(line):
+        if in_quotes:
+            index = line.find('"', index)
+            if index < 0:
+                return True
+            if line.startswith('"', index + 1):
+                index += 2
+                continue
+            in_quotes = False
+        elif line[index] == ",":
+            field_start = True
+        elif field_start and line[index] == '"':
+            in_quotes = True
+            field_start = False
+        else:
+            field_start = False
+        index += 1
+    return in_quotes
+
+async def _csv_records(lines):
+    # Tırnaklı alanlardaki satır sonları kaydı birden fazla satıra yayabilir;
+    # kayıt, açık tırnaklı alan kapanana kadar satır satır birleştirilir.
+    columns = None
+    buffer, start = "", 0
+    in_quotes = False
+    number = 0
+    async for line in lines:
+        number += 1
+        if not buffer:
+            start = number
+        buffer += line
+        in_quotes = _ends_in_quotes(line, in_quotes)
+        if in_quotes:
+            if len(buffer) > MAX_CSV_RECORD_LENGTH:
+                buffer, in_quotes = "", False
+                yield start, None, False
+            continue
+        record, buffer = buffer, ""
+        try:
+            row = next(csv.reader([record]), [])
+        except csv.Error:
+            yield start, None, False
+            continue
+        if not any(cell.strip() for cell in row):
+            continue
+        if columns is None:
+            columns = False
+            header = [cell.strip().lower() for cell in row]
+            if "description" in header:
+                columns = (header.index("description"),
+                           header.index("completed") if "completed" in header else None)
+                continue
+        description_index, completed_index = columns or (0, None)
+        if description_index >= len(row):
+            yield start, None, False
+            continue
+        completed = completed_index is not None and completed_index < len(row) and _is_true(row[completed_index])
+        yield start, row[description_index], completed
+    if buffer:
+        yield start, None, False
+
+async def _jsonl_records(lines):
+    number = 0
+    async for line in lines:
+        number += 1
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield number, None, False
+            continue
+        if isinstance(record, str):
+            yield number, record, False
+        elif isinstance(record, dict) and isinstance(record.get("description"), str):
+            yield number, record["description"], _is_true(record.get("completed", False))
+        else:
+            yield number, None, False
+
+def parse_records(lines, fmt):
+    """
+    Satırları (str ya da bytes, async iterable) ayrıştırıp `(satır no,
+    açıklama, tamamlandı mı)` üretir; okunamayan kayıtlarda açıklama None'dır.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ImportFormatError(f"Geçersiz biçim: {fmt} (seçenekler: {', '.join(EXPORT_FORMATS)})")
+    decoded = _decoded_lines(lines)
+    return _csv_records(decoded) if fmt == "csv" else _jsonl_records(decoded)
+
+async def import_tasks(store, lines, fmt="csv", batch_size=IMPORT_BATCH_SIZE, progress=None,
+                       guild_id=None, channel_id=None):
+    """
+    Dosya satırlarındaki görevleri kapsama ekler ve ImportResult döner.
+    Görevler `batch_size`'lık partiler halinde tek işlemle (add_tasks)
+    eklenir; tamamlanmış olanlar aynı işlemde tamamlanmış olarak yazılır.
+    Görevler yeni ID'ler alır. `progress` verilirse her partiden sonra o ana
+    kadar eklenen görev sayısıyla beklenir.
+    """
+    scope = {"guild_id": guild_id, "channel_id": channel_id}
+    added = completed = skipped = 0
+    first_error_line = None
+    batch = []
+
+    async def flush():
+        nonlocal added, completed
+        descriptions, flags = zip(*batch)
+        task_ids = await store.add_tasks(list(descriptions), completed=list(flags), **scope)
+        added += len(task_ids)
+        completed += sum(flags)
+        batch.clear()
+        if progress is not None:
+            await progress(added)
+
+    async for number, description, is_done in parse_records(lines, fmt):
+        if description is None or not description.strip():
+            skipped += 1
+            if first_error_line is None:
+                first_error_line = number
+            continue
+        batch.append((description.strip(), is_done))
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+    return ImportResult(added, completed, skipped, first_error_line)
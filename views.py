@@ -0,0 +1,41 @@
+import discord
+
+from rendering import Page
+
+class PaginatedView(discord.ui.View):
+    """
+    Önceki/sonraki düğmeleriyle sayfalar arasında gezinen görünüm.
+    `load_page(cursor)` yalnızca istenen sayfayı getirip bir Page döner;
+    önceki sayfalara dönmek için ziyaret edilen sayfaların cursor'ları saklanır.
+    """
+
+    def __init__(self, load_page, first_page: Page, timeout=180.0):
+        super().__init__(timeout=timeout)
+        self._load_page = load_page
+        self._history = []
+        self.page = first_page
+        self._sync_buttons()
+
+    def _sync_buttons(self):
+        self.previous_page.disabled = not self._history
+        self.next_page.disabled = self.page.next_cursor is None
+
+    async def _show(self, interaction, page):
+        self.page = page
+        self._sync_buttons()
+        await interaction.response.edit_message(content=page.text, view=self)
+
+    @discord.ui.button(label="◀ Önceki", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction, button):
+        if not self._history:
+            await interaction.response.defer()
+            return
+        await self._show(interaction, await self._load_page(self._history.pop()))
+
+    @discord.ui.button(label="Sonraki ▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction, button):
+        if self.page.next_cursor is None:
+            await interaction.response.defer()
+            return
+        self._history.append(self.page.cursor)
+        await self._show(interaction, await self._load_page(self.page.next_cursor))
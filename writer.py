@@ -0,0 +1,110 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_LATENCY = 0.005
+_STOP = object()
+
+class WriterClosedError(RuntimeError):
+    """Durdurulmuş bir yazıcıya iş gönderildiğinde fırlatılır."""
+
+class WriteCoordinator:
+    """
+    Tüm değişiklikleri tek bir yazıcı thread'inde toplayan grup commit koordinatörü.
+    `max_latency` saniye içinde gelen en fazla `max_batch_size` işi tek bir
+    işlemde (tek fsync) yazar ve her çağıranın Future'ını kendi sonucuyla
+    tamamlar. Her iş kendi SAVEPOINT'i içinde çalışır; hata veren iş yalnızca
+    kendi değişikliklerini geri alır.
+
+    `op` fonksiyonları `op(conn, *args)` imzasına sahiptir ve commit yapmaz.
+    `on_commit(result)` verilmişse işlem diske yazıldıktan sonra, Future
+    tamamlanmadan önce çağrılır (ör. önbelleği güncellemek için).
+    """
+
+    def __init__(self, connect, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                 max_latency=DEFAULT_MAX_LATENCY, name="task-writer"):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size en az 1 olmalı.")
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self._connect = connect
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, op, *args, on_commit=None) -> Future:
+        """İşi kuyruğa ekler ve sonucunu taşıyacak Future'ı döner."""
+        if self._closed:
+            raise WriterClosedError("Yazıcı durdurulmuş.")
+        future = Future()
+        self._queue.put((op, args, on_commit, future))
+        return future
+
+    def close(self, timeout=None):
+        """Kuyruktaki işleri yazdıktan sonra yazıcı thread'ini durdurur."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self):
+        conn = self._connect()
+        try:
+            stopping = False
+            while not stopping:
+                job = self._queue.get()
+                if job is _STOP:
+                    break
+                batch = [job]
+                deadline = time.monotonic() + self.max_latency
+                while len(batch) < self.max_batch_size:
+                    try:
+                        job = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    if job is _STOP:
+                        stopping = True
+                        break
+                    batch.append(job)
+                self._write_batch(conn, batch)
+        finally:
+            conn.close()
+
+    def _write_batch(self, conn, batch):
+        succeeded = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for op, args, on_commit, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                conn.execute("SAVEPOINT task_write")
+                try:
+                    result = op(conn, *args)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO task_write")
+                    conn.execute("RELEASE task_write")
+                    future.set_exception(e)
+                else:
+                    conn.execute("RELEASE task_write")
+                    succeeded.append((future, result, on_commit))
+            conn.commit()
+        except Exception as e:
+            if conn.in_transaction:
+                conn.rollback()
+            for *_, future in batch:
+                if not future.done():
+                    if future.running() or future.set_running_or_notify_cancel():
+                        future.set_exception(e)
+            return
+        for future, result, on_commit in succeeded:
+            if on_commit is not None:
+                try:
+                    on_commit(result)
+                except Exception as e:
+                    future.set_exception(e)
+                    continue
+            future.set_result(result)